@@ -0,0 +1,163 @@
+import zlib
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; fall back to gzip only
+    brotli = None
+
+
+def _parse_accept_encoding(header: str) -> dict[str, float]:
+    """Parse an Accept-Encoding header into {coding: q-value}."""
+    codings = {}
+    for part in header.split(","):
+        name, _, params = part.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key.strip() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        codings[name] = q
+    return codings
+
+
+def negotiate_encoding(header: str) -> str | None:
+    """Pick the best supported content coding for an Accept-Encoding header.
+
+    Brotli wins ties with gzip when the brotli package is installed.
+    """
+    codings = _parse_accept_encoding(header)
+    wildcard = codings.get("*", 0.0)
+    candidates = []
+    if brotli is not None:
+        candidates.append(("br", codings.get("br", wildcard)))
+    candidates.append(("gzip", codings.get("gzip", wildcard)))
+
+    best, best_q = None, 0.0
+    for name, q in candidates:
+        if q > best_q:
+            best, best_q = name, q
+    return best
+
+
+class _Compressor:
+    """Incremental compressor with a uniform interface for gzip and brotli."""
+
+    def __init__(self, encoding: str, gzip_level: int, brotli_quality: int):
+        self.encoding = encoding
+        if encoding == "br":
+            self._obj = brotli.Compressor(quality=brotli_quality)
+        else:
+            # wbits=31 produces a gzip container rather than raw zlib
+            self._obj = zlib.compressobj(gzip_level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        if self.encoding == "br":
+            return self._obj.process(data)
+        return self._obj.compress(data)
+
+    def finish(self) -> bytes:
+        if self.encoding == "br":
+            return self._obj.finish()
+        return self._obj.flush()
+
+
+class CompressionMiddleware:
+    """Compress HTTP responses with brotli or gzip based on Accept-Encoding.
+
+    Responses smaller than ``minimum_size`` and responses that already carry
+    a Content-Encoding are passed through untouched.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024,
+                 gzip_level: int = 6, brotli_quality: int = 4):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = _CompressionResponder(self, encoding, send)
+        await self.app(scope, receive, responder)
+
+
+class _CompressionResponder:
+    def __init__(self, middleware: CompressionMiddleware, encoding: str, send: Send):
+        self.middleware = middleware
+        self.encoding = encoding
+        self.send = send
+        self.start_message: Message | None = None
+        self.compressor: _Compressor | None = None
+        self.passthrough = False
+
+    async def __call__(self, message: Message):
+        if message["type"] == "http.response.start":
+            # Defer until the first body chunk tells us the size
+            self.start_message = message
+            headers = Headers(raw=message["headers"])
+            self.passthrough = "content-encoding" in headers
+            return
+
+        if message["type"] != "http.response.body":
+            await self.send(message)
+            return
+
+        if self.passthrough:
+            await self._flush_start()
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.compressor is None:
+            if not more_body and len(body) < self.middleware.minimum_size:
+                self.passthrough = True
+                await self._flush_start()
+                await self.send(message)
+                return
+
+            self.compressor = _Compressor(
+                self.encoding, self.middleware.gzip_level, self.middleware.brotli_quality,
+            )
+            headers = MutableHeaders(raw=self.start_message["headers"])
+            headers["Content-Encoding"] = self.encoding
+            headers.add_vary_header("Accept-Encoding")
+
+            if not more_body:
+                compressed = self.compressor.compress(body) + self.compressor.finish()
+                headers["Content-Length"] = str(len(compressed))
+                await self._flush_start()
+                await self.send({"type": "http.response.body", "body": compressed})
+                return
+
+            # Streaming response: length is unknown until the stream ends
+            del headers["Content-Length"]
+            await self._flush_start()
+
+        chunk = self.compressor.compress(body)
+        if not more_body:
+            chunk += self.compressor.finish()
+        await self.send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+
+    async def _flush_start(self):
+        if self.start_message is not None:
+            await self.send(self.start_message)
+            self.start_message = None
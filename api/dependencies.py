@@ -1,8 +1,18 @@
-from fastapi import Depends, Header, HTTPException
+import threading
+import time
+from collections.abc import Callable, Hashable
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Any
+
+from fastapi import Depends, Header, HTTPException, Response
 from supabase import create_client, Client
 
+from api import profiling
+from api.metrics import CACHE_LOOKUPS, STALE_RESPONSES, UPSTREAM_ERRORS, UPSTREAM_LATENCY, Gauge
+from api.resilience import CircuitBreaker, StaleCache, is_upstream_failure
 from config.settings import settings
 from database.db_manager import DBManager
+from utils.logger import logger
 
 
 # Singleton for read-only API client (uses anon key for RLS enforcement)
@@ -33,13 +43,168 @@ def get_db() -> DBManager:
     return DBManager()
 
 
+class SingleFlight:
+    """Coalesce concurrent identical calls so only one reaches the upstream.
+
+    The first caller for a key submits the function to a worker pool; callers
+    arriving while it is in flight get the same future and receive its result
+    (or exception). Results are shared, so callers must not mutate them.
+    Running the call on the pool lets a caller stop waiting while the call
+    itself keeps going and finishes in the background.
+    """
+
+    def __init__(self, max_workers: int):
+        self._lock = threading.Lock()
+        self._calls: dict[Hashable, Future] = {}
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="upstream")
+
+    def submit(self, key: Hashable, fn: Callable[[], Any]) -> Future:
+        with self._lock:
+            future = self._calls.get(key)
+            if future is not None:
+                CACHE_LOOKUPS.inc("single_flight", "hit")
+                return future
+            CACHE_LOOKUPS.inc("single_flight", "miss")
+            future = self._executor.submit(fn)
+            self._calls[key] = future
+        # Outside the lock: the callback runs inline if the call already finished
+        future.add_done_callback(lambda f: self._forget(key, f))
+        return future
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        return self.submit(key, fn).result()
+
+    def _forget(self, key: Hashable, future: Future):
+        with self._lock:
+            if self._calls.get(key) is future:
+                del self._calls[key]
+
+
+_single_flight = SingleFlight(max_workers=settings.API_UPSTREAM_WORKERS)
+_breaker = CircuitBreaker(
+    failure_threshold=settings.API_BREAKER_FAILURE_THRESHOLD,
+    reset_timeout=settings.API_BREAKER_RESET_SECONDS,
+)
+_stale_cache = StaleCache(max_entries=settings.API_STALE_CACHE_SIZE)
+Gauge(
+    "api_upstream_circuit_open", "1 while the upstream circuit breaker is open or half-open",
+    callback=lambda: 0 if _breaker.state == CircuitBreaker.CLOSED else 1,
+)
+
+
+def _query_key(query) -> tuple:
+    """Identify a PostgREST query by method, URL, params and shaping headers."""
+    # postgrest>=1.0 keeps request state on `query.request`; older builders hold it directly
+    request = getattr(query, "request", query)
+    headers = request.headers
+    return (
+        str(request.http_method),
+        str(request.path),
+        str(request.params),
+        headers.get("prefer"),
+        headers.get("range"),
+    )
+
+
+def _query_table(query) -> str:
+    """Table (or rpc/<function>) a query targets, for metric labels."""
+    request = getattr(query, "request", query)
+    path = str(request.path).rstrip("/")
+    _, _, tail = path.partition("/rest/v1/")
+    return tail or path.rsplit("/", 1)[-1]
+
+
+def _guarded_execute(key: Hashable, query):
+    """Run a query upstream, feeding the circuit breaker, the stale cache and metrics."""
+    table = _query_table(query)
+    start = time.perf_counter()
+    try:
+        result = query.execute()
+    except Exception as e:
+        UPSTREAM_LATENCY.observe(time.perf_counter() - start, table)
+        if is_upstream_failure(e):
+            UPSTREAM_ERRORS.inc(table, "upstream")
+            _breaker.record_failure()
+        else:
+            # Upstream answered (e.g. a 4xx for bad input), so it is healthy
+            UPSTREAM_ERRORS.inc(table, "query")
+            _breaker.record_success()
+        raise
+    UPSTREAM_LATENCY.observe(time.perf_counter() - start, table)
+    _breaker.record_success()
+    _stale_cache.put(key, result)
+    return result
+
+
 class APIDBManager:
     """Lightweight wrapper for API read operations using anon key."""
 
-    def __init__(self, client: Client):
+    def __init__(self, client: Client, response: Response | None = None):
         self.client = client
+        self.response = response
+
+    def execute(self, query):
+        """Execute a query builder with coalescing, a circuit breaker and stale fallback.
+
+        Identical in-flight queries share one upstream call. When a previous
+        good result exists, callers wait at most API_UPSTREAM_SOFT_TIMEOUT
+        seconds and otherwise get that result marked stale while the call
+        finishes in the background. With the circuit open, calls fail fast.
+        """
+        profile = profiling.current_profile()
+        if profile is None:
+            return self._execute(query)
+        # Sample this thread and the upstream worker, and time the call as the route saw it.
+        # ProfilingMiddleware unregisters the route thread when the request ends.
+        profile.register_thread("route")
+        was_stale = self._is_stale()
+        start = time.perf_counter()
+        outcome = "error"
+        try:
+            result = self._execute(query, profile)
+            outcome = "stale" if self._is_stale() and not was_stale else "ok"
+            return result
+        finally:
+            profile.record_upstream(_query_table(query), time.perf_counter() - start, outcome)
+
+    def _execute(self, query, profile: "profiling.RequestProfile | None" = None):
+        key = _query_key(query)
+        stale = _stale_cache.get(key)
+
+        if not _breaker.allow():
+            if stale is not None:
+                return self._serve_stale(stale, "circuit open")
+            STALE_RESPONSES.inc("unavailable")
+            raise HTTPException(status_code=503, detail="Upstream database unavailable")
+
+        call = lambda: _guarded_execute(key, query)
+        if profile is not None:
+            call = profile.wrap(call, "upstream")
+        future = _single_flight.submit(key, call)
+        timeout = settings.API_UPSTREAM_SOFT_TIMEOUT if stale is not None else None
+        try:
+            return future.result(timeout=timeout)
+        except FutureTimeoutError:
+            return self._serve_stale(stale, "upstream slow")
+        except Exception as e:
+            if not is_upstream_failure(e):
+                raise
+            if stale is not None:
+                return self._serve_stale(stale, "upstream error", detail=str(e))
+            STALE_RESPONSES.inc("unavailable")
+            raise HTTPException(status_code=503, detail="Upstream database unavailable") from e
+
+    def _is_stale(self) -> bool:
+        return self.response is not None and "X-Data-Stale" in self.response.headers
+
+    def _serve_stale(self, result, reason: str, detail: str = ""):
+        STALE_RESPONSES.inc(reason)
+        logger.warning(f"Serving stale data ({reason}{': ' + detail if detail else ''})")
+        if self.response is not None:
+            self.response.headers["X-Data-Stale"] = "true"
+        return result
 
 
-def get_api_db() -> APIDBManager:
+def get_api_db(response: Response) -> APIDBManager:
     """Return a read-only DB wrapper for API endpoints (uses anon key)."""
-    return APIDBManager(get_api_client())
+    return APIDBManager(get_api_client(), response)
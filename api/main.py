@@ -3,17 +3,22 @@ from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
-from fastapi import FastAPI, Depends
+from fastapi import FastAPI, Depends, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 
 from config.settings import settings
-from api.dependencies import get_api_db, APIDBManager
+from api import metrics, profiling
+from api.compression import CompressionMiddleware
+from api.dependencies import get_api_db, verify_api_key, APIDBManager
+from api.responses import ORJSONResponse
 from api.routes import academic, people, campus, finance, info, search, courses
 
 app = FastAPI(
     title="EWU Database API",
     description="Read-only REST API for East West University data",
     version="1.0.0",
+    default_response_class=ORJSONResponse,
 )
 
 app.add_middleware(
@@ -23,6 +28,10 @@ app.add_middleware(
     allow_methods=["GET"],
     allow_headers=["*"],
 )
+app.add_middleware(CompressionMiddleware, minimum_size=settings.API_COMPRESSION_MIN_SIZE)
+app.add_middleware(profiling.ProfilingMiddleware, authorize=verify_api_key)
+# Outermost, so latency includes compression and CORS handling
+app.add_middleware(metrics.MetricsMiddleware)
 
 app.include_router(academic.router)
 app.include_router(people.router)
@@ -40,18 +49,47 @@ def health():
 
 @app.get("/api/last-update", tags=["Meta"])
 def last_update(db: APIDBManager = Depends(get_api_db)):
-    response = (
+    response = db.execute(
         db.client.table("scrape_metadata")
         .select("*")
         .order("last_run", desc=True)
         .limit(1)
-        .execute()
     )
     if not response.data:
         return {"data": None}
     return {"data": response.data[0]}
 
 
+@app.get("/metrics", tags=["Meta"], include_in_schema=False, dependencies=[Depends(verify_api_key)])
+def prometheus_metrics():
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+@app.get("/api/profiles", tags=["Meta"], include_in_schema=False, dependencies=[Depends(verify_api_key)])
+def list_profiles():
+    data = [p.summary() for p in profiling.recent_profiles()]
+    return {"data": data, "count": len(data)}
+
+
+@app.get("/api/profiles/{profile_id}", tags=["Meta"], include_in_schema=False,
+         dependencies=[Depends(verify_api_key)])
+def get_profile(profile_id: int):
+    profile = profiling.find_profile(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return {"data": profile.to_dict()}
+
+
+@app.get("/api/profiles/{profile_id}/folded", tags=["Meta"], include_in_schema=False,
+         dependencies=[Depends(verify_api_key)])
+def get_profile_folded(profile_id: int):
+    """Folded stacks for flamegraph.pl, speedscope or inferno."""
+    profile = profiling.find_profile(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return PlainTextResponse(profile.folded())
+
+
 if __name__ == "__main__":
     import uvicorn
 
@@ -0,0 +1,182 @@
+import threading
+import time
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from collections.abc import Callable
+
+# Request latencies: 5 ms .. 10 s
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class _Metric(ABC):
+    type_name = ""
+
+    def __init__(self, name: str, help_text: str, labels: tuple[str, ...] = ()):
+        self.name = name
+        self.help = help_text
+        self.label_names = labels
+        self._lock = threading.Lock()
+        REGISTRY.append(self)
+
+    def _label_str(self, values: tuple, extra: str = "") -> str:
+        pairs = [f'{n}="{_escape(str(v))}"' for n, v in zip(self.label_names, values)]
+        if extra:
+            pairs.append(extra)
+        return "{" + ",".join(pairs) + "}" if pairs else ""
+
+    @abstractmethod
+    def samples(self) -> list[str]:
+        """Exposition lines for this metric's current values."""
+
+
+class Counter(_Metric):
+    """Monotonic counter keyed by label values."""
+    type_name = "counter"
+
+    def __init__(self, name: str, help_text: str, labels: tuple[str, ...] = ()):
+        super().__init__(name, help_text, labels)
+        self._values: dict[tuple, float] = {}
+
+    def inc(self, *labels, amount: float = 1.0):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def samples(self) -> list[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return [f"{self.name}{self._label_str(k)} {_number(v)}" for k, v in items]
+
+
+class Gauge(_Metric):
+    """Value that goes up and down, or is read from ``callback`` at scrape time."""
+    type_name = "gauge"
+
+    def __init__(self, name: str, help_text: str, labels: tuple[str, ...] = (),
+                 callback: Callable[[], float] | None = None):
+        super().__init__(name, help_text, labels)
+        self._values: dict[tuple, float] = {}
+        self._callback = callback
+
+    def inc(self, *labels, amount: float = 1.0):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def dec(self, *labels, amount: float = 1.0):
+        self.inc(*labels, amount=-amount)
+
+    def samples(self) -> list[str]:
+        if self._callback is not None:
+            return [f"{self.name} {_number(self._callback())}"]
+        with self._lock:
+            items = list(self._values.items())
+        return [f"{self.name}{self._label_str(k)} {_number(v)}" for k, v in items]
+
+
+class Histogram(_Metric):
+    """Cumulative-bucket histogram; one observation is a bisect and three adds."""
+    type_name = "histogram"
+
+    def __init__(self, name: str, help_text: str, labels: tuple[str, ...] = (),
+                 buckets: tuple[float, ...] = LATENCY_BUCKETS):
+        super().__init__(name, help_text, labels)
+        self.buckets = buckets
+        # label values -> [per-bucket counts (+Inf last), sum]
+        self._values: dict[tuple, list] = {}
+
+    def observe(self, value: float, *labels):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(labels)
+            if entry is None:
+                entry = self._values[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            entry[0][index] += 1
+            entry[1] += value
+
+    def samples(self) -> list[str]:
+        with self._lock:
+            items = [(k, list(counts), total) for k, (counts, total) in self._values.items()]
+        lines = []
+        for labels, counts, total in items:
+            cumulative = 0
+            for bound, count in zip((*self.buckets, float("inf")), counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else _number(bound)
+                bucket_label = f'le="{le}"'
+                lines.append(f"{self.name}_bucket{self._label_str(labels, bucket_label)} {cumulative}")
+            lines.append(f"{self.name}_sum{self._label_str(labels)} {_number(total)}")
+            lines.append(f"{self.name}_count{self._label_str(labels)} {cumulative}")
+        return lines
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+REGISTRY: list[_Metric] = []
+
+HTTP_REQUESTS = Counter(
+    "api_http_requests_total", "HTTP requests by route template and status", ("method", "route", "status"))
+HTTP_LATENCY = Histogram(
+    "api_http_request_duration_seconds", "HTTP request latency by route template", ("method", "route"))
+HTTP_IN_FLIGHT = Gauge("api_http_requests_in_flight", "HTTP requests currently being served")
+UPSTREAM_LATENCY = Histogram(
+    "api_upstream_request_duration_seconds", "Supabase (PostgREST) call latency by table", ("table",))
+UPSTREAM_ERRORS = Counter(
+    "api_upstream_errors_total",
+    "Failed Supabase calls by table; kind is 'upstream' (Supabase unhealthy) or 'query'", ("table", "kind"))
+STALE_RESPONSES = Counter(
+    "api_stale_responses_total", "Responses served from the stale cache by reason", ("reason",))
+CACHE_LOOKUPS = Counter(
+    "api_cache_lookups_total", "Cache lookups by cache and result (hit or miss)", ("cache", "result"))
+
+
+def render() -> str:
+    """Prometheus text exposition format 0.0.4."""
+    lines = []
+    for metric in REGISTRY:
+        lines.append(f"# HELP {metric.name} {metric.help}")
+        lines.append(f"# TYPE {metric.name} {metric.type_name}")
+        lines.extend(metric.samples())
+    return "\n".join(lines) + "\n"
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware recording request counts, latency and in-flight requests.
+
+    Routes are labelled by their template (``/api/faculty/{faculty_id}``),
+    read from the matched route after the app ran, so label cardinality
+    stays bounded; unmatched paths share one label.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        HTTP_IN_FLIGHT.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            HTTP_IN_FLIGHT.dec()
+            route = scope.get("route")
+            template = getattr(route, "path", None) or "unmatched"
+            HTTP_REQUESTS.inc(scope["method"], template, str(status))
+            HTTP_LATENCY.observe(elapsed, scope["method"], template)
+
@@ -0,0 +1,235 @@
+import contextvars
+import itertools
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter, deque
+from collections.abc import Callable
+from datetime import datetime, timezone
+
+from fastapi import HTTPException
+
+from config.settings import settings
+
+PROFILE_HEADER = b"x-profile"
+
+_current_profile: contextvars.ContextVar["RequestProfile | None"] = contextvars.ContextVar(
+    "request_profile", default=None
+)
+
+
+def _frame_label(code) -> str:
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class RequestProfile:
+    """Stack samples and upstream timings collected for one request.
+
+    Threads join the profile under a role ("loop", "route", "upstream");
+    the sampler only looks at threads that are currently registered, and
+    the role becomes the root frame of each folded stack.
+    """
+
+    def __init__(self, profile_id: int, method: str, path: str):
+        self.id = profile_id
+        self.method = method
+        self.path = path
+        self.route: str | None = None
+        self.status: int | None = None
+        self.started_at = datetime.now(timezone.utc).isoformat()
+        self.duration = 0.0
+        self.samples: Counter[str] = Counter()
+        self.upstream: list[dict] = []
+        self._threads: dict[int, str] = {}
+        self._lock = threading.Lock()
+
+    def register_thread(self, role: str):
+        with self._lock:
+            self._threads.setdefault(threading.get_ident(), role)
+
+    def unregister_thread(self):
+        with self._lock:
+            self._threads.pop(threading.get_ident(), None)
+
+    def release_threads(self):
+        """Unregister every thread still in the profile, wherever it registered."""
+        with self._lock:
+            self._threads.clear()
+
+    def wrap(self, fn: Callable, role: str) -> Callable:
+        """Return ``fn`` that samples whichever thread ends up running it."""
+        def run():
+            self.register_thread(role)
+            try:
+                return fn()
+            finally:
+                self.unregister_thread()
+        return run
+
+    def record_upstream(self, table: str, seconds: float, outcome: str):
+        with self._lock:
+            self.upstream.append({"table": table, "ms": round(seconds * 1000, 2), "outcome": outcome})
+
+    def _sample(self, frames: dict):
+        with self._lock:
+            threads = list(self._threads.items())
+        for thread_id, role in threads:
+            frame = frames.get(thread_id)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                stack.append(_frame_label(frame.f_code))
+                frame = frame.f_back
+            stack.append(role)
+            self.samples[";".join(reversed(stack))] += 1
+
+    def folded(self) -> str:
+        """Folded stacks ("root;...;leaf count"), the input of flamegraph.pl and speedscope."""
+        return "\n".join(f"{stack} {count}" for stack, count in self.samples.most_common()) + "\n"
+
+    def summary(self) -> dict:
+        return {
+            "id": self.id,
+            "started_at": self.started_at,
+            "method": self.method,
+            "path": self.path,
+            "route": self.route,
+            "status": self.status,
+            "duration_ms": round(self.duration * 1000, 2),
+            "samples": sum(self.samples.values()),
+            "upstream_calls": len(self.upstream),
+            "upstream_ms": round(sum(u["ms"] for u in self.upstream), 2),
+        }
+
+    def to_dict(self) -> dict:
+        return {
+            **self.summary(),
+            "interval_ms": settings.API_PROFILE_INTERVAL_MS,
+            "upstream": self.upstream,
+            "stacks": dict(self.samples.most_common()),
+        }
+
+
+class Sampler:
+    """One background thread sampling every active profile at a fixed interval.
+
+    It sleeps while no request is being profiled, so it costs nothing
+    unless profiling was asked for.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._active: set[RequestProfile] = set()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self, profile: RequestProfile):
+        with self._lock:
+            self._active.add(profile)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+                self._thread.start()
+        self._wake.set()
+
+    def stop(self, profile: RequestProfile):
+        with self._lock:
+            self._active.discard(profile)
+
+    def _run(self):
+        while True:
+            with self._lock:
+                active = list(self._active)
+                if not active:
+                    self._wake.clear()
+            if not active:
+                self._wake.wait()
+                continue
+            frames = sys._current_frames()
+            for profile in active:
+                profile._sample(frames)
+            del frames
+            time.sleep(self.interval)
+
+
+_ids = itertools.count(1)
+_sampler = Sampler(settings.API_PROFILE_INTERVAL_MS / 1000)
+_buffer: deque[RequestProfile] = deque(maxlen=settings.API_PROFILE_BUFFER_SIZE)
+
+
+def current_profile() -> RequestProfile | None:
+    return _current_profile.get()
+
+
+def find_profile(profile_id: int) -> RequestProfile | None:
+    for profile in _buffer:
+        if profile.id == profile_id:
+            return profile
+    return None
+
+
+def recent_profiles() -> list[RequestProfile]:
+    """Buffered profiles, newest first."""
+    return list(reversed(_buffer))
+
+
+class ProfilingMiddleware:
+    """Pure ASGI middleware that profiles selected requests into a ring buffer.
+
+    A request is profiled when it sends ``X-Profile: 1`` and passes
+    ``authorize`` (called with its X-Api-Key, raising HTTPException to
+    refuse), or when it is picked at API_PROFILE_SAMPLE_RATE. Profiled
+    responses carry ``X-Profile-Id``; the profile stays downloadable until
+    it falls out of the buffer. Samples of the event-loop thread may
+    include other requests served concurrently on it.
+    """
+
+    def __init__(self, app, authorize: Callable[[str | None], None]):
+        self.app = app
+        self.authorize = authorize
+
+    def _requested(self, scope) -> bool:
+        headers = dict(scope.get("headers") or [])
+        if headers.get(PROFILE_HEADER, b"").lower() in (b"1", b"true"):
+            api_key = headers.get(b"x-api-key")
+            try:
+                self.authorize(api_key.decode("latin-1") if api_key else None)
+                return True
+            except HTTPException:
+                return False
+        rate = settings.API_PROFILE_SAMPLE_RATE
+        return rate > 0 and random.random() < rate
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self._requested(scope):
+            await self.app(scope, receive, send)
+            return
+
+        profile = RequestProfile(next(_ids), scope["method"], scope["path"])
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                profile.status = message["status"]
+                headers = list(message.get("headers", []))
+                headers.append((b"x-profile-id", str(profile.id).encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        token = _current_profile.set(profile)
+        start = time.perf_counter()
+        try:
+            profile.register_thread("loop")
+            _sampler.start(profile)
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            profile.duration = time.perf_counter() - start
+            _sampler.stop(profile)
+            # Includes threadpool threads that joined as "route", which go back to the pool
+            profile.release_threads()
+            _current_profile.reset(token)
+            profile.route = getattr(scope.get("route"), "path", None)
+            _buffer.append(profile)
+
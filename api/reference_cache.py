@@ -0,0 +1,109 @@
+import threading
+import time
+
+from api.dependencies import APIDBManager, get_api_client
+from api.metrics import CACHE_LOOKUPS
+from config.settings import settings
+from utils.logger import logger
+
+
+class _CachedTable:
+    """Rows of one reference table plus the version they were loaded at."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.rows: list[dict] = []
+        self.by_id: dict[str, dict] = {}
+        self.version: tuple | None = None
+        self.checked_at = 0.0
+        self.lock = threading.Lock()
+
+
+class ReferenceCache:
+    """In-process cache for small, rarely changing reference tables.
+
+    Each table is reloaded only when its version (row count plus latest
+    ``updated_at``) changes, which happens when a scrape or migration writes
+    to it. The version probe itself runs at most once per ``check_interval``.
+    Queries go through APIDBManager, so the circuit breaker and stale
+    fallback apply; a cold table with Supabase down raises its 503.
+    """
+
+    def __init__(self, tables: list[str], check_interval: float):
+        self.check_interval = check_interval
+        self._tables = {name: _CachedTable(name) for name in tables}
+
+    def rows(self, table: str) -> list[dict]:
+        return self._fresh(table).rows
+
+    def get(self, table: str, row_id: str | None) -> dict | None:
+        if row_id is None:
+            return None
+        return self._fresh(table).by_id.get(row_id)
+
+    def invalidate(self, table: str | None = None):
+        """Force the next access to re-check the version of one or all tables."""
+        targets = [self._tables[table]] if table else self._tables.values()
+        for cached in targets:
+            cached.checked_at = 0.0
+
+    def _fresh(self, table: str) -> _CachedTable:
+        cached = self._tables[table]
+        if time.monotonic() - cached.checked_at < self.check_interval:
+            CACHE_LOOKUPS.inc(f"reference:{table}", "hit")
+            return cached
+
+        with cached.lock:
+            # Another thread may have refreshed while we waited for the lock
+            if time.monotonic() - cached.checked_at < self.check_interval:
+                CACHE_LOOKUPS.inc(f"reference:{table}", "hit")
+                return cached
+            CACHE_LOOKUPS.inc(f"reference:{table}", "miss")
+            try:
+                version = self._probe_version(table)
+                if version != cached.version:
+                    self._load(cached, version)
+                cached.checked_at = time.monotonic()
+            except Exception as e:
+                if cached.version is None:
+                    raise
+                cached.checked_at = time.monotonic()
+                logger.warning(f"Reference cache refresh failed for {table}, serving cached rows: {e}")
+        return cached
+
+    def _probe_version(self, table: str) -> tuple:
+        db = APIDBManager(get_api_client())
+        response = db.execute(
+            db.client.table(table)
+            .select("updated_at", count="exact")
+            .order("updated_at", desc=True)
+            .limit(1)
+        )
+        latest = response.data[0]["updated_at"] if response.data else None
+        return response.count, latest
+
+    def _load(self, cached: _CachedTable, version: tuple):
+        db = APIDBManager(get_api_client())
+        response = db.execute(db.client.table(cached.name).select("*"))
+        cached.rows = response.data
+        cached.by_id = {row["id"]: row for row in response.data}
+        cached.version = version
+        logger.info(f"Reference cache loaded {len(response.data)} rows from {cached.name}")
+
+
+reference_cache = ReferenceCache(
+    ["departments", "grade_scale", "course_programs"],
+    check_interval=settings.REFERENCE_CACHE_CHECK_SECONDS,
+)
+
+
+def embed_departments(rows: list[dict]) -> list[dict]:
+    """Return copies of ``rows`` with ``departments: {name, code}`` attached, like a PostgREST embed."""
+    embedded = []
+    for row in rows:
+        dept = reference_cache.get("departments", row.get("department_id"))
+        embedded.append({
+            **row,
+            "departments": {"name": dept["name"], "code": dept["code"]} if dept else None,
+        })
+    return embedded
@@ -0,0 +1,95 @@
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Hashable
+from typing import Any
+
+import httpx
+from postgrest.exceptions import APIError
+
+from utils.logger import logger
+
+
+def is_upstream_failure(exc: BaseException) -> bool:
+    """Return True if an exception means Supabase itself is unhealthy.
+
+    Transport errors and timeouts count, as do PostgREST connection errors
+    (PGRST00x) and error bodies it could not parse (gateway pages). Ordinary
+    query errors such as a malformed UUID do not.
+    """
+    if isinstance(exc, httpx.HTTPError):
+        return True
+    if isinstance(exc, APIError):
+        return exc.code is None or str(exc.code).startswith("PGRST00")
+    return False
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker with a single half-open probe.
+
+    After ``failure_threshold`` consecutive upstream failures the circuit
+    opens and calls are refused for ``reset_timeout`` seconds. The next call
+    after that is let through as a probe; its outcome closes or re-opens it.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            if self.state != self.CLOSED:
+                logger.info("Upstream recovered, closing circuit")
+            self.state = self.CLOSED
+            self._failures = 0
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self.state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    logger.warning(
+                        f"Opening circuit after {self._failures} consecutive upstream failures"
+                    )
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
+
+
+class StaleCache:
+    """Bounded LRU of the last good response for each query key."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[Hashable, Any] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Any | None:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def put(self, key: Hashable, value: Any):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
@@ -0,0 +1,15 @@
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON response serialized with orjson instead of the stdlib encoder.
+
+    Kept local rather than using fastapi.responses.ORJSONResponse, which
+    newer FastAPI releases deprecate (and warn about on every response).
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
@@ -1,6 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
 
 from api.dependencies import verify_api_key, get_api_db, APIDBManager
+from api.reference_cache import reference_cache, embed_departments
 
 router = APIRouter(prefix="/api", tags=["Academic"], dependencies=[Depends(verify_api_key)])
 
@@ -8,13 +9,12 @@ router = APIRouter(prefix="/api", tags=["Academic"], dependencies=[Depends(verif
 @router.get("/departments")
 def list_departments(
     faculty: str | None = Query(default=None, description="Filter by faculty name"),
-    db: APIDBManager = Depends(get_api_db),
 ):
-    query = db.client.table("departments").select("*")
+    data = reference_cache.rows("departments")
     if faculty:
-        query = query.ilike("faculty", f"%{faculty}%")
-    response = query.execute()
-    return {"data": response.data, "count": len(response.data)}
+        needle = faculty.lower()
+        data = [d for d in data if needle in (d.get("faculty") or "").lower()]
+    return {"data": data, "count": len(data)}
 
 
 @router.get("/programs")
@@ -25,14 +25,15 @@ def list_programs(
     offset: int = Query(default=0, ge=0),
     db: APIDBManager = Depends(get_api_db),
 ):
-    query = db.client.table("programs").select("*, departments(name, code)")
+    query = db.client.table("programs").select("*")
     if degree_type:
         query = query.eq("degree_type", degree_type)
     if department_id:
         query = query.eq("department_id", department_id)
     query = query.range(offset, offset + limit - 1)
-    response = query.execute()
-    return {"data": response.data, "count": len(response.data)}
+    response = db.execute(query)
+    data = embed_departments(response.data)
+    return {"data": data, "count": len(data)}
 
 
 @router.get("/programs/{program_id}")
@@ -40,21 +41,20 @@ def get_program(
     program_id: str,
     db: APIDBManager = Depends(get_api_db),
 ):
-    response = (
+    response = db.execute(
         db.client.table("programs")
-        .select("*, departments(name, code)")
+        .select("*")
         .eq("id", program_id)
-        .execute()
     )
     if not response.data:
         raise HTTPException(status_code=404, detail="Program not found")
-    return {"data": response.data[0]}
+    return {"data": embed_departments(response.data)[0]}
 
 
 @router.get("/grade-scale")
-def list_grade_scale(db: APIDBManager = Depends(get_api_db)):
-    response = db.client.table("grade_scale").select("*").execute()
-    return {"data": response.data, "count": len(response.data)}
+def list_grade_scale():
+    data = reference_cache.rows("grade_scale")
+    return {"data": data, "count": len(data)}
 
 
 @router.get("/admission-deadlines")
@@ -68,7 +68,7 @@ def list_admission_deadlines(
         query = query.ilike("level", f"%{level}%")
     if semester:
         query = query.ilike("semester", f"%{semester}%")
-    response = query.execute()
+    response = db.execute(query)
     return {"data": response.data, "count": len(response.data)}
 
 
@@ -86,5 +86,5 @@ def list_academic_calendar(
         query = query.ilike("program_type", f"%{program_type}%")
     if calendar_type:
         query = query.eq("calendar_type", calendar_type)
-    response = query.order("event_date").execute()
+    response = db.execute(query.order("event_date"))
     return {"data": response.data, "count": len(response.data)}
@@ -7,17 +7,16 @@ router = APIRouter(prefix="/api", tags=["Campus"], dependencies=[Depends(verify_
 
 @router.get("/clubs")
 def list_clubs(db: APIDBManager = Depends(get_api_db)):
-    response = db.client.table("clubs").select("*").execute()
+    response = db.execute(db.client.table("clubs").select("*"))
     return {"data": response.data, "count": len(response.data)}
 
 
 @router.get("/events")
 def list_events(db: APIDBManager = Depends(get_api_db)):
-    response = (
+    response = db.execute(
         db.client.table("events")
         .select("*")
         .order("event_date", desc=True)
-        .execute()
     )
     return {"data": response.data, "count": len(response.data)}
 
@@ -27,12 +26,11 @@ def list_notices(
     limit: int = Query(default=50, ge=1, le=500, description="Max records to return"),
     db: APIDBManager = Depends(get_api_db),
 ):
-    response = (
+    response = db.execute(
         db.client.table("notices")
         .select("*")
         .order("published_date", desc=True)
         .limit(limit)
-        .execute()
     )
     return {"data": response.data, "count": len(response.data)}
 
@@ -45,11 +43,11 @@ def list_helpdesk(
     query = db.client.table("helpdesk_contacts").select("*")
     if category:
         query = query.ilike("category", f"%{category}%")
-    response = query.execute()
+    response = db.execute(query)
     return {"data": response.data, "count": len(response.data)}
 
 
 @router.get("/proctor-schedule")
 def list_proctor_schedule(db: APIDBManager = Depends(get_api_db)):
-    response = db.client.table("proctor_schedule").select("*").execute()
+    response = db.execute(db.client.table("proctor_schedule").select("*"))
     return {"data": response.data, "count": len(response.data)}
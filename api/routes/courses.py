@@ -1,25 +1,30 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
 
 from api.dependencies import verify_api_key, get_api_db, APIDBManager
+from api.reference_cache import reference_cache
 
 router = APIRouter(prefix="/api", tags=["Courses"], dependencies=[Depends(verify_api_key)])
 
+COURSE_PROGRAM_LIST_COLUMNS = [
+    "id", "program_code", "program_name", "level", "total_credits", "department",
+    "created_at", "updated_at",
+]
+
 
 @router.get("/courses/programs")
 def list_course_programs(
     level: str | None = Query(default=None, description="Filter by level: undergraduate or graduate"),
     search: str | None = Query(default=None, description="Search by program name"),
-    db: APIDBManager = Depends(get_api_db),
 ):
-    query = db.client.table("course_programs").select(
-        "id,program_code,program_name,level,total_credits,department,created_at,updated_at"
-    )
+    programs = reference_cache.rows("course_programs")
     if level:
-        query = query.eq("level", level.lower())
+        programs = [p for p in programs if p["level"] == level.lower()]
     if search:
-        query = query.ilike("program_name", f"%{search}%")
-    response = query.order("level").order("program_code").execute()
-    return {"data": response.data, "count": len(response.data)}
+        needle = search.lower()
+        programs = [p for p in programs if needle in (p.get("program_name") or "").lower()]
+    programs = sorted(programs, key=lambda p: (p["level"], p["program_code"]))
+    data = [{col: p.get(col) for col in COURSE_PROGRAM_LIST_COLUMNS} for p in programs]
+    return {"data": data, "count": len(data)}
 
 
 @router.get("/courses/programs/{program_code}")
@@ -27,23 +32,31 @@ def get_course_program(
     program_code: str,
     db: APIDBManager = Depends(get_api_db),
 ):
-    prog_resp = (
+    # Fast path: one lookup against the view refreshed by database.migrate
+    doc_resp = db.execute(
+        db.client.table("course_program_documents")
+        .select("program, courses")
+        .eq("program_code", program_code.lower())
+    )
+    if doc_resp.data:
+        doc = doc_resp.data[0]
+        return {"data": {**doc["program"], "courses": doc["courses"]}}
+
+    prog_resp = db.execute(
         db.client.table("course_programs")
         .select("*")
         .eq("program_code", program_code.lower())
-        .execute()
     )
     if not prog_resp.data:
         raise HTTPException(status_code=404, detail="Program not found")
-    program = prog_resp.data[0]
+    program = dict(prog_resp.data[0])
 
-    courses_resp = (
+    courses_resp = db.execute(
         db.client.table("course_offerings")
         .select("*")
         .eq("program_code", program_code.lower())
         .order("section")
         .order("course_code")
-        .execute()
     )
 
     grouped: dict[str, list] = {}
@@ -78,7 +91,7 @@ def list_course_offerings(
     if search:
         query = query.or_(f"course_title.ilike.%{search}%,course_code.ilike.%{search}%")
     query = query.range(offset, offset + limit - 1).order("program_code").order("course_code")
-    response = query.execute()
+    response = db.execute(query)
     return {"data": response.data, "count": len(response.data)}
 
 
@@ -91,7 +104,7 @@ def get_course_offering(
     query = db.client.table("course_offerings").select("*").eq("course_code", course_code)
     if program:
         query = query.eq("program_code", program.lower())
-    response = query.execute()
+    response = db.execute(query)
     if not response.data:
         raise HTTPException(status_code=404, detail="Course not found")
     if len(response.data) == 1:
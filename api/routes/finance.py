@@ -13,11 +13,11 @@ def list_tuition_fees(
     query = db.client.table("tuition_fees").select("*")
     if level:
         query = query.ilike("level", f"%{level}%")
-    response = query.execute()
+    response = db.execute(query)
     return {"data": response.data, "count": len(response.data)}
 
 
 @router.get("/scholarships")
 def list_scholarships(db: APIDBManager = Depends(get_api_db)):
-    response = db.client.table("scholarships").select("*").execute()
+    response = db.execute(db.client.table("scholarships").select("*"))
     return {"data": response.data, "count": len(response.data)}
@@ -7,21 +7,19 @@ router = APIRouter(prefix="/api", tags=["Information"], dependencies=[Depends(ve
 
 @router.get("/documents")
 def list_documents(db: APIDBManager = Depends(get_api_db)):
-    response = (
+    response = db.execute(
         db.client.table("university_documents")
         .select("slug, title, source_file")
-        .execute()
     )
     return {"data": response.data, "count": len(response.data)}
 
 
 @router.get("/documents/{slug}")
 def get_document(slug: str, db: APIDBManager = Depends(get_api_db)):
-    response = (
+    response = db.execute(
         db.client.table("university_documents")
         .select("*")
         .eq("slug", slug)
-        .execute()
     )
     if not response.data:
         raise HTTPException(status_code=404, detail="Document not found")
@@ -30,22 +28,21 @@ def get_document(slug: str, db: APIDBManager = Depends(get_api_db)):
 
 @router.get("/policies")
 def list_policies(db: APIDBManager = Depends(get_api_db)):
-    response = db.client.table("policies").select("*").execute()
+    response = db.execute(db.client.table("policies").select("*"))
     return {"data": response.data, "count": len(response.data)}
 
 
 @router.get("/newsletters")
 def list_newsletters(db: APIDBManager = Depends(get_api_db)):
-    response = (
+    response = db.execute(
         db.client.table("newsletters")
         .select("*")
         .order("year", desc=True)
-        .execute()
     )
     return {"data": response.data, "count": len(response.data)}
 
 
 @router.get("/partnerships")
 def list_partnerships(db: APIDBManager = Depends(get_api_db)):
-    response = db.client.table("partnerships").select("*").execute()
+    response = db.execute(db.client.table("partnerships").select("*"))
     return {"data": response.data, "count": len(response.data)}
@@ -1,6 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
 
 from api.dependencies import verify_api_key, get_api_db, APIDBManager
+from api.reference_cache import embed_departments
 
 router = APIRouter(prefix="/api", tags=["People"], dependencies=[Depends(verify_api_key)])
 
@@ -13,14 +14,15 @@ def list_faculty(
     offset: int = Query(default=0, ge=0),
     db: APIDBManager = Depends(get_api_db),
 ):
-    query = db.client.table("faculty_members").select("*, departments(name, code)")
+    query = db.client.table("faculty_members").select("*")
     if department_id:
         query = query.eq("department_id", department_id)
     if name:
         query = query.ilike("name", f"%{name}%")
     query = query.range(offset, offset + limit - 1)
-    response = query.execute()
-    return {"data": response.data, "count": len(response.data)}
+    response = db.execute(query)
+    data = embed_departments(response.data)
+    return {"data": data, "count": len(data)}
 
 
 @router.get("/faculty/{faculty_id}")
@@ -28,15 +30,14 @@ def get_faculty_member(
     faculty_id: str,
     db: APIDBManager = Depends(get_api_db),
 ):
-    response = (
+    response = db.execute(
         db.client.table("faculty_members")
-        .select("*, departments(name, code)")
+        .select("*")
         .eq("id", faculty_id)
-        .execute()
     )
     if not response.data:
         raise HTTPException(status_code=404, detail="Faculty member not found")
-    return {"data": response.data[0]}
+    return {"data": embed_departments(response.data)[0]}
 
 
 @router.get("/governance")
@@ -50,11 +51,11 @@ def list_governance(
     query = db.client.table("governance_members").select("*")
     if body:
         query = query.eq("body", body)
-    response = query.execute()
+    response = db.execute(query)
     return {"data": response.data, "count": len(response.data)}
 
 
 @router.get("/alumni")
 def list_alumni(db: APIDBManager = Depends(get_api_db)):
-    response = db.client.table("notable_alumni").select("*").execute()
+    response = db.execute(db.client.table("notable_alumni").select("*"))
     return {"data": response.data, "count": len(response.data)}
@@ -22,12 +22,11 @@ def search(
     pattern = f"%{q}%"
 
     for cfg in SEARCH_TABLES:
-        response = (
+        response = db.execute(
             db.client.table(cfg["table"])
             .select("*")
             .ilike(cfg["column"], pattern)
             .limit(10)
-            .execute()
         )
         if response.data:
             results[cfg["label"]] = response.data
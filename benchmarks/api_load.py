@@ -0,0 +1,271 @@
+"""Load test for every API route against the local PostgREST stand-in.
+
+Starts benchmarks.postgrest_stub (loaded from manually_scrapped_data/), points
+the API at it, serves the app with uvicorn and drives each endpoint at the
+given concurrency. Reports p50/p95/p99 latency, throughput and error rate per
+endpoint:
+    python -m benchmarks.api_load --concurrency 16 --requests 300 --upstream-latency-ms 5
+
+Compare against a stored baseline (non-zero exit on regression), or promote
+the current numbers:
+    python -m benchmarks.api_load --baseline benchmarks/api_baseline.json
+    python -m benchmarks.api_load --save-baseline
+
+--api-url targets an already running deployment instead of the local stack.
+"""
+
+import argparse
+import json
+import socket
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+
+import httpx
+
+from benchmarks.postgrest_stub import PostgrestStub, load_tables
+from config.settings import settings
+from utils.logger import logger
+
+BENCH_DIR = Path(__file__).resolve().parent
+# Default destination of result files, outside the source tree
+RESULTS_DIR = settings.LOGS_DIR / "benchmarks"
+BASELINE_PATH = BENCH_DIR / "api_baseline.json"
+
+RESULT_SCHEMA = 1
+
+# (name, path); {placeholders} are filled from the stand-in's data
+ENDPOINTS = [
+    ("health", "/api/health"),
+    ("last_update", "/api/last-update"),
+    ("departments", "/api/departments"),
+    ("programs", "/api/programs"),
+    ("program_detail", "/api/programs/{program_id}"),
+    ("grade_scale", "/api/grade-scale"),
+    ("admission_deadlines", "/api/admission-deadlines"),
+    ("academic_calendar", "/api/academic-calendar"),
+    ("clubs", "/api/clubs"),
+    ("events", "/api/events"),
+    ("notices", "/api/notices"),
+    ("helpdesk", "/api/helpdesk"),
+    ("proctor_schedule", "/api/proctor-schedule"),
+    ("course_programs", "/api/courses/programs"),
+    ("course_program_detail", "/api/courses/programs/{program_code}"),
+    ("courses", "/api/courses?limit=50"),
+    ("courses_search", "/api/courses?search=intro"),
+    ("course_detail", "/api/courses/{course_code}"),
+    ("tuition_fees", "/api/tuition-fees"),
+    ("scholarships", "/api/scholarships"),
+    ("documents", "/api/documents"),
+    ("document_detail", "/api/documents/{slug}"),
+    ("policies", "/api/policies"),
+    ("newsletters", "/api/newsletters"),
+    ("partnerships", "/api/partnerships"),
+    ("faculty", "/api/faculty?limit=50"),
+    ("faculty_search", "/api/faculty?name=rahman"),
+    ("faculty_detail", "/api/faculty/{faculty_id}"),
+    ("governance", "/api/governance"),
+    ("alumni", "/api/alumni"),
+    ("search", "/api/search?q=computer"),
+]
+
+
+def _placeholders(tables: dict[str, list[dict]]) -> dict[str, str]:
+    def first(table, column):
+        rows = tables.get(table) or []
+        return str(rows[0][column]) if rows and rows[0].get(column) is not None else None
+
+    values = {
+        "program_id": first("programs", "id"),
+        "program_code": first("course_programs", "program_code"),
+        "course_code": first("course_offerings", "course_code"),
+        "slug": first("university_documents", "slug"),
+        "faculty_id": first("faculty_members", "id"),
+    }
+    return {k: v for k, v in values.items() if v is not None}
+
+
+def resolve_endpoints(tables: dict[str, list[dict]], only: set[str] | None = None) -> list[tuple[str, str]]:
+    values = _placeholders(tables)
+    endpoints = []
+    for name, path in ENDPOINTS:
+        if only and name not in only:
+            continue
+        try:
+            endpoints.append((name, path.format(**values)))
+        except KeyError as e:
+            logger.warning(f"Skipping {name}: no data for {e}")
+    return endpoints
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+class LocalStack:
+    """PostgREST stand-in plus the API app under uvicorn, both on loopback ports."""
+
+    def __init__(self, upstream_latency: float):
+        import uvicorn
+
+        self.tables = load_tables()
+        self.stub = PostgrestStub(self.tables, latency=upstream_latency).start()
+        # The API builds its Supabase client lazily from these
+        settings.SUPABASE_URL = self.stub.url
+        settings.SUPABASE_ANON_KEY = "postgrest-stub-anon-key"
+
+        from api.main import app
+
+        port = _free_port()
+        self.url = f"http://127.0.0.1:{port}"
+        self.server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+        self._thread = threading.Thread(target=self.server.run, name="api-server", daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        deadline = time.monotonic() + 10
+        while not self.server.started:
+            if time.monotonic() > deadline:
+                raise RuntimeError("API server did not start")
+            time.sleep(0.05)
+        return self
+
+    def __exit__(self, *exc):
+        self.server.should_exit = True
+        self._thread.join(timeout=5)
+        self.stub.stop()
+
+
+def _percentile(ordered: list[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not ordered:
+        return 0.0
+    rank = max(1, round(pct / 100 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def load_endpoint(base_url: str, path: str, requests: int, concurrency: int, headers: dict) -> dict:
+    """Issue ``requests`` GETs to one endpoint with ``concurrency`` workers."""
+    local = threading.local()
+
+    def client() -> httpx.Client:
+        if not hasattr(local, "client"):
+            local.client = httpx.Client(base_url=base_url, headers=headers, timeout=30)
+        return local.client
+
+    def one(_):
+        start = time.perf_counter()
+        try:
+            status = client().get(path).status_code
+        except httpx.HTTPError:
+            status = None
+        return time.perf_counter() - start, status
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(one, range(min(concurrency, requests))))  # warm connections and caches
+        started = time.perf_counter()
+        samples = list(pool.map(one, range(requests)))
+        elapsed = time.perf_counter() - started
+
+    latencies = sorted(latency for latency, _ in samples)
+    errors = sum(1 for _, status in samples if status is None or status >= 400)
+    statuses: dict[str, int] = {}
+    for _, status in samples:
+        statuses[str(status)] = statuses.get(str(status), 0) + 1
+
+    return {
+        "requests": requests,
+        "concurrency": concurrency,
+        "p50_ms": round(_percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(_percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(_percentile(latencies, 99) * 1000, 2),
+        "max_ms": round(latencies[-1] * 1000, 2),
+        "rps": round(requests / elapsed, 1) if elapsed else None,
+        "error_rate": round(errors / requests, 4),
+        "statuses": statuses,
+    }
+
+
+def run_load(base_url: str, endpoints: list[tuple[str, str]], requests: int, concurrency: int) -> dict:
+    headers = {"X-Api-Key": settings.API_SECRET_KEY} if settings.API_SECRET_KEY else {}
+    results = []
+    for name, path in endpoints:
+        result = {"endpoint": name, "path": path, **load_endpoint(base_url, path, requests, concurrency, headers)}
+        results.append(result)
+        logger.info(
+            f"{name:<22} p50 {result['p50_ms']:>8.2f}  p95 {result['p95_ms']:>8.2f}  "
+            f"p99 {result['p99_ms']:>8.2f} ms  {result['rps']:>8} req/s  errors {result['error_rate']:.1%}"
+        )
+    return {
+        "schema": RESULT_SCHEMA,
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "target": base_url,
+        "results": results,
+    }
+
+
+def compare(current: dict, baseline: dict, tolerance: float) -> list[str]:
+    """Return one message per endpoint whose latency, throughput or error rate regressed."""
+    previous = {r["endpoint"]: r for r in baseline.get("results", [])}
+    regressions = []
+    for result in current["results"]:
+        base = previous.get(result["endpoint"])
+        if base is None:
+            continue
+        name = result["endpoint"]
+        for metric in ("p95_ms", "p99_ms"):
+            if base.get(metric) and result[metric] > base[metric] * (1 + tolerance):
+                regressions.append(f"{name}: {metric} {base[metric]} -> {result[metric]}")
+        if base.get("rps") and result["rps"] and result["rps"] < base["rps"] * (1 - tolerance):
+            regressions.append(f"{name}: rps {base['rps']} -> {result['rps']}")
+        if result["error_rate"] > base.get("error_rate", 0):
+            regressions.append(f"{name}: error_rate {base.get('error_rate', 0)} -> {result['error_rate']}")
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load-test the API against a local PostgREST stand-in")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=200, help="Requests per endpoint")
+    parser.add_argument("--upstream-latency-ms", type=float, default=5.0,
+                        help="Simulated Supabase round-trip time added by the stand-in")
+    parser.add_argument("--endpoints", nargs="+", help="Only run these endpoint names")
+    parser.add_argument("--api-url", help="Load-test a running API instead of the local stack")
+    parser.add_argument("--baseline", type=Path, help="Compare against this results file")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--save-baseline", action="store_true", help=f"Also write results to {BASELINE_PATH}")
+    parser.add_argument("--output", type=Path,
+                        help=f"Results file (default: api_<timestamp>.json under {RESULTS_DIR})")
+    args = parser.parse_args()
+    only = set(args.endpoints) if args.endpoints else None
+
+    if args.api_url:
+        endpoints = resolve_endpoints(load_tables(), only)
+        current = run_load(args.api_url, endpoints, args.requests, args.concurrency)
+    else:
+        with LocalStack(args.upstream_latency_ms / 1000) as stack:
+            endpoints = resolve_endpoints(stack.tables, only)
+            current = run_load(stack.url, endpoints, args.requests, args.concurrency)
+    current["upstream_latency_ms"] = None if args.api_url else args.upstream_latency_ms
+
+    output = args.output or RESULTS_DIR / f"api_{datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(current, indent=2), encoding="utf-8")
+    logger.info(f"Wrote {len(current['results'])} result(s) to {output}")
+
+    if args.save_baseline:
+        BASELINE_PATH.write_text(json.dumps(current, indent=2), encoding="utf-8")
+        logger.info(f"Saved baseline to {BASELINE_PATH}")
+
+    if args.baseline:
+        regressions = compare(current, json.loads(args.baseline.read_text(encoding="utf-8")), args.tolerance)
+        for message in regressions:
+            logger.warning(f"Regression: {message}")
+        if regressions:
+            sys.exit(1)
+        logger.info("No regressions against baseline")
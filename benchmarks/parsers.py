@@ -0,0 +1,315 @@
+"""Parser benchmarks against recorded EWU pages.
+
+Record fixtures once (hits the live site, respects SCRAPE_DELAY_SECONDS):
+    python -m benchmarks.parsers --record
+
+Benchmark every scraper across the installed BeautifulSoup backends and
+compare against a baseline (non-zero exit on regression):
+    python -m benchmarks.parsers --baseline benchmarks/baseline.json
+
+Promote the current numbers to the baseline:
+    python -m benchmarks.parsers --save-baseline
+
+Fixtures are a cassette (see utils/cassette.py) in benchmarks/fixtures/: one
+entry per page a scraper parses and per sub-page its parser fetches itself
+(e.g. academic-calendar details). While benchmarking, fetch() replays them
+through CassetteAdapter, so no network is touched; no fixtures or baseline
+are committed yet, so record both before comparing.
+
+Timing and memory are measured in separate passes because tracemalloc slows
+allocation-heavy code several-fold.
+"""
+
+import argparse
+import importlib.metadata
+import json
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+
+import requests
+from bs4 import BeautifulSoup, FeatureNotFound
+
+from config.settings import settings
+from scrapers import ewu
+from scrapers.base_scraper import USER_AGENTS, BaseScraper
+from utils.cassette import CassetteAdapter
+from utils.logger import logger
+
+BENCH_DIR = Path(__file__).resolve().parent
+FIXTURES_DIR = BENCH_DIR / "fixtures"
+RESULTS_DIR = settings.LOGS_DIR / "benchmarks"
+BASELINE_PATH = BENCH_DIR / "baseline.json"
+
+RESULT_SCHEMA = 1
+PARSERS = ["lxml", "html.parser", "html5lib"]
+PARSER_PACKAGES = {"lxml": "lxml", "html5lib": "html5lib"}
+
+# Notice board pages recorded beyond page 1
+NOTICE_PAGES = 3
+
+
+def _scrapers() -> list[BaseScraper]:
+    return [getattr(ewu, name)() for name in ewu.__all__]
+
+
+def _pages(scraper: BaseScraper) -> list[str]:
+    """URLs whose HTML is handed to the scraper's page parser."""
+    if isinstance(scraper, ewu.NoticesScraper):
+        return [f"{settings.EWU_BASE_URL}/notice-board?page={p}" for p in range(1, NOTICE_PAGES + 1)]
+    return scraper.get_urls()
+
+
+def _parse(scraper: BaseScraper, html: str, url: str) -> list[dict]:
+    """Run the scraper's page-level parser on one page."""
+    if isinstance(scraper, ewu.GovernanceScraper):
+        body = next((b for b, u in scraper.BODIES.items() if u == url), "")
+        return scraper._parse_body(html, url, body)
+    return scraper.parse(html, url)
+
+
+def _cassette_fetch(session: requests.Session, cache: dict[str, str | None]):
+    """fetch() replacement going straight through ``session`` (and its cassette adapter).
+
+    Bodies are memoized in ``cache``, so only the first pass reads the
+    cassette and the timed passes measure parsing alone.
+    """
+    def fetch(url: str) -> str | None:
+        if url not in cache:
+            try:
+                resp = session.get(url, headers={"User-Agent": USER_AGENTS[0]}, timeout=settings.REQUEST_TIMEOUT)
+                resp.raise_for_status()
+                cache[url] = resp.text
+            except requests.RequestException:
+                cache[url] = None
+        return cache[url]
+    return fetch
+
+
+def _mount(scraper: BaseScraper, mode: str) -> dict[str, str | None]:
+    adapter = CassetteAdapter(FIXTURES_DIR, mode)
+    scraper.session.mount("http://", adapter)
+    scraper.session.mount("https://", adapter)
+    cache: dict[str, str | None] = {}
+    scraper.fetch = _cassette_fetch(scraper.session, cache)
+    return cache
+
+
+def record():
+    """Fetch every scraper's pages (and the sub-pages its parser requests) into the fixture cassette."""
+    for scraper in _scrapers():
+        cache = _mount(scraper, "record")
+        pages = 0
+        for url in _pages(scraper):
+            html = scraper.fetch(url)
+            if html is None:
+                continue
+            pages += 1
+            # Parsing during recording captures sub-pages fetched by parse()
+            _parse(scraper, html, url)
+            time.sleep(scraper.delay)
+        logger.info(f"[{scraper.name}] Recorded {pages} page(s), "
+                    f"{sum(body is not None for body in cache.values())} response(s)")
+
+
+class _Fixture:
+    """A scraper's recorded pages, replayed from the fixture cassette."""
+
+    def __init__(self, scraper: BaseScraper):
+        self.pages = [(url, html) for url in _pages(scraper) if (html := scraper.fetch(url)) is not None]
+        self.size = sum(len(html.encode("utf-8")) for _, html in self.pages)
+
+
+def _available_parsers(requested: list[str]) -> list[str]:
+    available = []
+    for parser in requested:
+        try:
+            BeautifulSoup("<p></p>", parser)
+            available.append(parser)
+        except FeatureNotFound:
+            logger.warning(f"Parser backend {parser!r} is not installed, skipping")
+    return available
+
+
+def _replay_scraper(cls: type[BaseScraper], parser: str) -> BaseScraper:
+    scraper = cls()
+    scraper.html_parser = parser
+    scraper.delay = 0
+    _mount(scraper, "replay")
+    return scraper
+
+
+def _run_pages(scraper: BaseScraper, fixture: _Fixture) -> int:
+    return sum(len(_parse(scraper, html, url)) for url, html in fixture.pages)
+
+
+def _warm_up(scraper: BaseScraper, fixture: _Fixture, parser: str) -> int:
+    """Untimed first pass that also checks every soup was built by ``parser``.
+
+    Raises RuntimeError if the scraper ignored the requested backend, since
+    the numbers would then be attributed to the wrong parser.
+    """
+    builders = set()
+    get_soup = scraper.get_soup
+
+    def checked_get_soup(html):
+        soup = get_soup(html)
+        builders.add(soup.builder.NAME)
+        return soup
+
+    scraper.get_soup = checked_get_soup
+    try:
+        records = _run_pages(scraper, fixture)
+    finally:
+        del scraper.get_soup
+    if builders - {parser}:
+        raise RuntimeError(f"[{scraper.name}] asked for {parser!r} but parsed with {sorted(builders)}")
+    return records
+
+
+def bench_one(cls: type[BaseScraper], parser: str, repeat: int) -> dict | None:
+    """Benchmark one scraper on one parser backend; None if it has no recorded pages."""
+    scraper = _replay_scraper(cls, parser)
+    fixture = _Fixture(scraper)
+    if not fixture.pages:
+        return None
+    records = _warm_up(scraper, fixture, parser)  # imports, regex compilation, sub-page replay
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        _run_pages(scraper, fixture)
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    tracemalloc.reset_peak()
+    result = [_parse(scraper, html, url) for url, html in fixture.pages]
+    _, peak = tracemalloc.get_traced_memory()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    retained = after.compare_to(before, "filename")
+    del result
+
+    median = statistics.median(timings)
+    return {
+        "scraper": cls.name,
+        "parser": parser,
+        "pages": len(fixture.pages),
+        "bytes": fixture.size,
+        "records": records,
+        "median_ms": round(median * 1000, 3),
+        "min_ms": round(min(timings) * 1000, 3),
+        "stdev_ms": round(statistics.stdev(timings) * 1000, 3) if len(timings) > 1 else 0.0,
+        "pages_per_s": round(len(fixture.pages) / median, 2) if median else None,
+        "mb_per_s": round(fixture.size / median / 1e6, 3) if median else None,
+        "peak_kib": round(peak / 1024, 1),
+        "retained_kib": round(sum(s.size_diff for s in retained) / 1024, 1),
+        "retained_blocks": sum(s.count_diff for s in retained),
+    }
+
+
+def _environment(parsers: list[str]) -> dict:
+    def version(package):
+        try:
+            return importlib.metadata.version(package)
+        except importlib.metadata.PackageNotFoundError:
+            return None
+
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "beautifulsoup4": version("beautifulsoup4"),
+        "parsers": {p: version(PARSER_PACKAGES[p]) if p in PARSER_PACKAGES else "stdlib" for p in parsers},
+    }
+
+
+def run_benchmarks(parsers: list[str], repeat: int, only: set[str] | None = None) -> dict:
+    parsers = _available_parsers(parsers)
+    results = []
+    logger.disable("scrapers")
+    try:
+        for name in ewu.__all__:
+            cls = getattr(ewu, name)
+            if only and cls.name not in only:
+                continue
+            for parser in parsers:
+                result = bench_one(cls, parser, repeat)
+                if result is None:
+                    logger.warning(f"[{cls.name}] No recorded fixtures, run with --record")
+                    break
+                results.append(result)
+                logger.info(
+                    f"[{cls.name}] {parser:<11} {result['median_ms']:>9.2f} ms  "
+                    f"{result['mb_per_s']} MB/s  peak {result['peak_kib']} KiB  "
+                    f"{result['records']} records"
+                )
+    finally:
+        logger.enable("scrapers")
+
+    return {
+        "schema": RESULT_SCHEMA,
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "repeat": repeat,
+        "environment": _environment(parsers),
+        "results": results,
+    }
+
+
+def compare(current: dict, baseline: dict, tolerance: float) -> list[str]:
+    """Return one message per (scraper, parser) that regressed beyond ``tolerance``."""
+    previous = {(r["scraper"], r["parser"]): r for r in baseline.get("results", [])}
+    regressions = []
+    for result in current["results"]:
+        base = previous.get((result["scraper"], result["parser"]))
+        if base is None:
+            continue
+        label = f"{result['scraper']} [{result['parser']}]"
+        for metric in ("min_ms", "peak_kib"):
+            old, new = base.get(metric), result.get(metric)
+            if old and new and new > old * (1 + tolerance):
+                regressions.append(f"{label}: {metric} {old} -> {new} (+{(new / old - 1) * 100:.0f}%)")
+        if base.get("records") != result.get("records"):
+            regressions.append(f"{label}: records {base.get('records')} -> {result.get('records')}")
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark scraper parsing against recorded HTML")
+    parser.add_argument("--record", action="store_true", help="Fetch pages from the live site into fixtures")
+    parser.add_argument("--parsers", nargs="+", default=PARSERS, help="BeautifulSoup backends to compare")
+    parser.add_argument("--scrapers", nargs="+", help="Only benchmark these scraper names")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per scraper and parser")
+    parser.add_argument("--baseline", type=Path, help="Compare against this results file")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="Allowed relative slowdown/memory growth before flagging (default 0.25)")
+    parser.add_argument("--save-baseline", action="store_true", help=f"Also write results to {BASELINE_PATH}")
+    parser.add_argument("--output", type=Path,
+                        help=f"Results file (default: parsers_<timestamp>.json under {RESULTS_DIR})")
+    args = parser.parse_args()
+
+    if args.record:
+        record()
+        sys.exit(0)
+
+    current = run_benchmarks(args.parsers, args.repeat, set(args.scrapers) if args.scrapers else None)
+    output = args.output or RESULTS_DIR / f"parsers_{datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(current, indent=2), encoding="utf-8")
+    logger.info(f"Wrote {len(current['results'])} result(s) to {output}")
+
+    if args.save_baseline:
+        BASELINE_PATH.write_text(json.dumps(current, indent=2), encoding="utf-8")
+        logger.info(f"Saved baseline to {BASELINE_PATH}")
+
+    if args.baseline:
+        regressions = compare(current, json.loads(args.baseline.read_text(encoding="utf-8")), args.tolerance)
+        for message in regressions:
+            logger.warning(f"Regression: {message}")
+        if regressions:
+            sys.exit(1)
+        logger.info("No regressions against baseline")
@@ -0,0 +1,297 @@
+"""In-memory PostgREST stand-in serving manually_scrapped_data/.
+
+Tables are built with the same transforms database.migrate uses, so the API
+sees the rows it would get from Supabase after a migration. Only the
+PostgREST surface the API uses is implemented: GET/HEAD on /rest/v1/<table>
+with select projection, eq/neq/ilike/like/in/gt/gte/lt/lte/is filters,
+or=(...), order, limit/offset, Prefer: count=exact, and no-op RPC calls.
+
+Standalone:
+    python -m benchmarks.postgrest_stub --port 54321 --latency-ms 5
+"""
+
+import argparse
+import re
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qsl, unquote, urlsplit
+
+import orjson
+
+from config.settings import settings
+from database.migrate import FILE_TABLE_MAP, _course_files, _load_and_transform, _transform_course_files
+from utils.logger import logger
+
+_ID_NAMESPACE = uuid.UUID("6f1b7c3e-7a51-4c1e-9f3e-0c0ffee0e3a1")
+
+
+def _add_row(table: dict, name: str, key_fields: tuple[str, ...], record: dict, now: str):
+    key = tuple(str(record.get(f)) for f in key_fields)
+    row = dict(record)
+    row.setdefault("id", str(uuid.uuid5(_ID_NAMESPACE, f"{name}:{key}")))
+    row.setdefault("created_at", now)
+    row.setdefault("updated_at", now)
+    table[key] = row  # upsert semantics: last write on a key wins
+
+
+def load_tables(data_dir: Path | None = None) -> dict[str, list[dict]]:
+    """Build {table: rows} from the manual data files, like a fresh migration would."""
+    data_dir = data_dir or settings.MANUAL_DATA_DIR
+    now = datetime.now(timezone.utc).isoformat()
+    tables: dict[str, dict] = {}
+
+    for filename, config in FILE_TABLE_MAP.items():
+        filepath = data_dir / filename
+        if not filepath.exists():
+            continue
+        key_fields = tuple(f.strip() for f in config.get("upsert_on", "id").split(","))
+        table = tables.setdefault(config["table"], {})
+        for record in _load_and_transform(filepath, config["transform"]):
+            _add_row(table, config["table"], key_fields, record, now)
+
+    programs = tables.setdefault("course_programs", {})
+    offerings = tables.setdefault("course_offerings", {})
+    for json_file, level in _course_files(data_dir):
+        program, courses = _transform_course_files(json_file, level)
+        _add_row(programs, "course_programs", ("program_code",), program, now)
+        for course in courses:
+            _add_row(offerings, "course_offerings", ("program_code", "course_code"), course, now)
+
+    result = {name: list(rows.values()) for name, rows in tables.items()}
+    program_ids = {p["program_code"]: p["id"] for p in result["course_programs"]}
+    for course in result["course_offerings"]:
+        course["program_id"] = program_ids.get(course["program_code"])
+
+    # Mirror of the course_program_documents materialized view
+    documents = []
+    for program in result["course_programs"]:
+        sections: dict[str, list] = {}
+        # Courses ORDER BY section NULLS LAST, course_code (NULLs last too)
+        courses = sorted(
+            (c for c in result["course_offerings"] if c["program_code"] == program["program_code"]),
+            key=lambda c: (c.get("section") is None, c.get("section") or "",
+                           c.get("course_code") is None, c.get("course_code") or ""),
+        )
+        for course in courses:
+            sections.setdefault(course.get("section") or "general", []).append(course)
+
+        def section_order(item):
+            # Sections ORDER BY all_null, first_section (MIN(section), which skips NULLs)
+            raw = [c.get("section") for c in item[1] if c.get("section") is not None]
+            return (not raw, min(raw) if raw else "")
+
+        documents.append({
+            "program_code": program["program_code"],
+            "program": program,
+            "courses": dict(sorted(sections.items(), key=section_order)),
+        })
+    result["course_program_documents"] = documents
+    result.setdefault("scrape_metadata", []).append({
+        "id": str(uuid.uuid4()), "scraper_name": "stub", "last_run": now,
+        "records_scraped": 0, "status": "success",
+    })
+    return result
+
+
+def _text(value) -> str:
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return "" if value is None else str(value)
+
+
+def _like(pattern: str, case_insensitive: bool) -> re.Pattern:
+    parts = (re.escape(p) for p in re.split(r"[%*]", pattern))
+    return re.compile("^" + ".*".join(parts) + "$", re.IGNORECASE if case_insensitive else 0)
+
+
+def _compare(value, operand: str) -> int:
+    try:
+        a, b = float(value), float(operand)
+    except (TypeError, ValueError):
+        a, b = _text(value), operand
+    return (a > b) - (a < b)
+
+
+def _condition(column: str, expression: str):
+    """Compile "op.value" (optionally "not.op.value") into a row predicate."""
+    negate = expression.startswith("not.")
+    if negate:
+        expression = expression[4:]
+    op, _, operand = expression.partition(".")
+
+    if op in ("ilike", "like"):
+        regex = _like(operand, op == "ilike")
+        test = lambda v: v is not None and bool(regex.match(_text(v)))
+    elif op == "eq":
+        test = lambda v: _text(v) == operand
+    elif op == "neq":
+        test = lambda v: _text(v) != operand
+    elif op == "in":
+        values = {v.strip().strip('"') for v in operand.strip("()").split(",")}
+        test = lambda v: _text(v) in values
+    elif op == "is":
+        expected = {"null": None, "true": True, "false": False}[operand.lower()]
+        test = lambda v: v is expected
+    elif op in ("gt", "gte", "lt", "lte"):
+        accept = {"gt": (1,), "gte": (0, 1), "lt": (-1,), "lte": (-1, 0)}[op]
+        test = lambda v: v is not None and _compare(v, operand) in accept
+    else:
+        raise ValueError(f"Unsupported operator: {op}")
+
+    return lambda row: test(row.get(column)) != negate
+
+
+def _split_top_level(text: str) -> list[str]:
+    parts, depth, current = [], 0, []
+    for char in text:
+        if char == "," and depth == 0:
+            parts.append("".join(current))
+            current = []
+            continue
+        depth += char == "("
+        depth -= char == ")"
+        current.append(char)
+    parts.append("".join(current))
+    return [p for p in parts if p]
+
+
+def _or_condition(expression: str):
+    branches = []
+    for part in _split_top_level(expression.strip()[1:-1]):
+        column, _, rest = part.partition(".")
+        branches.append(_condition(column, rest))
+    return lambda row: any(branch(row) for branch in branches)
+
+
+def _sort(rows: list[dict], order: str) -> list[dict]:
+    # Stable sorts applied from the last key to the first
+    for spec in reversed(order.split(",")):
+        column, *modifiers = spec.split(".")
+        desc = "desc" in modifiers
+        nulls_first = "nullsfirst" in modifiers or (desc and "nullslast" not in modifiers)
+        present = [r for r in rows if r.get(column) is not None]
+        missing = [r for r in rows if r.get(column) is None]
+        present.sort(key=lambda r: r[column], reverse=desc)
+        rows = missing + present if nulls_first else present + missing
+    return rows
+
+
+def run_query(tables: dict[str, list[dict]], table: str, params: list[tuple[str, str]],
+              count: bool) -> tuple[list[dict], str]:
+    """Apply PostgREST query params to a table; return (rows, Content-Range)."""
+    rows = tables.get(table, [])
+    select, order, limit, offset = "*", None, None, 0
+    conditions = []
+    for name, value in params:
+        if name == "select":
+            select = value
+        elif name == "order":
+            order = value
+        elif name == "limit":
+            limit = int(value)  # the last limit wins, like chained .limit() calls
+        elif name == "offset":
+            offset = int(value)
+        elif name == "or":
+            conditions.append(_or_condition(value))
+        elif name not in ("columns", "on_conflict"):
+            conditions.append(_condition(name, value))
+
+    matched = [r for r in rows if all(c(r) for c in conditions)]
+    if order:
+        matched = _sort(matched, order)
+    total = len(matched)
+    page = matched[offset:offset + limit if limit is not None else None]
+
+    if select.strip() != "*":
+        columns = [c.strip() for c in select.split(",") if c.strip() and "(" not in c]
+        page = [{c: r.get(c) for c in columns} for r in page]
+
+    end = offset + len(page) - 1
+    content_range = f"{offset}-{end}" if page else "*"
+    content_range += f"/{total}" if count else "/*"
+    return page, content_range
+
+
+class PostgrestStub:
+    """Threaded HTTP server exposing ``tables`` under /rest/v1/."""
+
+    def __init__(self, tables: dict[str, list[dict]], host: str = "127.0.0.1", port: int = 0,
+                 latency: float = 0.0):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body go out in separate writes; avoid Nagle/delayed-ACK stalls
+            disable_nagle_algorithm = True
+
+            def log_message(self, *args):
+                pass
+
+            def _send(self, status: int, body: bytes, headers: dict | None = None):
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                self.end_headers()
+                if self.command != "HEAD":
+                    self.wfile.write(body)
+
+            def do_GET(self):
+                if stub.latency:
+                    time.sleep(stub.latency)
+                url = urlsplit(self.path)
+                if not url.path.startswith("/rest/v1/"):
+                    return self._send(404, b'{"message":"not found"}')
+                table = unquote(url.path[len("/rest/v1/"):])
+                count = "count=exact" in (self.headers.get("Prefer") or "")
+                try:
+                    rows, content_range = run_query(stub.tables, table, parse_qsl(url.query), count)
+                except (ValueError, KeyError) as e:
+                    body = orjson.dumps({"code": "PGRST100", "message": str(e), "details": None, "hint": None})
+                    return self._send(400, body)
+                self._send(200, orjson.dumps(rows, default=str), {"Content-Range": content_range})
+
+            do_HEAD = do_GET
+
+            def do_POST(self):
+                # RPCs (view refreshes) are no-ops here
+                self.rfile.read(int(self.headers.get("Content-Length") or 0))
+                self._send(200, b"null")
+
+        self.tables = tables
+        self.latency = latency
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.server.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "PostgrestStub":
+        self._thread = threading.Thread(target=self.server.serve_forever, name="postgrest-stub", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve manually_scrapped_data/ through a PostgREST stand-in")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=54321)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Added delay per request")
+    args = parser.parse_args()
+
+    tables = load_tables()
+    stub = PostgrestStub(tables, args.host, args.port, args.latency_ms / 1000)
+    logger.info(f"Serving {sum(len(r) for r in tables.values())} rows from {len(tables)} tables at {stub.url}")
+    stub.server.serve_forever()
@@ -16,6 +16,12 @@ class Settings:
         self.ARCHIVE_DIR = self.DATA_DIR / "archive"
         self.LOGS_DIR = self.BASE_DIR / "logs"
         self.MANUAL_DATA_DIR = self.BASE_DIR / "manually_scrapped_data"
+        # Per-file content hashes from the last migration (database/migrate.py)
+        self.MIGRATION_MANIFEST = self.DATA_DIR / "migration_manifest.json"
+        # Last completed run per scraper, used when scrape_metadata can't be read
+        self.SCHEDULE_STATE = self.DATA_DIR / "schedule_state.json"
+        # ETags, Last-Modified and body hashes of fetched pages (conditional GETs)
+        self.HTTP_STATE_DIR = self.DATA_DIR / "http_state"
 
         self.SUPABASE_URL = os.getenv("SUPABASE_URL", "")
         self.SUPABASE_SERVICE_ROLE_KEY = os.getenv("SUPABASE_SERVICE_ROLE_KEY", "")
@@ -26,6 +32,34 @@ class Settings:
         self.SCRAPE_DELAY_SECONDS = int(os.getenv("SCRAPE_DELAY_SECONDS", "3"))
         self.MAX_RETRIES = int(os.getenv("MAX_RETRIES", "3"))
         self.REQUEST_TIMEOUT = int(os.getenv("REQUEST_TIMEOUT", "30"))
+        # Most requests per second sent to one host, shared by all scraper threads (0 = no limit)
+        self.HOST_RATE_LIMIT = float(os.getenv("HOST_RATE_LIMIT", "2"))
+        # Faculty profile pages (/faculty-profile/<id>) fetched in parallel; 0 skips profile enrichment
+        self.FACULTY_PROFILE_WORKERS = int(os.getenv("FACULTY_PROFILE_WORKERS", "4"))
+        # BeautifulSoup tree builder used by scrapers ("lxml", "html.parser", "html5lib")
+        self.HTML_PARSER = os.getenv("HTML_PARSER", "lxml")
+        # Scraper HTTP: "live", "record" (live + save to cassettes) or "replay" (cassettes only)
+        self.HTTP_MODE = os.getenv("HTTP_MODE", "live")
+        self.HTTP_CASSETTE_DIR = Path(os.getenv("HTTP_CASSETTE_DIR", str(self.DATA_DIR / "cassettes")))
+        # Simulated server behaviour in replay mode
+        self.HTTP_REPLAY_LATENCY_MS = int(os.getenv("HTTP_REPLAY_LATENCY_MS", "0"))
+        self.HTTP_REPLAY_JITTER_MS = int(os.getenv("HTTP_REPLAY_JITTER_MS", "0"))
+        self.HTTP_REPLAY_ERROR_RATE = float(os.getenv("HTTP_REPLAY_ERROR_RATE", "0"))
+        self.HTTP_REPLAY_SEED = int(os.getenv("HTTP_REPLAY_SEED")) if os.getenv("HTTP_REPLAY_SEED") else None
+        # Send If-None-Match / If-Modified-Since from the last synced fetch of each URL (HTTP_MODE=live only)
+        self.CONDITIONAL_REQUESTS = os.getenv("CONDITIONAL_REQUESTS", "true").lower() == "true"
+        # Longest the daemon (main.py --daemon) sleeps before re-checking which scrapers are due
+        self.DAEMON_POLL_SECONDS = int(os.getenv("DAEMON_POLL_SECONDS", "60"))
+        # Write a JSON diff report per changed table into data/archive/diffs/
+        self.WRITE_DIFF_ARTIFACTS = os.getenv("WRITE_DIFF_ARTIFACTS", "false").lower() == "true"
+        # Snapshots kept per scraper in the archive (data/archive/runs/)
+        self.ARCHIVE_RETENTION_RUNS = int(os.getenv("ARCHIVE_RETENTION_RUNS", "12"))
+        # Also write msgpack+zstd snapshots next to data/current/*.json
+        self.COMPACT_SNAPSHOTS = os.getenv("COMPACT_SNAPSHOTS", "false").lower() == "true"
+        # Trace exports written to logs/traces/ after each run ("chrome", "otlp"; empty = off)
+        self.TRACE_FORMATS = [f.strip() for f in os.getenv("TRACE_FORMATS", "chrome").split(",") if f.strip()]
+        # Runs whose trace exports are kept in logs/traces/ (the daemon writes one set per batch)
+        self.TRACE_RETENTION_RUNS = int(os.getenv("TRACE_RETENTION_RUNS", "48"))
 
         self.ENV = os.getenv("ENV", "development")
 
@@ -37,6 +71,20 @@ class Settings:
             for o in os.getenv("API_ALLOWED_ORIGINS", "*").split(",")
             if o.strip()
         ]
+        # Responses smaller than this many bytes are sent uncompressed
+        self.API_COMPRESSION_MIN_SIZE = int(os.getenv("API_COMPRESSION_MIN_SIZE", "1024"))
+        # How often cached reference tables (departments, grade_scale, ...) check for new data
+        self.REFERENCE_CACHE_CHECK_SECONDS = int(os.getenv("REFERENCE_CACHE_CHECK_SECONDS", "60"))
+        # Upstream (Supabase) resilience: stale fallback and circuit breaker
+        self.API_UPSTREAM_WORKERS = int(os.getenv("API_UPSTREAM_WORKERS", "16"))
+        self.API_UPSTREAM_SOFT_TIMEOUT = float(os.getenv("API_UPSTREAM_SOFT_TIMEOUT", "2.0"))
+        self.API_BREAKER_FAILURE_THRESHOLD = int(os.getenv("API_BREAKER_FAILURE_THRESHOLD", "5"))
+        self.API_BREAKER_RESET_SECONDS = float(os.getenv("API_BREAKER_RESET_SECONDS", "30"))
+        self.API_STALE_CACHE_SIZE = int(os.getenv("API_STALE_CACHE_SIZE", "1024"))
+        # Request profiling: share of requests profiled unasked (0-1), sampling interval, profiles kept
+        self.API_PROFILE_SAMPLE_RATE = float(os.getenv("API_PROFILE_SAMPLE_RATE", "0"))
+        self.API_PROFILE_INTERVAL_MS = float(os.getenv("API_PROFILE_INTERVAL_MS", "5"))
+        self.API_PROFILE_BUFFER_SIZE = int(os.getenv("API_PROFILE_BUFFER_SIZE", "50"))
 
         self.EWU_BASE_URL = "https://www.ewubd.edu"
         self.EWU_ADMISSION_URL = "https://admission.ewubd.edu"
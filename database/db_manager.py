@@ -1,5 +1,6 @@
 from datetime import datetime, timezone
 
+from postgrest.types import ReturnMethod
 from supabase import create_client, Client
 
 from config.settings import settings
@@ -51,7 +52,9 @@ class DBManager:
         try:
             for i in range(0, len(data), batch_size):
                 batch = data[i:i + batch_size]
-                self.client.table(table).upsert(batch, on_conflict=on_conflict).execute()
+                self.client.table(table).upsert(
+                    batch, on_conflict=on_conflict, returning=ReturnMethod.minimal
+                ).execute()
                 logger.info(f"Upserted batch {i // batch_size + 1} ({len(batch)} records) into {table}")
             logger.info(f"Upserted {len(data)} total records into {table}")
             return True
@@ -59,6 +62,29 @@ class DBManager:
             logger.error(f"Failed to upsert into {table}: {e}")
             return False
 
+    def upsert_returning(self, table: str, data: list[dict], columns: str,
+                         on_conflict: str = "id", batch_size: int = 500) -> list[dict] | None:
+        """Upsert records and return ``columns`` of every affected row.
+
+        Uses ``return=representation`` with a ``select`` projection, so keys
+        and generated IDs come back in the same round trip as the write.
+
+        Returns:
+            The projected rows, or None if any batch failed.
+        """
+        rows: list[dict] = []
+        try:
+            for i in range(0, len(data), batch_size):
+                batch = data[i:i + batch_size]
+                query = self.client.table(table).upsert(batch, on_conflict=on_conflict)
+                query.request.params = query.request.params.set("select", columns)
+                rows.extend(query.execute().data)
+            logger.info(f"Upserted {len(data)} total records into {table}")
+            return rows
+        except Exception as e:
+            logger.error(f"Failed to upsert into {table}: {e}")
+            return None
+
     def insert(self, table: str, data: list[dict]) -> bool:
         """Insert records into a table."""
         if not data:
@@ -83,9 +109,22 @@ class DBManager:
             logger.error(f"Failed to delete from {table}: {e}")
             return False
 
+    def refresh_view(self, function: str) -> bool:
+        """Refresh a materialized view through its SECURITY DEFINER RPC wrapper."""
+        try:
+            self.client.rpc(function).execute()
+            logger.info(f"Refreshed materialized view via {function}()")
+            return True
+        except Exception as e:
+            logger.error(f"Failed to refresh view via {function}(): {e}")
+            return False
+
     def log_scrape(self, scraper_name: str, records: int, status: str,
-                   error_message: str = "", duration: float = 0.0):
-        """Log a scrape run to the metadata table."""
+                   error_message: str = "", duration: float = 0.0, details: dict | None = None):
+        """Log a scrape run to the metadata table.
+
+        ``details`` holds per-phase timings and per-URL fetch stats.
+        """
         try:
             self.client.table("scrape_metadata").insert({
                 "scraper_name": scraper_name,
@@ -94,10 +133,33 @@ class DBManager:
                 "status": status,
                 "error_message": error_message,
                 "duration_seconds": duration,
+                "details": details,
             }).execute()
         except Exception as e:
             logger.error(f"Failed to log scrape metadata: {e}")
 
+    def get_last_runs(self) -> dict[str, dict] | None:
+        """Return the last completed run and the latest attempt per scraper, or None if they can't be read.
+
+        Each value holds ``last_run`` (None if it never completed),
+        ``last_attempt`` and ``last_status``.
+        """
+        try:
+            response = self.client.table("scraper_last_runs").select(
+                "scraper_name,last_run,last_attempt,last_status"
+            ).execute()
+        except Exception as e:
+            logger.error(f"Failed to fetch last scrape runs: {e}")
+            return None
+        return {
+            row["scraper_name"]: {
+                "last_run": datetime.fromisoformat(row["last_run"]) if row["last_run"] else None,
+                "last_attempt": datetime.fromisoformat(row["last_attempt"]),
+                "last_status": row["last_status"],
+            }
+            for row in response.data
+        }
+
     def test_connection(self) -> bool:
         """Test the database connection."""
         try:
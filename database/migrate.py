@@ -1,17 +1,35 @@
 """Load existing JSON data from manually_scrapped_data/ into Supabase tables."""
 
 import argparse
+import hashlib
 import json
+import os
 import re
+import threading
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from itertools import islice
 from pathlib import Path
 
+try:
+    import ijson
+except ImportError:  # streaming is optional; falls back to loading the whole file
+    ijson = None
+
 from config.settings import settings
 from database.db_manager import DBManager
 from utils.logger import logger
+from utils.snapshot import load_snapshot
 
 
 BATCH_SIZE = 50
 
+# Pipeline sizing: CPU-bound load+transform in processes, I/O-bound upserts in threads
+TRANSFORM_WORKERS = min(8, os.cpu_count() or 1)
+WRITER_WORKERS = 4
+MAX_PENDING_WRITES = 8
+
 
 # Mapping of JSON files to tables and their transform functions
 FILE_TABLE_MAP = {
@@ -49,6 +67,9 @@ FILE_TABLE_MAP = {
         "table": "faculty_members",
         "transform": "_transform_faculty_members",
         "batch": True,
+        # Parsed one record at a time instead of loading the whole file
+        "stream": "faculty.item",
+        "item_transform": "_transform_faculty_member",
         "upsert_on": "profile_id",
     },
     "academic_council.json": {
@@ -151,21 +172,44 @@ FILE_TABLE_MAP = {
 
 
 def _load_json(filepath: Path) -> dict | list:
-    """Load and return JSON data from a file."""
-    with open(filepath, "r", encoding="utf-8") as f:
-        return json.load(f)
+    """Load and return JSON data from a file (or its fresher compact snapshot)."""
+    return load_snapshot(filepath)
+
 
+def _iter_json_items(filepath: Path, prefix: str) -> Iterator:
+    """Yield the items under ``prefix`` (ijson syntax, e.g. "faculty.item") one at a time.
+
+    Without ijson the file is loaded whole and the same path is walked.
+    """
+    if ijson is not None:
+        with open(filepath, "rb") as f:
+            yield from ijson.items(f, prefix, use_float=True)
+        return
 
-def _batch_upsert(db: DBManager, table: str, records: list[dict], on_conflict: str = "id") -> bool:
-    """Upsert records in batches to avoid payload size limits."""
-    total = len(records)
-    for i in range(0, total, BATCH_SIZE):
-        batch = records[i : i + BATCH_SIZE]
+    node = _load_json(filepath)
+    parts = prefix.split(".")
+    for part in parts[:-1]:
+        node = node.get(part, {}) if isinstance(node, dict) else {}
+    if parts[-1] == "item":
+        yield from node if isinstance(node, list) else ()
+    else:
+        yield node.get(parts[-1]) if isinstance(node, dict) else None
+
+
+def _batch_upsert(db: DBManager, table: str, records: Iterable[dict], on_conflict: str = "id") -> bool:
+    """Upsert records in batches to avoid payload size limits.
+
+    ``records`` may be a generator; only one batch is held at a time.
+    """
+    records = iter(records)
+    offset = 0
+    while batch := list(islice(records, BATCH_SIZE)):
         success = db.upsert(table, batch, on_conflict=on_conflict)
         if not success:
-            logger.error(f"Batch upsert failed at offset {i} for {table}")
+            logger.error(f"Batch upsert failed at offset {offset} for {table}")
             return False
-        logger.info(f"  Batch {i // BATCH_SIZE + 1}: upserted {len(batch)} records")
+        logger.info(f"  Batch {offset // BATCH_SIZE + 1}: upserted {len(batch)} records")
+        offset += len(batch)
     return True
 
 
@@ -362,33 +406,32 @@ def _transform_events(data: dict) -> list[dict]:
     return records
 
 
-def _transform_faculty_members(data: dict) -> list[dict]:
-    """Transform ewu_faculty_complete.json into faculty_members records."""
-    records = []
-    faculty_list = data.get("faculty", [])
+def _transform_faculty_member(f: dict) -> dict:
+    """Transform one ewu_faculty_complete.json entry into a faculty_members record."""
+    sections = f.get("sections", {})
+    return {
+        "name": f.get("name", ""),
+        "designation": f.get("position", ""),
+        "department_name": f.get("department", ""),
+        "email": f.get("email", ""),
+        "phone": f.get("phone", ""),
+        "profile_url": f.get("profile_url", ""),
+        "profile_id": f.get("profile_id", ""),
+        "image_url": f.get("image_url", ""),
+        "specialization": sections.get("research_interest", ""),
+        "academic_background": sections.get("academic_background"),
+        "publications": sections.get("selected_publications"),
+        "details": {
+            k: v for k, v in sections.items()
+            if k not in ("academic_background", "selected_publications", "research_interest")
+            and v
+        } or None,
+    }
 
-    for f in faculty_list:
-        sections = f.get("sections", {})
-        records.append({
-            "name": f.get("name", ""),
-            "designation": f.get("position", ""),
-            "department_name": f.get("department", ""),
-            "email": f.get("email", ""),
-            "phone": f.get("phone", ""),
-            "profile_url": f.get("profile_url", ""),
-            "profile_id": f.get("profile_id", ""),
-            "image_url": f.get("image_url", ""),
-            "specialization": sections.get("research_interest", ""),
-            "academic_background": sections.get("academic_background"),
-            "publications": sections.get("selected_publications"),
-            "details": {
-                k: v for k, v in sections.items()
-                if k not in ("academic_background", "selected_publications", "research_interest")
-                and v
-            } or None,
-        })
 
-    return records
+def _transform_faculty_members(data: dict) -> list[dict]:
+    """Transform ewu_faculty_complete.json into faculty_members records."""
+    return [_transform_faculty_member(f) for f in data.get("faculty", [])]
 
 
 def _transform_academic_council(data: dict) -> list[dict]:
@@ -964,34 +1007,65 @@ def _transform_course_files(file_path: Path, level: str) -> tuple[dict, list[dic
     return program_record, course_records
 
 
-def _migrate_course_folders(db: DBManager, data_dir: Path, clean: bool = False):
-    """Migrate all course JSON files from subdirectory folders into course_programs/course_offerings."""
-    folder_level_map = [
-        ("courses_undergraduate", "undergraduate"),
-        ("courses_graduate", "graduate"),
-    ]
+COURSE_FOLDERS = [
+    ("courses_undergraduate", "undergraduate"),
+    ("courses_graduate", "graduate"),
+]
 
-    all_program_records: list[dict] = []
-    courses_by_program: dict[str, list[dict]] = {}
 
-    for folder_name, level in folder_level_map:
+def _course_files(data_dir: Path) -> list[tuple[Path, str]]:
+    """Return (file, level) for every course JSON file under the course folders."""
+    jobs: list[tuple[Path, str]] = []
+    for folder_name, level in COURSE_FOLDERS:
         folder_path = data_dir / folder_name
         if not folder_path.exists():
             logger.warning(f"Course folder not found, skipping: {folder_path}")
             continue
+        jobs.extend((json_file, level) for json_file in sorted(folder_path.glob("*.json")))
+    return jobs
 
-        for json_file in sorted(folder_path.glob("*.json")):
-            logger.info(f"Transforming {json_file.name} [{level}]")
-            try:
+
+def _migrate_course_folders(db: DBManager, data_dir: Path, clean: bool = False,
+                            pool: Executor | None = None,
+                            only: set[Path] | None = None) -> bool:
+    """Migrate all course JSON files from subdirectory folders into course_programs/course_offerings.
+
+    Course files are transformed on ``pool`` when given; the two upserts stay
+    sequential because course_offerings references course_programs. ``only``
+    restricts the migration to the given files.
+
+    Returns:
+        False if a transform or upsert failed.
+    """
+    jobs = [(f, level) for f, level in _course_files(data_dir) if only is None or f in only]
+    if not jobs:
+        return True
+
+    if pool is not None:
+        futures = [pool.submit(_transform_course_files, json_file, level) for json_file, level in jobs]
+    else:
+        futures = [None] * len(jobs)
+
+    all_program_records: list[dict] = []
+    courses_by_program: dict[str, list[dict]] = {}
+    success = True
+
+    for (json_file, level), future in zip(jobs, futures):
+        logger.info(f"Transforming {json_file.name} [{level}]")
+        try:
+            if future is not None:
+                prog_record, course_records = future.result()
+            else:
                 prog_record, course_records = _transform_course_files(json_file, level)
-                all_program_records.append(prog_record)
-                courses_by_program[prog_record["program_code"]] = course_records
-            except Exception as e:
-                logger.error(f"Failed to transform {json_file.name}: {e}")
+            all_program_records.append(prog_record)
+            courses_by_program[prog_record["program_code"]] = course_records
+        except Exception as e:
+            logger.error(f"Failed to transform {json_file.name}: {e}")
+            success = False
 
     if not all_program_records:
         logger.warning("No course program records produced — skipping course migration")
-        return
+        return success
 
     if clean:
         logger.info("[clean] Deleting all rows from course_offerings")
@@ -1001,16 +1075,16 @@ def _migrate_course_folders(db: DBManager, data_dir: Path, clean: bool = False):
 
     # Phase 1: upsert programs
     logger.info(f"Upserting {len(all_program_records)} course_programs")
-    ok = db.upsert("course_programs", all_program_records, on_conflict="program_code")
-    if not ok:
+    # The upsert returns each program's id, which populates the FK on course_offerings
+    programs = db.upsert_returning(
+        "course_programs", all_program_records, columns="id,program_code", on_conflict="program_code"
+    )
+    if programs is None:
         logger.error("Failed to upsert course_programs — aborting course migration")
-        return
-
-    # Phase 2: fetch IDs to populate FK on course_offerings
-    programs_in_db = db.get_all("course_programs")
-    program_id_map = {p["program_code"]: p["id"] for p in programs_in_db}
+        return False
+    program_id_map = {p["program_code"]: p["id"] for p in programs}
 
-    # Phase 3: attach program_id and flatten all course records
+    # Phase 2: attach program_id and flatten all course records
     all_course_records: list[dict] = []
     for program_code, records in courses_by_program.items():
         prog_id = program_id_map.get(program_code)
@@ -1024,6 +1098,11 @@ def _migrate_course_folders(db: DBManager, data_dir: Path, clean: bool = False):
         logger.info(f"Migrated {len(all_course_records)} course offerings")
     else:
         logger.error("Failed to upsert course_offerings")
+        return False
+
+    # Phase 3: rebuild the precomputed per-program documents served by the API
+    db.refresh_view("refresh_course_program_documents")
+    return success
 
 
 TRANSFORMS = {
@@ -1034,6 +1113,7 @@ TRANSFORMS = {
     "_transform_clubs": _transform_clubs,
     "_transform_events": _transform_events,
     "_transform_faculty_members": _transform_faculty_members,
+    "_transform_faculty_member": _transform_faculty_member,
     "_transform_academic_council": _transform_academic_council,
     "_transform_board_of_trustees": _transform_board_of_trustees,
     "_transform_syndicate": _transform_syndicate,
@@ -1056,11 +1136,189 @@ TRANSFORMS = {
 }
 
 
-def run_migration(clean: bool = False):
-    """Load all mapped JSON files into Supabase.
+def _load_manifest() -> dict[str, dict]:
+    """Return {relative path: fingerprint} from the last migration."""
+    path = settings.MIGRATION_MANIFEST
+    if not path.exists():
+        return {}
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f).get("files", {})
+    except (OSError, ValueError) as e:
+        logger.warning(f"Ignoring unreadable migration manifest {path}: {e}")
+        return {}
+
+
+def _save_manifest(files: dict[str, dict]):
+    path = settings.MIGRATION_MANIFEST
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"files": files}, f, indent=2, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def _fingerprint(filepath: Path, previous: dict | None) -> dict:
+    """Return {"sha256", "size", "mtime_ns"} for a file.
+
+    The hash is reused when size and mtime match the previous entry, so an
+    unchanged tree costs one stat() per file.
+    """
+    stat = filepath.stat()
+    if previous and previous.get("size") == stat.st_size and previous.get("mtime_ns") == stat.st_mtime_ns:
+        return previous
+    digest = hashlib.sha256()
+    with open(filepath, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return {"sha256": digest.hexdigest(), "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def _load_and_transform(filepath: Path, transform_name: str) -> list[dict]:
+    """Process-pool worker: load one data file and run its transform."""
+    return TRANSFORMS[transform_name](_load_json(filepath))
+
+
+def _write_records(db: DBManager, filename: str, config: dict, records: list[dict]) -> bool:
+    """Upsert one file's records into its table."""
+    table = config["table"]
+    upsert_on = config.get("upsert_on", "id")
+
+    if config.get("batch"):
+        success = _batch_upsert(db, table, records, on_conflict=upsert_on)
+    else:
+        success = db.upsert(table, records, on_conflict=upsert_on)
+
+    if success:
+        logger.info(f"Migrated {len(records)} records from {filename}")
+    else:
+        logger.error(f"Failed to migrate {filename}")
+    return success
+
+
+def _stream_records(db: DBManager, filepath: Path, config: dict) -> bool:
+    """Parse, transform and upsert a streamed file batch by batch."""
+    transform = TRANSFORMS[config["item_transform"]]
+    count = 0
+
+    def records():
+        nonlocal count
+        for item in _iter_json_items(filepath, config["stream"]):
+            count += 1
+            yield transform(item)
+
+    success = _batch_upsert(db, config["table"], records(), on_conflict=config.get("upsert_on", "id"))
+    if success and count:
+        logger.info(f"Migrated {count} records from {filepath.name}")
+    elif success:
+        logger.warning(f"No records produced from {filepath.name}")
+    else:
+        logger.error(f"Failed to migrate {filepath.name}")
+    return success
+
+
+class _BoundedWriter:
+    """Run upserts on a thread pool with at most ``max_pending`` queued or in flight.
+
+    ``submit`` blocks once the bound is reached, so transformed records can't
+    pile up in memory faster than Supabase accepts them.
+    """
+
+    def __init__(self, max_workers: int, max_pending: int):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="migrate-writer")
+        self._slots = threading.BoundedSemaphore(max_pending)
+
+    def submit(self, fn, *args) -> Future:
+        self._slots.acquire()
+        try:
+            future = self._executor.submit(fn, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self._executor.shutdown(wait=True)
+
+
+@dataclass
+class _MigrationPlan:
+    """What a migration run has to do, decided from file fingerprints alone."""
+    fingerprints: dict[str, dict]
+    changed: set[str]
+    dirty_tables: set[str]
+    all_course_files: list[Path]
+    course_files: set[Path]
+    to_migrate: list[str]
+
+
+def _plan_migration(data_dir: Path, previous: dict[str, dict], full: bool = False,
+                    clean: bool = False) -> _MigrationPlan:
+    """Compare the input files under ``data_dir`` with the ``previous`` manifest.
+
+    A file is changed when its content hash differs from the manifest. Its
+    table is dirty; with ``full`` every mapped table is. ``to_migrate`` lists
+    the changed FILE_TABLE_MAP files, or with ``clean`` every file feeding a
+    dirty table (the table is wiped first).
+    """
+    fingerprints: dict[str, dict] = {}
+    all_course_files = [json_file for json_file, _ in _course_files(data_dir)]
+    inputs = [data_dir / filename for filename in FILE_TABLE_MAP] + all_course_files
+    for filepath in inputs:
+        if filepath.exists():
+            key = filepath.relative_to(data_dir).as_posix()
+            fingerprints[key] = _fingerprint(filepath, previous.get(key))
+    changed = {
+        key for key, fp in fingerprints.items()
+        if previous.get(key, {}).get("sha256") != fp["sha256"]
+    }
+
+    if full:
+        dirty_tables = {config["table"] for config in FILE_TABLE_MAP.values()}
+    else:
+        dirty_tables = {config["table"] for name, config in FILE_TABLE_MAP.items() if name in changed}
+    course_files = {
+        json_file for json_file in all_course_files
+        if json_file.relative_to(data_dir).as_posix() in changed
+    }
+    if clean:
+        to_migrate = [name for name, config in FILE_TABLE_MAP.items() if config["table"] in dirty_tables]
+    else:
+        to_migrate = [name for name in FILE_TABLE_MAP if name in changed]
+    return _MigrationPlan(fingerprints, changed, dirty_tables, all_course_files, course_files, to_migrate)
+
+
+def _next_manifest(previous: dict[str, dict], plan: _MigrationPlan, migrated: set[str]) -> dict[str, dict]:
+    """Manifest to save after a run that migrated ``migrated``.
+
+    Unchanged files take their fresh fingerprint (same hash, new mtime), so
+    a touched file is hashed once rather than on every later run. Changed
+    files that failed keep their old fingerprint so the next run retries them.
+    """
+    manifest = {key: fp for key, fp in previous.items() if key in plan.fingerprints}
+    manifest.update({key: fp for key, fp in plan.fingerprints.items() if key not in plan.changed})
+    manifest.update({key: plan.fingerprints[key] for key in migrated if key in plan.fingerprints})
+    return manifest
+
+
+def run_migration(clean: bool = False, full: bool = False):
+    """Load mapped JSON files into Supabase.
+
+    Only files whose content hash differs from the migration manifest are
+    migrated. Files are loaded and transformed in a process pool while a
+    bounded writer upserts finished results, so parsing, transforming and
+    network writes overlap. None of the FILE_TABLE_MAP tables reference each
+    other, so their writes run concurrently; the course tables keep their FK
+    order (course_programs before course_offerings).
 
     Args:
-        clean: If True, delete all existing rows before upserting.
+        clean: If True, delete the rows of every table with a changed input
+            and re-migrate all files feeding those tables.
+        full: If True, ignore the manifest and migrate every file.
     """
     db = DBManager()
     data_dir = settings.MANUAL_DATA_DIR
@@ -1069,53 +1327,79 @@ def run_migration(clean: bool = False):
         logger.error(f"Data directory not found: {data_dir}")
         return
 
+    previous = {} if full else _load_manifest()
+    plan = _plan_migration(data_dir, previous, full=full, clean=clean)
+    fingerprints, changed = plan.fingerprints, plan.changed
+    all_course_files, course_files, to_migrate = plan.all_course_files, plan.course_files, plan.to_migrate
+
+    if not plan.dirty_tables and not course_files:
+        manifest = _next_manifest(previous, plan, set())
+        if manifest != previous:
+            _save_manifest(manifest)
+        logger.info("No data files changed since the last migration")
+        return
+
     if clean:
-        # Collect unique tables and wipe them once each
-        # course_offerings first (FK child), then course_programs (FK parent)
-        tables_to_clean = list(dict.fromkeys(
-            config["table"] for config in FILE_TABLE_MAP.values()
-        ))
-        for table in tables_to_clean:
+        # Wipe each table with a changed input once, then re-migrate every
+        # file that feeds it. Course tables are handled in _migrate_course_folders.
+        for table in sorted(plan.dirty_tables):
             logger.info(f"[clean] Deleting all rows from {table}")
             db.delete_all(table)
-        # Course tables handled separately in _migrate_course_folders
-
-    for filename, config in FILE_TABLE_MAP.items():
-        filepath = data_dir / filename
-        if not filepath.exists():
-            logger.warning(f"File not found, skipping: {filepath}")
-            continue
 
-        logger.info(f"Migrating {filename} -> {config['table']}")
+    migrated: set[str] = set()
+
+    with ProcessPoolExecutor(max_workers=TRANSFORM_WORKERS) as pool, \
+            _BoundedWriter(WRITER_WORKERS, MAX_PENDING_WRITES) as writer:
+        transforms: dict[Future, tuple[str, dict]] = {}
+        writes: dict[Future, str] = {}
+        for filename in to_migrate:
+            config = FILE_TABLE_MAP[filename]
+            filepath = data_dir / filename
+            if not filepath.exists():
+                logger.warning(f"File not found, skipping: {filepath}")
+                continue
+            logger.info(f"Migrating {filename} -> {config['table']}")
+            if config.get("stream"):
+                # Parsed incrementally on a writer thread so memory stays flat
+                writes[writer.submit(_stream_records, db, filepath, config)] = filename
+                continue
+            future = pool.submit(_load_and_transform, filepath, config["transform"])
+            transforms[future] = (filename, config)
 
-        raw_data = _load_json(filepath)
-        transform_fn = TRANSFORMS[config["transform"]]
-        records = transform_fn(raw_data)
+        for future in as_completed(transforms):
+            filename, config = transforms[future]
+            try:
+                records = future.result()
+            except Exception as e:
+                logger.error(f"Failed to transform {filename}: {e}")
+                continue
 
-        if not records:
-            logger.warning(f"No records produced from {filename}")
-            continue
+            if not records:
+                logger.warning(f"No records produced from {filename}")
+                migrated.add(filename)
+                continue
 
-        table = config["table"]
-        upsert_on = config.get("upsert_on", "id")
+            writes[writer.submit(_write_records, db, filename, config, records)] = filename
 
-        if config.get("batch"):
-            success = _batch_upsert(db, table, records, on_conflict=upsert_on)
-        else:
-            success = db.upsert(table, records, on_conflict=upsert_on)
+        # Migrate course folders (course_programs + course_offerings) while file writes drain
+        if course_files:
+            only = None if clean else course_files
+            if _migrate_course_folders(db, data_dir, clean=clean, pool=pool, only=only):
+                migrated.update(f.relative_to(data_dir).as_posix() for f in (only or all_course_files))
 
-        if success:
-            logger.info(f"Migrated {len(records)} records from {filename}")
-        else:
-            logger.error(f"Failed to migrate {filename}")
+        for future, filename in writes.items():
+            if future.result():
+                migrated.add(filename)
 
-    # Migrate course folders (course_programs + course_offerings)
-    _migrate_course_folders(db, data_dir, clean=clean)
+    _save_manifest(_next_manifest(previous, plan, migrated))
+    logger.info(f"Migrated {len(migrated)} changed file(s); {len(fingerprints) - len(changed)} unchanged")
 
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Migrate JSON data to Supabase")
     parser.add_argument("--clean", action="store_true",
-                        help="Delete all existing rows before upserting")
+                        help="Delete and reload every table whose input files changed")
+    parser.add_argument("--full", action="store_true",
+                        help="Ignore the migration manifest and migrate every file")
     args = parser.parse_args()
-    run_migration(clean=args.clean)
+    run_migration(clean=args.clean, full=args.full)
@@ -274,9 +274,29 @@ CREATE TABLE IF NOT EXISTS scrape_metadata (
     status TEXT DEFAULT 'success',
     error_message TEXT,
     duration_seconds NUMERIC,
+    details JSONB,                   -- {"phases": {name: seconds}, "fetches": [...]}
     created_at TIMESTAMPTZ DEFAULT NOW()
 );
 
+-- Added after the initial release; keeps existing databases in step
+ALTER TABLE scrape_metadata ADD COLUMN IF NOT EXISTS details JSONB;
+
+-- Latest completed run per scraper, read by main.py to decide which scrapers are due,
+-- plus the time and status of the latest attempt (incremental runs need a synced one).
+-- security_invoker keeps scrape_metadata's RLS in force, so it stays internal.
+CREATE OR REPLACE VIEW scraper_last_runs WITH (security_invoker = true) AS
+SELECT DISTINCT ON (scraper_name)
+    scraper_name,
+    MAX(last_run) FILTER (
+        WHERE status IN ('success', 'no_data', 'skipped_high_change', 'not_modified')
+    ) OVER (PARTITION BY scraper_name) AS last_run,
+    last_run AS last_attempt,
+    status AS last_status
+FROM scrape_metadata
+ORDER BY scraper_name, last_run DESC;
+
+REVOKE ALL ON scraper_last_runs FROM anon, authenticated;
+
 -- Indexes
 CREATE INDEX IF NOT EXISTS idx_programs_department ON programs(department_id);
 CREATE INDEX IF NOT EXISTS idx_programs_degree_type ON programs(degree_type);
@@ -285,6 +305,7 @@ CREATE INDEX IF NOT EXISTS idx_notices_published_date ON notices(published_date
 CREATE INDEX IF NOT EXISTS idx_events_date ON events(event_date DESC);
 CREATE INDEX IF NOT EXISTS idx_scrape_metadata_name ON scrape_metadata(scraper_name);
 CREATE INDEX IF NOT EXISTS idx_scrape_metadata_run ON scrape_metadata(last_run DESC);
+CREATE INDEX IF NOT EXISTS idx_scrape_metadata_name_run ON scrape_metadata(scraper_name, last_run DESC);
 CREATE INDEX IF NOT EXISTS idx_governance_body ON governance_members(body);
 CREATE INDEX IF NOT EXISTS idx_university_documents_slug ON university_documents(slug);
 CREATE INDEX IF NOT EXISTS idx_admission_deadlines_level ON admission_deadlines(level);
@@ -421,3 +442,45 @@ CREATE POLICY public_read ON course_programs FOR SELECT TO anon USING (true);
 ALTER TABLE course_offerings ENABLE ROW LEVEL SECURITY;
 DROP POLICY IF EXISTS public_read ON course_offerings;
 CREATE POLICY public_read ON course_offerings FOR SELECT TO anon USING (true);
+
+-- Precomputed per-program course documents served by /api/courses/programs/{program_code}.
+-- Sections are grouped and ordered the same way the API used to do it in Python;
+-- `courses` is JSON (not JSONB) so section and course ordering survive.
+CREATE MATERIALIZED VIEW IF NOT EXISTS course_program_documents AS
+SELECT
+    p.program_code,
+    to_jsonb(p) AS program,
+    COALESCE(c.courses, '{}'::json) AS courses
+FROM course_programs p
+LEFT JOIN LATERAL (
+    -- Same order as sorting rows by raw section (NULLs last) and grouping on first sight
+    SELECT json_object_agg(s.section, s.courses ORDER BY s.all_null, s.first_section) AS courses
+    FROM (
+        SELECT
+            COALESCE(NULLIF(o.section, ''), 'general') AS section,
+            MIN(o.section) AS first_section,
+            BOOL_AND(o.section IS NULL) AS all_null,
+            json_agg(to_json(o) ORDER BY o.section NULLS LAST, o.course_code) AS courses
+        FROM course_offerings o
+        WHERE o.program_code = p.program_code
+        GROUP BY 1
+    ) s
+) c ON true;
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_course_program_documents_code
+    ON course_program_documents (program_code);
+
+-- Materialized views bypass RLS; expose read-only to the API role explicitly
+GRANT SELECT ON course_program_documents TO anon;
+
+CREATE OR REPLACE FUNCTION refresh_course_program_documents()
+RETURNS void AS $$
+BEGIN
+    REFRESH MATERIALIZED VIEW CONCURRENTLY course_program_documents;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER
+SET search_path = public, pg_temp;
+
+-- SECURITY DEFINER: only the scraper/migration (service role) may trigger a full refresh
+REVOKE EXECUTE ON FUNCTION refresh_course_program_documents() FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION refresh_course_program_documents() TO service_role;
@@ -1,17 +1,35 @@
 """EWU Data Scraper - Main Orchestrator
 
-Runs all configured scrapers, validates data, diffs against current database,
-and upserts changes if they are within safe thresholds.
+Runs the configured scrapers that are due (see BaseScraper.refresh_interval),
+validates data, diffs against current database, and upserts changes if they
+are within safe thresholds.
+
+    python main.py                      # scrapers whose refresh interval has passed
+    python main.py --all                # every scraper
+    python main.py notices faculty      # by scraper name, table or host, due or not
+    python main.py --list               # show the schedule and exit
+    python main.py --daemon             # stay resident, run scrapers as they fall due
 """
 
-import sys
+import argparse
+import json
+import signal
+import threading
 import time
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from urllib.parse import urlsplit
 
 from config.settings import settings
 from utils.logger import logger
+from utils.archive import SnapshotArchive
 from utils.diff_checker import DiffChecker
+from utils.http_state import get_http_state
+from utils.normalizer import RecordNormalizer
 from utils.notifier import Notifier
+from utils.profiler import profile_scraper
+from utils.schedule import COMPLETED_STATUSES, SYNCED_STATUSES, Schedule, format_interval
+from utils.tracing import Tracer, span, use_tracer
 from scrapers.ewu import (
     TuitionFeesScraper,
     ScholarshipsScraper,
@@ -40,7 +58,10 @@ from scrapers.ewu import (
 MAX_CHANGE_PERCENT = 30.0
 
 # Set via --force flag to bypass safety threshold (for initial bootstrap)
-FORCE_MODE = "--force" in sys.argv
+FORCE_MODE = False
+
+# Set via --profile to run each scraper under cProfile/tracemalloc (reports in logs/profiles/)
+PROFILE_MODE = False
 
 # Fields added by scrapers for tracking but not present in DB tables
 NON_SCHEMA_FIELDS = {"source_url", "source_file"}
@@ -48,6 +69,12 @@ NON_SCHEMA_FIELDS = {"source_url", "source_file"}
 # DB-generated fields that shouldn't be used in diff comparisons
 DB_META_FIELDS = {"id", "created_at", "updated_at"}
 
+# Per-URL fetch timings kept per scraper in scrape_metadata.details
+MAX_LOGGED_FETCHES = 200
+
+# How long the daemon waits before retrying a scraper whose last run failed
+DAEMON_RETRY_DELAY = timedelta(minutes=15)
+
 # Scrapers to run, mapped to their database table
 SCRAPER_CONFIG = [
     {"scraper": TuitionFeesScraper, "table": "tuition_fees", "key_field": "program", "on_conflict": "program,level"},
@@ -85,43 +112,64 @@ def _strip_non_schema_fields(data: list[dict]) -> list[dict]:
     ]
 
 
-def _prepare_for_diff(data: list[dict]) -> list[dict]:
-    """Strip metadata fields from both DB and scraper data for fair comparison."""
-    skip = DB_META_FIELDS | NON_SCHEMA_FIELDS
-    return [
-        {k: v for k, v in record.items() if k not in skip}
-        for record in data
-    ]
-
+def _index_records(data: list[dict], key_fields: tuple[str, ...]) -> tuple[dict, list[dict]]:
+    """Index records by their upsert key, keeping the first occurrence of each key.
 
-def _deduplicate(data: list[dict], key_fields: str) -> list[dict]:
-    """Keep only the first occurrence of each unique key combination.
-
-    key_fields can be a single field name or comma-separated composite key.
+    Records with a missing or null key column can't be matched against the
+    database; they are returned separately instead of being indexed.
     """
-    fields = [f.strip() for f in key_fields.split(",")]
-    seen = set()
-    result = []
+    index = {}
+    unkeyed = []
     for record in data:
-        key = tuple(record.get(f) for f in fields)
-        if any(v is None for v in key):
-            result.append(record)
+        key = DiffChecker.record_key(record, key_fields)
+        parts = key if len(key_fields) > 1 else (key,)
+        if key is None or any(v is None for v in parts):
+            unkeyed.append(record)
             continue
-        if key not in seen:
-            seen.add(key)
-            result.append(record)
-    return result
+        index.setdefault(key, record)
+    return index, unkeyed
+
 
+def run_scraper(config: dict, db=None, archive: SnapshotArchive | None = None,
+                tracer: Tracer | None = None, scraper=None, incremental: bool = False) -> dict:
+    """Run a single scraper, archive its output and optionally sync to database.
 
-def run_scraper(config: dict, db=None) -> dict:
-    """Run a single scraper and optionally sync to database.
+    ``scraper`` reuses an existing instance (and its HTTP session). With
+    ``incremental``, a run whose pages are all unchanged since the last one
+    ends as "not_modified" before archiving or touching the database.
 
-    Returns a summary dict.
+    Returns a summary dict. ``phases`` splits the run's wall-clock time by
+    phase (fetch, sleep, parse, save, archive, get_all, diff, delete, upsert,
+    other; see Tracer.phase_totals)
+    and ``fetches`` one entry per requested URL.
     """
-    scraper_cls = config["scraper"]
+    tracer = tracer or Tracer()
+    with use_tracer(tracer), tracer.span("scraper", scraper=config["scraper"].name) as root:
+        summary = _run_scraper(config, db, archive, scraper, incremental)
+
+    phases = tracer.phase_totals(root)
+    phases["other"] = phases.pop("scraper", 0.0)
+    summary["phases"] = phases
+    summary["fetches"] = [
+        {
+            "url": s.attrs.get("url"),
+            "status": s.attrs.get("status"),
+            "bytes": s.attrs.get("bytes"),
+            "attempts": s.attrs.get("attempts"),
+            "seconds": round(s.seconds, 3),
+        }
+        for s in tracer.find(root, "fetch")
+    ]
+    return summary
+
+
+def _run_scraper(config: dict, db=None, archive: SnapshotArchive | None = None,
+                 scraper=None, incremental: bool = False) -> dict:
     table = config["table"]
     key_field = config["key_field"]
-    scraper = scraper_cls()
+    scraper = scraper or config["scraper"]()
+    scraper.incremental = incremental
+    scraper.reset_fetch_stats()
 
     start = time.time()
     summary = {
@@ -133,43 +181,73 @@ def run_scraper(config: dict, db=None) -> dict:
     }
 
     try:
-        new_data = scraper.run()
+        # Time inside run() not spent in fetch/sleep/save spans is parsing
+        with span("parse"):
+            new_data = scraper.run()
         summary["records"] = len(new_data)
 
+        if incremental and scraper.not_modified:
+            logger.info(f"[{scraper.name}] {scraper.pages_fetched} page(s) unchanged since last run")
+            summary["status"] = "not_modified"
+            return summary
+
         if not new_data:
             summary["status"] = "no_data"
             return summary
 
+        if archive:
+            try:
+                with span("archive"):
+                    archive.write(scraper.name, new_data, metadata={"source_urls": scraper.get_urls()})
+            except Exception as e:
+                logger.warning(f"[{scraper.name}] Failed to archive snapshot: {e}")
+
         # Sync to database if available
         if db and table:
             on_conflict = config.get("on_conflict", key_field)
-            clean_data = _strip_non_schema_fields(new_data)
-            clean_data = _deduplicate(clean_data, on_conflict)
+            key_fields = DiffChecker.key_fields(on_conflict)
+            # One tuple-keyed index serves dedup, diff and the delta write
+            new_index, unkeyed = _index_records(_strip_non_schema_fields(new_data), key_fields)
 
             if config.get("replace_all"):
                 # Full replacement: delete everything, then insert fresh data
+                clean_data = list(new_index.values()) + unkeyed
                 logger.info(f"[{scraper.name}] replace_all mode: deleting all rows from {table}")
-                db.delete_all(table)
-                success = db.upsert(table, clean_data, on_conflict=on_conflict)
+                with span("delete"):
+                    db.delete_all(table)
+                with span("upsert", records=len(clean_data)):
+                    success = db.upsert(table, clean_data, on_conflict=on_conflict)
                 summary["changes"] = len(clean_data)
                 if not success:
                     summary["status"] = "upsert_failed"
             else:
-                # Normal diff-based upsert
-                old_data = db.get_all(table)
-                should_upsert = True
-
-                if old_data:
-                    new_keys = {r[key_field] for r in new_data if key_field in r}
-                    if config.get("shared_table"):
-                        old_data = [r for r in old_data if r.get(key_field) in new_keys]
-
-                    old_clean = _prepare_for_diff(old_data)
-                    new_clean = _prepare_for_diff(new_data)
-
-                    diff = DiffChecker.compare(old_clean, new_clean, key_field)
-                    report = DiffChecker.generate_report(diff)
-                    logger.info(f"[{scraper.name}] Diff:\n{report}")
+                # Normal diff-based upsert of only the added/modified rows
+                with span("get_all"):
+                    old_rows = db.get_all(table)
+                old_index = DiffChecker.index(old_rows, key_fields)
+                if config.get("shared_table"):
+                    old_index = {k: r for k, r in old_index.items() if k in new_index}
+                if unkeyed:
+                    logger.warning(
+                        f"[{scraper.name}] {len(unkeyed)} record(s) have no complete "
+                        f"'{on_conflict}' key and can't be diffed; upserting them as-is"
+                    )
+
+                # Compare only the columns this scraper writes, canonicalized by column type
+                columns = set().union(*new_index.values()) - DB_META_FIELDS - NON_SCHEMA_FIELDS
+                with span("diff", old=len(old_index), new=len(new_index)):
+                    diff = DiffChecker.compare(
+                        old_index, new_index, key_fields,
+                        ignore_fields=DB_META_FIELDS | NON_SCHEMA_FIELDS,
+                        normalize=RecordNormalizer(table, columns),
+                    )
+                if old_index:
+                    report = DiffChecker.build_report(diff, name=scraper.name)
+                    logger.info(f"[{scraper.name}] Diff: {report.summary_line()}")
+                    # Details are only formatted if a sink accepts DEBUG
+                    logger.opt(lazy=True).debug("[{}] Diff details:\n{}", lambda: scraper.name, report.render)
+                    if settings.WRITE_DIFF_ARTIFACTS and diff.has_changes:
+                        report.write_artifact(settings.ARCHIVE_DIR / "diffs")
                     summary["changes"] = len(diff.added) + len(diff.modified) + len(diff.removed)
 
                     skip_threshold = config.get("shared_table", False) or FORCE_MODE
@@ -181,10 +259,14 @@ def run_scraper(config: dict, db=None) -> dict:
                         summary["status"] = "skipped_high_change"
                         return summary
 
-                    should_upsert = diff.has_changes
-
-                if should_upsert:
-                    success = db.upsert(table, clean_data, on_conflict=on_conflict)
+                delta = diff.added + [change["new"] for change in diff.modified] + unkeyed
+                if delta:
+                    logger.info(
+                        f"[{scraper.name}] Upserting {len(delta)} changed of "
+                        f"{len(new_index) + len(unkeyed)} records"
+                    )
+                    with span("upsert", records=len(delta)):
+                        success = db.upsert(table, delta, on_conflict=on_conflict)
                     if not success:
                         summary["status"] = "upsert_failed"
 
@@ -197,35 +279,170 @@ def run_scraper(config: dict, db=None) -> dict:
     return summary
 
 
-def main():
-    """Run all scrapers and generate summary report."""
-    logger.info("=" * 60)
-    logger.info("EWU Data Scraper - Starting run")
-    if FORCE_MODE:
-        logger.warning("FORCE MODE: Safety threshold bypassed for all scrapers")
-    logger.info(f"Time: {datetime.now(timezone.utc).isoformat()}")
-    logger.info("=" * 60)
+def _export_trace(tracer: Tracer, run_id: str):
+    """Write the run's spans in each format listed in settings.TRACE_FORMATS."""
+    trace_dir = settings.LOGS_DIR / "traces"
+    exporters = {"chrome": tracer.export_chrome, "otlp": tracer.export_otlp}
+    for fmt in settings.TRACE_FORMATS:
+        if fmt not in exporters:
+            logger.warning(f"Unknown trace format: {fmt}")
+            continue
+        try:
+            path = exporters[fmt](trace_dir / f"{run_id}.{fmt}.json")
+            logger.info(f"Wrote {fmt} trace to {path}")
+        except Exception as e:
+            logger.warning(f"Failed to write {fmt} trace: {e}")
+
+
+def _prune_traces(keep_runs: int):
+    """Delete trace exports from all but the newest ``keep_runs`` runs in logs/traces/."""
+    trace_dir = settings.LOGS_DIR / "traces"
+    by_run: dict[str, list[Path]] = {}
+    for path in trace_dir.glob("*.json"):
+        by_run.setdefault(path.name.split(".", 1)[0], []).append(path)
+    # Run ids are UTC timestamps, so they sort chronologically
+    expired = sorted(by_run)[:-keep_runs] if keep_runs > 0 else sorted(by_run)
+    for run_id in expired:
+        for path in by_run[run_id]:
+            path.unlink(missing_ok=True)
+    if expired:
+        logger.debug(f"Pruned traces from {len(expired)} run(s)")
+
+
+def _write_profile(profile, profile_dir: Path) -> dict | None:
+    """Write one scraper's profile reports and return its headline numbers."""
+    try:
+        report = profile.write(profile_dir)
+    except Exception as e:
+        logger.warning(f"[{profile.name}] Failed to write profile: {e}")
+        return None
+    s = profile.summary()
+    logger.info(
+        f"[{profile.name}] Profile: {s['cpu_seconds']:.2f}s CPU ({s['wall_seconds']:.2f}s wall), "
+        f"bs4 {s['bs4_seconds']:.2f}s, "
+        f"regex {s['regex_seconds']:.2f}s, peak {s['peak_kib'] / 1024:.1f} MiB -> {report}"
+    )
+    return s
 
-    settings.ensure_directories()
 
-    # Try to connect to database (optional)
-    db = None
+def _write_profile_index(summaries: list[dict], profile_dir: Path):
+    """Rank scrapers by profiled CPU time in profile_dir/index.json."""
+    profiles = sorted(
+        (s["profile"] for s in summaries if s.get("profile")),
+        key=lambda p: -p["cpu_seconds"],
+    )
+    if not profiles:
+        return
+    profile_dir.mkdir(parents=True, exist_ok=True)
+    (profile_dir / "index.json").write_text(json.dumps(profiles, indent=2), encoding="utf-8")
+    logger.info(f"Wrote profiles for {len(profiles)} scraper(s) to {profile_dir}")
+
+
+def _hosts(config: dict) -> set[str]:
+    return {urlsplit(url).hostname for url in config["scraper"]().get_urls()}
+
+
+def select_configs(targets: list[str]) -> list[dict]:
+    """SCRAPER_CONFIG entries matching any target by scraper name, class, table or host.
+
+    Raises ValueError naming the targets that matched nothing.
+    """
+    if not targets:
+        return list(SCRAPER_CONFIG)
+    wanted = {t.lower() for t in targets}
+    matched, used = [], set()
+    for config in SCRAPER_CONFIG:
+        keys = {config["scraper"].name, config["scraper"].__name__.lower(), config["table"]}
+        hits = wanted & ({k for k in keys if k} | _hosts(config))
+        if hits:
+            matched.append(config)
+            used |= hits
+    if wanted - used:
+        raise ValueError(f"No scraper matches: {', '.join(sorted(wanted - used))}")
+    return matched
+
+
+def _print_schedule(schedule: Schedule, configs: list[dict]):
+    now = datetime.now(timezone.utc)
+    for config in configs:
+        cls = config["scraper"]
+        last = schedule.last_runs.get(cls.name)
+        due = schedule.next_due(cls)
+        logger.info(
+            f"  {cls.name:30s} | every {format_interval(cls.refresh_interval):>5s} | "
+            f"last {last.isoformat(timespec='minutes') if last else 'never':25s} | "
+            f"{'due' if schedule.is_due(cls, now) else 'next ' + due.isoformat(timespec='minutes')}"
+        )
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Scrape EWU websites and sync changes to the database")
+    parser.add_argument("targets", nargs="*",
+                        help="Scraper names, tables or hosts to run now, due or not (default: all due scrapers)")
+    parser.add_argument("--all", action="store_true", help="Run every scraper regardless of its schedule")
+    parser.add_argument("--list", action="store_true", help="Show each scraper's schedule and exit")
+    parser.add_argument("--daemon", action="store_true",
+                        help="Stay resident and run the selected scrapers whenever they are due")
+    parser.add_argument("--force", action="store_true",
+                        help="Bypass the change-percentage safety threshold (initial bootstrap)")
+    parser.add_argument("--profile", action="store_true",
+                        help="Profile each scraper with cProfile and tracemalloc (reports in logs/profiles/)")
+    return parser.parse_args(argv)
+
+
+def _connect_db():
+    """Return a connected DBManager, or None to run in scrape-only mode."""
     try:
         from database.db_manager import DBManager
         db = DBManager()
         if db.test_connection():
             logger.info("Database connected")
-        else:
-            logger.warning("Database connection failed, running in scrape-only mode")
-            db = None
+            return db
+        logger.warning("Database connection failed, running in scrape-only mode")
     except Exception as e:
         logger.warning(f"Database not configured, running in scrape-only mode: {e}")
+    return None
+
 
+def run_batch(configs: list[dict], db, schedule: Schedule, scrapers: dict | None = None,
+              incremental: bool = False) -> list[dict]:
+    """Run ``configs`` once, log and report the results.
+
+    ``scrapers`` caches scraper instances by class so repeated batches reuse
+    their HTTP sessions. In ``incremental`` runs, scrapers whose pages are all
+    unchanged finish as "not_modified" without touching the database (unless
+    their previous run failed to sync), and Discord only hears about changes
+    and failures. A scraper's fetched pages become the baseline for the next
+    run only once its data has been synced.
+    """
+    archive = SnapshotArchive()
+    tracer = Tracer()
+    http_state = get_http_state()
+    profile_dir = settings.LOGS_DIR / "profiles" / archive.run_id
     summaries = []
-    for config in SCRAPER_CONFIG:
+    for config in configs:
         logger.info(f"--- Running {config['scraper'].__name__} ---")
-        summary = run_scraper(config, db)
+        scraper = None
+        if scrapers is not None:
+            if config["scraper"] not in scrapers:
+                scrapers[config["scraper"]] = config["scraper"]()
+            scraper = scrapers[config["scraper"]]
+        name = config["scraper"].name
+        trust_unchanged = incremental and schedule.last_synced(name)
+        if PROFILE_MODE:
+            with profile_scraper(name) as profile:
+                summary = run_scraper(config, db, archive, tracer, scraper, trust_unchanged)
+            summary["profile"] = _write_profile(profile, profile_dir)
+        else:
+            summary = run_scraper(config, db, archive, tracer, scraper, trust_unchanged)
         summaries.append(summary)
+        schedule.record(name, summary["status"])
+
+        # Scrape-only runs never reach the table, so their pages must not look "seen"
+        if summary["status"] in SYNCED_STATUSES and (db or not config["table"]):
+            http_state.commit(name)
+        else:
+            http_state.discard(name)
 
         if db:
             db.log_scrape(
@@ -233,8 +450,27 @@ def main():
                 summary["records"],
                 summary["status"],
                 duration=summary["duration"],
+                details={"phases": summary["phases"], "fetches": summary["fetches"][:MAX_LOGGED_FETCHES]},
             )
 
+    for name, save in (("schedule state", schedule.save), ("HTTP state", http_state.save)):
+        try:
+            save()
+        except OSError as e:
+            logger.warning(f"Failed to save {name}: {e}")
+    _export_trace(tracer, archive.run_id)
+    try:
+        _prune_traces(settings.TRACE_RETENTION_RUNS)
+    except OSError as e:
+        logger.warning(f"Failed to prune traces: {e}")
+    if PROFILE_MODE:
+        _write_profile_index(summaries, profile_dir)
+
+    try:
+        archive.prune(settings.ARCHIVE_RETENTION_RUNS)
+    except Exception as e:
+        logger.warning(f"Failed to prune snapshot archive: {e}")
+
     logger.info("\n" + "=" * 60)
     logger.info("SCRAPE SUMMARY")
     logger.info("=" * 60)
@@ -248,13 +484,101 @@ def main():
             f"records: {s['records']:5d} | changes: {s['changes']:5d} | "
             f"{s['duration']:.1f}s"
         )
+        logger.info(f"  {'':30s}   " + ", ".join(f"{name} {sec:.1f}s" for name, sec in s["phases"].items()))
     logger.info(f"  {'TOTAL':30s} | {'':20s} | records: {total_records:5d} | changes: {total_changes:5d}")
 
+    # Scheduled runs only report when something changed or went wrong
+    if incremental and not any(s["changes"] or s["status"] not in ("success", "not_modified") for s in summaries):
+        return summaries
     report_msg = "\n".join(
         f"- **{s['scraper']}**: {s['status']} ({s['records']} records, {s['changes']} changes)"
         for s in summaries
     )
     Notifier.send_discord(f"**Scrape Run Complete**\n{report_msg}")
+    return summaries
+
+
+def run_daemon(configs: list[dict], db):
+    """Run due scrapers forever, sleeping until the next one is due.
+
+    Scraper sessions, the database client and the schedule stay in memory
+    between batches; SIGTERM/SIGINT stop the loop after the current batch.
+    """
+    stop = threading.Event()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        signal.signal(sig, lambda *_: stop.set())
+
+    schedule = Schedule(db)
+    scrapers: dict = {}
+    # Failed scrapers stay due; hold them back so they are retried at a gentler pace
+    retry_at: dict[str, datetime] = {}
+    logger.info(f"Daemon started with {len(configs)} scraper(s)")
+    while not stop.is_set():
+        # Reconnect after an outage, but don't retry when credentials aren't configured at all
+        if db is None and not settings.validate():
+            db = _connect_db()
+        now = datetime.now(timezone.utc)
+        due = [
+            c for c in configs
+            if schedule.is_due(c["scraper"], now) and retry_at.get(c["scraper"].name, now) <= now
+        ]
+        if due:
+            logger.info(f"{len(due)} scraper(s) due: {', '.join(c['scraper'].name for c in due)}")
+            for summary, config in zip(run_batch(due, db, schedule, scrapers, incremental=True), due):
+                cls = config["scraper"]
+                if summary["status"] in COMPLETED_STATUSES:
+                    retry_at.pop(cls.name, None)
+                else:
+                    retry_at[cls.name] = datetime.now(timezone.utc) + min(cls.refresh_interval, DAEMON_RETRY_DELAY)
+
+        now = datetime.now(timezone.utc)
+        upcoming = [schedule.next_due(c["scraper"]) for c in configs] + list(retry_at.values())
+        upcoming = [when for when in upcoming if when and when > now]
+        wait = settings.DAEMON_POLL_SECONDS
+        if upcoming:
+            wait = min(wait, max(1.0, (min(upcoming) - now).total_seconds()))
+        stop.wait(wait)
+    logger.info("Daemon stopped")
+
+
+def main(argv: list[str] | None = None):
+    """Run the selected (by default: due) scrapers and generate summary report."""
+    global FORCE_MODE, PROFILE_MODE
+    args = parse_args(argv)
+    FORCE_MODE, PROFILE_MODE = args.force, args.profile
+    try:
+        configs = select_configs(args.targets)
+    except ValueError as e:
+        logger.error(str(e))
+        raise SystemExit(2)
+
+    logger.info("=" * 60)
+    logger.info("EWU Data Scraper - Starting " + ("daemon" if args.daemon else "run"))
+    if FORCE_MODE:
+        logger.warning("FORCE MODE: Safety threshold bypassed for all scrapers")
+    if PROFILE_MODE:
+        logger.info("PROFILE MODE: cProfile and tracemalloc enabled; scrapers will run slower")
+    logger.info(f"Time: {datetime.now(timezone.utc).isoformat()}")
+    logger.info("=" * 60)
+
+    settings.ensure_directories()
+    db = _connect_db()
+
+    if args.daemon:
+        run_daemon(configs, db)
+        return
+
+    schedule = Schedule(db)
+    if args.list:
+        _print_schedule(schedule, configs)
+        return
+    scheduled = not (args.all or args.targets)
+    if scheduled:
+        configs = [c for c in configs if schedule.is_due(c["scraper"])]
+        logger.info(f"{len(configs)} of {len(SCRAPER_CONFIG)} scraper(s) due")
+        if not configs:
+            return
+    run_batch(configs, db, schedule, incremental=scheduled)
 
 
 if __name__ == "__main__":
@@ -1,14 +1,20 @@
 import json
+import threading
 import time
 import random
 from abc import ABC, abstractmethod
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 
 import requests
 from bs4 import BeautifulSoup
 
 from config.settings import settings
+from utils.cassette import mount_cassette
+from utils.http_state import conditional_requests_enabled, get_http_state
 from utils.logger import logger
+from utils.rate_limit import host_limiter
+from utils.tracing import span
+from utils.snapshot import compact_path, write_compact
 
 USER_AGENTS = [
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
@@ -19,40 +25,113 @@ USER_AGENTS = [
 
 class BaseScraper(ABC):
     name: str = "base"
+    html_parser: str = settings.HTML_PARSER
+    # How often the source changes enough to be worth re-scraping (main.py runs only due scrapers)
+    refresh_interval: timedelta = timedelta(days=7)
 
     def __init__(self):
         self.session = requests.Session()
+        mount_cassette(self.session)
         self.delay = settings.SCRAPE_DELAY_SECONDS
         self.max_retries = settings.MAX_RETRIES
         self.timeout = settings.REQUEST_TIMEOUT
+        # Incremental runs may stop early once they see content they already have
+        self.incremental = False
+        self._stats_lock = threading.Lock()
+        self.reset_fetch_stats()
+
+    def reset_fetch_stats(self):
+        self.pages_fetched = 0
+        self.pages_unchanged = 0
+
+    def record_page(self, changed: bool):
+        """Count a fetched page towards not_modified (for fetches that bypass fetch())."""
+        with self._stats_lock:
+            self.pages_fetched += 1
+            self.pages_unchanged += not changed
+
+    @property
+    def not_modified(self) -> bool:
+        """True if this run fetched pages and none of them changed since the last run."""
+        return self.pages_fetched > 0 and self.pages_unchanged == self.pages_fetched
 
     def fetch(self, url: str) -> str | None:
         """Fetch a URL with retry logic and exponential backoff.
 
         Returns the response text, or None on failure.
         """
-        for attempt in range(1, self.max_retries + 1):
-            try:
-                headers = {"User-Agent": random.choice(USER_AGENTS)}
-                resp = self.session.get(url, headers=headers, timeout=self.timeout)
-                resp.raise_for_status()
-                logger.debug(f"[{self.name}] Fetched {url} (status {resp.status_code})")
-                return resp.text
-            except requests.RequestException as e:
-                wait = 2 ** attempt
-                logger.warning(
-                    f"[{self.name}] Attempt {attempt}/{self.max_retries} failed for {url}: {e}. "
-                    f"Retrying in {wait}s..."
-                )
-                if attempt < self.max_retries:
-                    time.sleep(wait)
-
-        logger.error(f"[{self.name}] All {self.max_retries} attempts failed for {url}")
-        return None
+        return self.fetch_page(url)[0]
+
+    def fetch_page(self, url: str) -> tuple[str | None, bool]:
+        """Fetch a URL and report whether its body changed since the last run.
+
+        With CONDITIONAL_REQUESTS in live mode the request carries the
+        validators from the last synced fetch; a 304 returns the stored body.
+        Either way the page counts as unchanged if its body hash matches the
+        last synced run. The response is staged in HttpState under this
+        scraper's name until main.py commits it. Cassette runs (record or
+        replay) always fetch unconditionally and count every page as changed.
+        Requests to one host are spaced by HOST_RATE_LIMIT, so this is safe
+        to call from several threads. Returns (text, changed); text is None
+        on failure.
+        """
+        state = get_http_state() if conditional_requests_enabled() else None
+        with span("fetch", url=url) as fetch_span:
+            for attempt in range(1, self.max_retries + 1):
+                fetch_span.set(attempts=attempt)
+                try:
+                    headers = {"User-Agent": random.choice(USER_AGENTS)}
+                    if state:
+                        headers.update(state.request_headers(url))
+                    resp = self._get(url, headers)
+                    fetch_span.set(status=resp.status_code, bytes=len(resp.content))
+                    resp.raise_for_status()
+                    logger.debug(f"[{self.name}] Fetched {url} (status {resp.status_code})")
+                    if not state:
+                        return resp.text, True
+                    body = state.cached_body(url) if resp.status_code == 304 else None
+                    if body is not None:
+                        changed = False
+                    else:
+                        if resp.status_code == 304:
+                            # Stored body vanished since the headers were built; refetch unconditionally
+                            resp = self._get(url, {"User-Agent": headers["User-Agent"]})
+                            resp.raise_for_status()
+                        body = resp.text
+                        changed = state.update(url, body, resp.headers.get("ETag"),
+                                               resp.headers.get("Last-Modified"), owner=self.name)
+                    self.record_page(changed)
+                    fetch_span.set(changed=changed)
+                    return body, changed
+                except requests.RequestException as e:
+                    wait = 2 ** attempt
+                    logger.warning(
+                        f"[{self.name}] Attempt {attempt}/{self.max_retries} failed for {url}: {e}. "
+                        f"Retrying in {wait}s..."
+                    )
+                    if attempt < self.max_retries:
+                        self.sleep(wait, reason="backoff")
+
+            fetch_span.set(failed=True)
+            logger.error(f"[{self.name}] All {self.max_retries} attempts failed for {url}")
+            # Content unknown: a failed page must keep the run from finishing as not_modified
+            self.record_page(True)
+            return None, True
+
+    def _get(self, url: str, headers: dict) -> requests.Response:
+        wait = host_limiter.reserve(url)
+        if wait > 0:
+            self.sleep(wait, reason="rate_limit")
+        return self.session.get(url, headers=headers, timeout=self.timeout)
 
     @staticmethod
-    def get_soup(html: str) -> BeautifulSoup:
-        return BeautifulSoup(html, "lxml")
+    def sleep(seconds: float, reason: str = "delay"):
+        """time.sleep() recorded as a "sleep" span, so waits show up in run timings."""
+        with span("sleep", reason=reason, seconds=seconds):
+            time.sleep(seconds)
+
+    def get_soup(self, html: str) -> BeautifulSoup:
+        return BeautifulSoup(html, self.html_parser)
 
     @abstractmethod
     def get_urls(self) -> list[str]:
@@ -74,23 +153,30 @@ class BaseScraper(ABC):
 
     def save(self, data: list[dict]):
         """Save scraped data to JSON file with metadata."""
-        settings.ensure_directories()
-        output_path = settings.CURRENT_DATA_DIR / f"{self.name}.json"
-
-        output = {
-            "metadata": {
-                "scraper": self.name,
-                "scraped_at": datetime.now(timezone.utc).isoformat(),
-                "record_count": len(data),
-                "source_urls": self.get_urls(),
-            },
-            "data": data,
-        }
-
-        with open(output_path, "w", encoding="utf-8") as f:
-            json.dump(output, f, ensure_ascii=False, indent=2)
-
-        logger.info(f"[{self.name}] Saved {len(data)} records to {output_path}")
+        with span("save", records=len(data)):
+            settings.ensure_directories()
+            output_path = settings.CURRENT_DATA_DIR / f"{self.name}.json"
+
+            output = {
+                "metadata": {
+                    "scraper": self.name,
+                    "scraped_at": datetime.now(timezone.utc).isoformat(),
+                    "record_count": len(data),
+                    "source_urls": self.get_urls(),
+                },
+                "data": data,
+            }
+
+            with open(output_path, "w", encoding="utf-8") as f:
+                json.dump(output, f, ensure_ascii=False, indent=2)
+
+            if settings.COMPACT_SNAPSHOTS:
+                try:
+                    write_compact(compact_path(output_path), output)
+                except Exception as e:
+                    logger.warning(f"[{self.name}] Failed to write compact snapshot: {e}")
+
+            logger.info(f"[{self.name}] Saved {len(data)} records to {output_path}")
 
     def run(self) -> list[dict]:
         """Execute the full scrape pipeline: fetch -> parse -> validate -> save."""
@@ -108,7 +194,7 @@ class BaseScraper(ABC):
 
             # Respectful delay between requests
             if i < len(urls) - 1:
-                time.sleep(self.delay)
+                self.sleep(self.delay)
 
         if not self.validate(all_data):
             logger.error(f"[{self.name}] Scrape failed validation")
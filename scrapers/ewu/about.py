@@ -1,9 +1,12 @@
+from datetime import timedelta
+
 from scrapers.base_scraper import BaseScraper
 from config.settings import settings
 
 
 class AboutScraper(BaseScraper):
     name = "about"
+    refresh_interval = timedelta(days=30)
 
     def get_urls(self) -> list[str]:
         return [
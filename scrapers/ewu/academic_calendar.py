@@ -1,5 +1,5 @@
 import re
-import time
+from datetime import timedelta
 
 from scrapers.base_scraper import BaseScraper
 from config.settings import settings
@@ -13,6 +13,7 @@ class AcademicCalendarScraper(BaseScraper):
     """
 
     name = "academic_calendar"
+    refresh_interval = timedelta(days=1)
 
     def get_urls(self) -> list[str]:
         return [f"{settings.EWU_BASE_URL}/academic-calendar"]
@@ -172,6 +173,6 @@ class AcademicCalendarScraper(BaseScraper):
 
             # Respectful delay between detail page requests
             if i < len(links) - 1:
-                time.sleep(self.delay)
+                self.sleep(self.delay)
 
         return all_records
@@ -1,4 +1,5 @@
 import re
+from datetime import timedelta
 
 from scrapers.base_scraper import BaseScraper
 from config.settings import settings
@@ -7,6 +8,7 @@ from utils.logger import logger
 
 class AdmissionDeadlinesScraper(BaseScraper):
     name = "admission_deadlines"
+    refresh_interval = timedelta(days=1)
 
     def get_urls(self) -> list[str]:
         return [f"{settings.EWU_ADMISSION_URL}/index.php?documentid=importantdates.php"]
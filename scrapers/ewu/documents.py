@@ -1,6 +1,7 @@
 """Document-type scrapers for pages that become JSONB blobs in university_documents."""
 
 import re
+from datetime import timedelta
 
 from scrapers.base_scraper import BaseScraper
 from config.settings import settings
@@ -8,6 +9,7 @@ from utils.logger import logger
 
 
 class BaseDocumentScraper(BaseScraper):
+    refresh_interval = timedelta(days=30)
     slug: str = ""
     doc_title: str = ""
 
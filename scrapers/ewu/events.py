@@ -1,5 +1,5 @@
 import re
-from datetime import datetime
+from datetime import datetime, timedelta
 
 from scrapers.base_scraper import BaseScraper
 from config.settings import settings
@@ -7,6 +7,7 @@ from config.settings import settings
 
 class EventsScraper(BaseScraper):
     name = "events"
+    refresh_interval = timedelta(hours=6)
 
     @staticmethod
     def _parse_date(date_str: str) -> tuple[str | None, str | None]:
@@ -1,7 +1,29 @@
+import contextvars
+import json
+import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
 from scrapers.base_scraper import BaseScraper
 from config.settings import settings
+from utils.http_state import conditional_requests_enabled, get_http_state
 from utils.logger import logger
 
+# Fields filled from /faculty-profile/<id> pages
+PROFILE_FIELDS = ("specialization", "academic_background", "publications", "details")
+
+PROFILE_HEADINGS = ("h2", "h3", "h4", "h5")
+
+# Section keys follow the manual export (ewu_faculty_complete.json "sections")
+SECTION_ALIASES = {
+    "research_interests": "research_interest",
+    "research_area": "research_interest",
+    "research_areas": "research_interest",
+    "publications": "selected_publications",
+    "education": "academic_background",
+    "educational_qualification": "academic_background",
+    "educational_qualifications": "academic_background",
+}
+
 
 class FacultyScraper(BaseScraper):
     """The faculty search page uses AJAX/Select2 dropdowns to filter by department.
@@ -37,6 +59,9 @@ class FacultyScraper(BaseScraper):
             if html:
                 all_faculty = self.parse(html, self.get_urls()[0])
 
+        if all_faculty and settings.FACULTY_PROFILE_WORKERS > 0:
+            self._enrich_profiles(all_faculty)
+
         if self.validate(all_faculty):
             self.save(all_faculty)
 
@@ -69,12 +94,139 @@ class FacultyScraper(BaseScraper):
 
                     if faculty:
                         logger.info(f"[{self.name}] Found {len(faculty)} faculty via API: {api_url}")
+                        if conditional_requests_enabled():
+                            self.record_page(get_http_state().update(
+                                api_url, resp.text, resp.headers.get("ETag"), resp.headers.get("Last-Modified"),
+                                owner=self.name))
                         return [self._normalize(f, api_url) for f in faculty]
             except Exception:
                 continue
 
         return []
 
+    def _previous_profiles(self) -> dict[str, dict]:
+        """Profile fields from the last saved run, keyed by profile_id."""
+        try:
+            path = settings.CURRENT_DATA_DIR / f"{self.name}.json"
+            records = json.loads(path.read_text(encoding="utf-8"))["data"]
+        except (OSError, ValueError, KeyError, TypeError):
+            return {}
+        return {
+            r["profile_id"]: {f: r.get(f) for f in PROFILE_FIELDS}
+            for r in records
+            if r.get("profile_id") and any(r.get(f) is not None for f in PROFILE_FIELDS[1:])
+        }
+
+    def _enrich_profiles(self, members: list[dict]):
+        """Fill profile fields from each member's profile page, in place.
+
+        Pages are fetched concurrently (FACULTY_PROFILE_WORKERS, spaced by the
+        host rate limit) and parsed as they arrive. A page whose body is
+        unchanged since the last run reuses the fields saved then instead of
+        being parsed again; a page that can't be fetched keeps them too.
+        """
+        previous = self._previous_profiles()
+        pending = [m for m in members if m.get("profile_url")]
+        parsed = reused = failed = 0
+
+        with ThreadPoolExecutor(max_workers=settings.FACULTY_PROFILE_WORKERS,
+                                thread_name_prefix="faculty-profile") as pool:
+            # Each task runs in a copy of this context so its fetch spans join the run's trace
+            futures = {
+                pool.submit(contextvars.copy_context().run, self.fetch_page, m["profile_url"]): m
+                for m in pending
+            }
+            for future in as_completed(futures):
+                member = futures[future]
+                html, changed = future.result()
+                cached = previous.get(member["profile_id"])
+                if html is None or (not changed and cached):
+                    if cached:
+                        member.update(cached)
+                    if html is None:
+                        failed += 1
+                    else:
+                        reused += 1
+                    continue
+                profile = self.parse_profile(html)
+                profile["specialization"] = profile["specialization"] or member.get("specialization", "")
+                member.update(profile)
+                parsed += 1
+
+        logger.info(
+            f"[{self.name}] Profiles: {parsed} parsed, {reused} unchanged, {failed} failed "
+            f"of {len(pending)}"
+        )
+
+    def parse_profile(self, html: str) -> dict:
+        """Map a /faculty-profile/<id> page onto the faculty_members profile fields."""
+        sections = self._profile_sections(self.get_soup(html))
+        research = sections.pop("research_interest", None)
+        return {
+            "specialization": "; ".join(research) if isinstance(research, list) else (research or ""),
+            "academic_background": sections.pop("academic_background", None),
+            "publications": sections.pop("selected_publications", None),
+            "details": sections or None,
+        }
+
+    @classmethod
+    def _profile_sections(cls, soup) -> dict:
+        """Section key -> content, from tab panes if the page has them, else from headings."""
+        content = soup.select_one(".faculty-profile, .profile-details, .profile-content, main") or soup.body
+        if content is None:
+            return {}
+
+        sections = {}
+        panes = content.select(".tab-pane[id]")
+        if panes:
+            for pane in panes:
+                # Children, so paragraphs inside one pane stay separate entries
+                value = cls._section_value(pane.find_all(True, recursive=False) or [pane])
+                if value:
+                    sections.setdefault(cls._section_key(pane["id"]), value)
+            return sections
+
+        for heading in content.find_all(PROFILE_HEADINGS):
+            key = cls._section_key(heading.get_text(" ", strip=True))
+            if not key:
+                continue
+            nodes = []
+            for sibling in heading.find_next_siblings():
+                if sibling.name in PROFILE_HEADINGS:
+                    break
+                nodes.append(sibling)
+            value = cls._section_value(nodes)
+            if value:
+                sections.setdefault(key, value)
+        return sections
+
+    @staticmethod
+    def _section_key(text: str) -> str:
+        key = re.sub(r"[^a-z0-9]+", "_", text.lower()).strip("_")
+        return SECTION_ALIASES.get(key, key)
+
+    @staticmethod
+    def _section_value(nodes: list) -> list | str | None:
+        """List items, else table rows, else paragraph text (a string if there is only one)."""
+        items = []
+        rows = []
+        for node in nodes:
+            elements = [node] if node.name == "li" else node.find_all("li")
+            items.extend(li.get_text(" ", strip=True) for li in elements)
+            for tr in ([node] if node.name == "tr" else node.find_all("tr")):
+                cells = [c.get_text(" ", strip=True) for c in tr.find_all(["td", "th"])]
+                if any(cells):
+                    rows.append(cells)
+        items = [i for i in items if i]
+        if items:
+            return items
+        if rows:
+            return rows
+        texts = [t for t in (n.get_text(" ", strip=True) for n in nodes) if t]
+        if not texts:
+            return None
+        return texts[0] if len(texts) == 1 else texts
+
     def _normalize(self, record: dict, url: str) -> dict:
         """Normalize a faculty record from API or page parse to match DB schema."""
         profile_url = record.get("profile_url", record.get("profile_link", ""))
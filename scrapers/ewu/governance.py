@@ -1,4 +1,5 @@
 import re
+from datetime import timedelta
 
 from scrapers.base_scraper import BaseScraper
 from config.settings import settings
@@ -7,6 +8,7 @@ from utils.logger import logger
 
 class GovernanceScraper(BaseScraper):
     name = "governance"
+    refresh_interval = timedelta(days=30)
 
     BODIES = {
         "board_of_trustees": f"{settings.EWU_BASE_URL}/board-trustees",
@@ -1,4 +1,4 @@
-import time
+from datetime import timedelta
 
 from scrapers.base_scraper import BaseScraper
 from config.settings import settings
@@ -7,6 +7,7 @@ from utils.logger import logger
 
 class NoticesScraper(BaseScraper):
     name = "notices"
+    refresh_interval = timedelta(hours=1)
 
     def get_urls(self) -> list[str]:
         # Notice board has pagination - start with page 1, discover total pages during parse
@@ -25,6 +26,10 @@ class NoticesScraper(BaseScraper):
             html = self.fetch(url)
             if html is None:
                 break
+            # Newest notices come first: an unchanged first page means nothing new was posted
+            if page == 1 and self.incremental and self.not_modified:
+                logger.info(f"[{self.name}] First page unchanged since last run, skipping the rest")
+                return []
 
             notices = self.parse(html, url)
             if not notices:
@@ -40,7 +45,7 @@ class NoticesScraper(BaseScraper):
                 break
 
             page += 1
-            time.sleep(self.delay)
+            self.sleep(self.delay)
 
         if self.validate(all_notices):
             self.save(all_notices)
@@ -1,9 +1,11 @@
-"""Shared fixtures for EWU Database API integration tests.
+"""Shared fixtures for the EWU test suite.
 
-All tests hit the real Supabase database — no mocks, no fakes.
+Tests using ``client`` or ``db`` hit the real Supabase database — no mocks,
+no fakes — and are skipped when it is unreachable. The remaining tests run
+offline against checked-in fixtures (tests/fixtures/).
 """
 
-import json
+from pathlib import Path
 
 import pytest
 from fastapi.testclient import TestClient
@@ -11,11 +13,14 @@ from fastapi.testclient import TestClient
 from api.main import app
 from config.settings import settings
 from database.db_manager import DBManager
+from utils.snapshot import load_snapshot
 
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures"
 
-@pytest.fixture(scope="session", autouse=True)
+
+@pytest.fixture(scope="session")
 def _check_db_connection():
-    """Skip entire test suite if Supabase is unreachable or anon key missing."""
+    """Skip Supabase-backed tests if Supabase is unreachable or anon key missing."""
     if not settings.SUPABASE_ANON_KEY:
         pytest.skip("SUPABASE_ANON_KEY not set")
     db = DBManager()
@@ -24,7 +29,7 @@ def _check_db_connection():
 
 
 @pytest.fixture
-def client():
+def client(_check_db_connection):
     """Real FastAPI TestClient — no mocks, hits real Supabase."""
     headers = {}
     if settings.API_SECRET_KEY:
@@ -34,7 +39,7 @@ def client():
 
 
 @pytest.fixture
-def db():
+def db(_check_db_connection):
     """Real DBManager for fetching valid IDs/slugs in test setup."""
     return DBManager()
 
@@ -48,8 +53,7 @@ def data_dir():
 def sample_programs():
     filepath = settings.MANUAL_DATA_DIR / "all_available_programs.json"
     if filepath.exists():
-        with open(filepath, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        data = load_snapshot(filepath)
         return data.get("programs", [])
     return []
 
@@ -58,8 +62,7 @@ def sample_programs():
 def sample_clubs():
     filepath = settings.MANUAL_DATA_DIR / "clubs.json"
     if filepath.exists():
-        with open(filepath, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        data = load_snapshot(filepath)
         return data.get("clubs", [])
     return []
 
@@ -68,6 +71,10 @@ def sample_clubs():
 def sample_tuition():
     filepath = settings.MANUAL_DATA_DIR / "tution_fees.json"
     if filepath.exists():
-        with open(filepath, "r", encoding="utf-8") as f:
-            return json.load(f)
+        return load_snapshot(filepath)
     return {}
+
+
+@pytest.fixture
+def fixtures_dir():
+    return FIXTURES_DIR
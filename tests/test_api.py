@@ -18,6 +18,22 @@ class TestMeta:
         assert r.status_code == 200
         assert "data" in r.json()
 
+    def test_metrics(self, client):
+        client.get("/api/health")
+        r = client.get("/metrics")
+        assert r.status_code == 200
+        assert r.headers["content-type"].startswith("text/plain")
+        assert 'api_http_requests_total{method="GET",route="/api/health",status="200"}' in r.text
+
+    def test_profile_request(self, client):
+        r = client.get("/api/last-update", headers={"X-Profile": "1"})
+        assert r.status_code == 200
+        profile_id = r.headers["x-profile-id"]
+        r = client.get(f"/api/profiles/{profile_id}")
+        assert r.status_code == 200
+        assert r.json()["data"]["upstream"][0]["table"] == "scrape_metadata"
+        assert client.get(f"/api/profiles/{profile_id}/folded").status_code == 200
+
 
 class TestAcademic:
     def test_list_departments(self, client):
@@ -184,6 +200,16 @@ class TestInformation:
         assert doc["slug"] == real_slug
         assert "content" in doc
 
+    def test_get_document_compressed(self, client):
+        listing = client.get("/api/documents").json()
+        assert listing["count"] >= 1
+        real_slug = listing["data"][0]["slug"]
+
+        r = client.get(f"/api/documents/{real_slug}", headers={"Accept-Encoding": "gzip"})
+        assert r.status_code == 200
+        assert r.headers["content-encoding"] == "gzip"
+        assert r.json()["data"]["slug"] == real_slug
+
     def test_get_document_not_found(self, client):
         r = client.get("/api/documents/nonexistent-slug-xyz")
         assert r.status_code == 404
@@ -0,0 +1,67 @@
+"""Offline tests for utils/diff_checker.py.
+
+Run with:  pytest tests/test_diff_checker.py -v
+"""
+
+from utils.diff_checker import DiffChecker
+
+OLD = [
+    {"id": 1, "title": "Convocation", "venue": "Main hall", "updated_at": "2024-01-01"},
+    {"id": 2, "title": "Career fair", "venue": "Plaza", "updated_at": "2024-01-01"},
+    {"id": 3, "title": "Blood drive", "venue": "Room 101", "updated_at": "2024-01-01"},
+]
+
+
+class TestCompare:
+    def test_unchanged_ignores_metadata_fields(self):
+        new = [{**r, "updated_at": "2025-06-01"} for r in OLD]
+        diff = DiffChecker.compare(OLD, new, "title", ignore_fields={"updated_at"})
+        assert not diff.has_changes
+        assert diff.unchanged == 3
+        assert diff.change_percentage == 0.0
+
+    def test_added_modified_removed(self):
+        new = [
+            OLD[0],
+            {**OLD[1], "venue": "Auditorium"},
+            {"id": 4, "title": "Hackathon", "venue": "Lab 3", "updated_at": "2024-01-01"},
+        ]
+        diff = DiffChecker.compare(OLD, new, "title")
+        assert diff.unchanged == 1
+        assert diff.added == [new[2]]
+        assert diff.removed == [OLD[2]]
+        assert len(diff.modified) == 1
+        change = diff.modified[0]
+        assert change["key"] == "Career fair"
+        assert change["changes"] == {"venue": ("Plaza", "Auditorium")}
+        assert change["new"] is new[1]
+        assert diff.total_records == 4
+        assert diff.change_percentage == 75.0
+
+    def test_composite_key_and_duplicates(self):
+        old = [{"program": "CSE", "level": "ug", "fee": 100}, {"program": "CSE", "level": "grad", "fee": 200}]
+        new = [
+            {"program": "CSE", "level": "ug", "fee": 100},
+            {"program": "CSE", "level": "ug", "fee": 999},  # duplicate key: first one wins
+            {"program": "CSE", "level": "grad", "fee": 250},
+        ]
+        diff = DiffChecker.compare(old, new, "program,level")
+        assert diff.unchanged == 1
+        assert [c["key"] for c in diff.modified] == [("CSE", "grad")]
+        assert diff.modified[0]["changes"] == {"fee": (200, 250)}
+
+    def test_normalize_applies_to_both_sides(self):
+        old = [{"title": "A", "venue": "Hall "}]
+        new = [{"title": "A", "venue": "Hall"}]
+        strip = lambda r: {k: v.strip() for k, v in r.items()}
+        assert DiffChecker.compare(old, new, "title").modified
+        diff = DiffChecker.compare(old, new, "title", normalize=strip)
+        assert diff.unchanged == 1
+        assert not diff.has_changes
+
+    def test_field_changes(self):
+        changes = DiffChecker.field_changes(
+            {"a": 1, "b": 2, "updated_at": "x"}, {"a": 1, "b": 3, "c": 4, "updated_at": "y"},
+            ignore_fields=frozenset({"updated_at"}),
+        )
+        assert changes == {"b": (2, 3), "c": (None, 4)}
@@ -0,0 +1,70 @@
+"""Offline tests for the faculty scraper's profile-page parsing.
+
+Run with:  pytest tests/test_faculty.py -v
+"""
+
+import pytest
+
+from scrapers.ewu.faculty import FacultyScraper
+
+
+@pytest.fixture
+def scraper():
+    return FacultyScraper()
+
+
+@pytest.fixture
+def profile_html(fixtures_dir):
+    return (fixtures_dir / "faculty_profile.html").read_text(encoding="utf-8")
+
+
+class TestProfileParsing:
+    def test_tab_panes(self, scraper, profile_html):
+        profile = scraper.parse_profile(profile_html)
+        assert profile["specialization"] == "Machine Learning; Natural Language Processing"
+        assert profile["academic_background"] == [
+            ["Degree", "Institution", "Year"],
+            ["PhD in Computer Science", "University of Toronto", "2012"],
+            ["BSc in CSE", "BUET", "2005"],
+        ]
+        assert profile["publications"] == [
+            'J. Doe, "Low-resource Bangla parsing", ACL 2019.',
+            'J. Doe and A. Rahman, "Graph kernels for text", Pattern Recognition, 2016.',
+        ]
+        assert profile["details"] == {
+            "experience": [
+                "Associate Professor, East West University (2016 - present)",
+                "Assistant Professor, East West University (2012 - 2016)",
+            ],
+            "awards": "Best Paper Award, ICCIT 2018",
+        }
+
+    def test_headings_fallback(self, scraper):
+        html = """
+        <main>
+          <h3>Research Areas</h3><p>Power Systems</p>
+          <h3>Educational Qualifications</h3><ul><li>PhD, KTH</li></ul>
+          <h3>Contact</h3>
+        </main>
+        """
+        profile = scraper.parse_profile(html)
+        assert profile["specialization"] == "Power Systems"
+        assert profile["academic_background"] == ["PhD, KTH"]
+        assert profile["publications"] is None
+        assert profile["details"] is None
+
+    def test_unrecognised_page(self, scraper):
+        profile = scraper.parse_profile("<html><body></body></html>")
+        assert profile == {"specialization": "", "academic_background": None,
+                           "publications": None, "details": None}
+
+
+class TestFetchAccounting:
+    def test_failed_fetch_is_not_unchanged(self, scraper, monkeypatch):
+        monkeypatch.setattr(scraper, "max_retries", 1)
+        scraper.record_page(False)
+        # Nothing listens on port 9 (discard), so the connection is refused at once
+        html, changed = scraper.fetch_page("http://127.0.0.1:9/faculty-profile/jane-doe")
+        assert html is None
+        assert changed
+        assert not scraper.not_modified
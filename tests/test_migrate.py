@@ -0,0 +1,99 @@
+"""Offline tests for the migration manifest in database/migrate.py.
+
+Run with:  pytest tests/test_migrate.py -v
+"""
+
+import os
+
+import pytest
+
+from database import migrate
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    for name in ("depts.json", "academic_council.json", "syndicate.json", "clubs.json"):
+        (tmp_path / name).write_text('{"v": 1}', encoding="utf-8")
+    courses = tmp_path / "courses_undergraduate"
+    courses.mkdir()
+    (courses / "cse.json").write_text('{"v": 1}', encoding="utf-8")
+    return tmp_path
+
+
+def _migrated(data_dir):
+    """Manifest as left by a successful run over the current files."""
+    return migrate._plan_migration(data_dir, {}).fingerprints
+
+
+class TestPlanMigration:
+    def test_first_run_migrates_everything_present(self, data_dir):
+        plan = migrate._plan_migration(data_dir, {})
+        assert plan.changed == {"depts.json", "academic_council.json", "syndicate.json",
+                                "clubs.json", "courses_undergraduate/cse.json"}
+        assert plan.dirty_tables == {"departments", "governance_members", "clubs"}
+        assert plan.course_files == {data_dir / "courses_undergraduate" / "cse.json"}
+
+    def test_unchanged_tree_has_nothing_to_do(self, data_dir):
+        plan = migrate._plan_migration(data_dir, _migrated(data_dir))
+        assert not plan.changed
+        assert not plan.dirty_tables
+        assert not plan.course_files
+        assert plan.to_migrate == []
+
+    def test_changed_file_dirties_only_its_table(self, data_dir):
+        previous = _migrated(data_dir)
+        (data_dir / "syndicate.json").write_text('{"v": 2}', encoding="utf-8")
+        plan = migrate._plan_migration(data_dir, previous)
+        assert plan.changed == {"syndicate.json"}
+        assert plan.dirty_tables == {"governance_members"}
+        assert plan.to_migrate == ["syndicate.json"]
+
+    def test_clean_reloads_every_file_of_a_dirty_table(self, data_dir):
+        previous = _migrated(data_dir)
+        (data_dir / "syndicate.json").write_text('{"v": 2}', encoding="utf-8")
+        plan = migrate._plan_migration(data_dir, previous, clean=True)
+        assert plan.dirty_tables == {"governance_members"}
+        # Missing feeders are listed too; run_migration skips them with a warning
+        assert plan.to_migrate == ["academic_council.json", "ewu_board_of_trustees.json", "syndicate.json"]
+
+    def test_full_marks_every_table_dirty(self, data_dir):
+        plan = migrate._plan_migration(data_dir, {}, full=True)
+        assert plan.dirty_tables == {config["table"] for config in migrate.FILE_TABLE_MAP.values()}
+        assert sorted(plan.to_migrate) == ["academic_council.json", "clubs.json", "depts.json", "syndicate.json"]
+
+    def test_touched_but_identical_file_is_unchanged(self, data_dir):
+        previous = _migrated(data_dir)
+        (data_dir / "clubs.json").write_text('{"v": 1}', encoding="utf-8")
+        plan = migrate._plan_migration(data_dir, previous)
+        assert not plan.changed
+        assert plan.fingerprints["clubs.json"]["sha256"] == previous["clubs.json"]["sha256"]
+
+
+class TestNextManifest:
+    def test_touched_file_gets_its_new_mtime(self, data_dir):
+        previous = _migrated(data_dir)
+        path = data_dir / "clubs.json"
+        path.write_text('{"v": 1}', encoding="utf-8")
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, previous["clubs.json"]["mtime_ns"] + 1_000_000_000))
+        plan = migrate._plan_migration(data_dir, previous)
+        manifest = migrate._next_manifest(previous, plan, set())
+        assert manifest["clubs.json"] == plan.fingerprints["clubs.json"]
+        assert manifest["clubs.json"]["mtime_ns"] != previous["clubs.json"]["mtime_ns"]
+        # The refreshed entry matches on stat(), so the next plan doesn't re-hash the file
+        assert migrate._fingerprint(path, manifest["clubs.json"]) is manifest["clubs.json"]
+
+    def test_failed_file_keeps_its_old_fingerprint(self, data_dir):
+        previous = _migrated(data_dir)
+        (data_dir / "syndicate.json").write_text('{"v": 2}', encoding="utf-8")
+        (data_dir / "clubs.json").write_text('{"v": 2}', encoding="utf-8")
+        plan = migrate._plan_migration(data_dir, previous)
+        manifest = migrate._next_manifest(previous, plan, {"clubs.json"})
+        assert manifest["syndicate.json"] == previous["syndicate.json"]
+        assert manifest["clubs.json"] == plan.fingerprints["clubs.json"]
+
+    def test_removed_file_is_dropped(self, data_dir):
+        previous = _migrated(data_dir)
+        (data_dir / "depts.json").unlink()
+        plan = migrate._plan_migration(data_dir, previous)
+        assert "depts.json" not in migrate._next_manifest(previous, plan, set())
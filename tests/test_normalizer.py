@@ -0,0 +1,67 @@
+"""Offline tests for utils/normalizer.py.
+
+Run with:  pytest tests/test_normalizer.py -v
+"""
+
+from decimal import Decimal
+
+from utils.normalizer import (
+    RecordNormalizer, _boolean, _date, _json, _numeric, _text, _timestamp, _uuid, load_column_types,
+)
+
+
+class TestConverters:
+    def test_text(self):
+        assert _text(None) == ""
+        assert _text("  Dhaka ") == "Dhaka"
+        assert _text(3) == "3"
+
+    def test_numeric(self):
+        assert _numeric("1,200") == _numeric(1200.0) == _numeric(1200) == Decimal("1.2E+3")
+        assert _numeric("") is None
+        assert _numeric(None) is None
+        assert _numeric("n/a") == "n/a"
+
+    def test_boolean(self):
+        assert _boolean(None) is None
+        assert _boolean("") is None
+        assert _boolean(" Yes ") is True
+        assert _boolean("false") is False
+        assert _boolean(0) is False
+        assert _boolean(True) is True
+
+    def test_date(self):
+        assert _date("2024-03-05") == _date("5 March 2024") == _date("March 5, 2024") == "2024-03-05"
+        assert _date("2024-03-05T10:00:00+06:00") == "2024-03-05"
+        assert _date("") is None
+        assert _date("TBA") == "TBA"
+
+    def test_timestamp(self):
+        assert _timestamp("2024-03-05T10:00:00+06:00") == "2024-03-05T04:00:00+00:00"
+        assert _timestamp("2024-03-05T04:00:00") == "2024-03-05T04:00:00+00:00"
+        assert _timestamp(None) is None
+
+    def test_json_and_uuid(self):
+        assert _json({}) is None
+        assert _json([]) is None
+        assert _json({"a": 1}) == {"a": 1}
+        assert _uuid("ABC-DEF") == "abc-def"
+        assert _uuid("") is None
+
+
+class TestRecordNormalizer:
+    def test_schema_types(self):
+        types = load_column_types()
+        assert types["tuition_fees"]["grand_total"] == "NUMERIC"
+        assert types["governance_members"]["is_chairperson"] == "BOOLEAN"
+
+    def test_projects_and_converts_by_column_type(self):
+        normalize = RecordNormalizer("tuition_fees", ["program", "grand_total", "credits"])
+        scraped = {"program": " BSc in CSE ", "grand_total": "1,200,000", "credits": 140, "source_url": "x"}
+        stored = {"id": "1", "program": "BSc in CSE", "grand_total": 1200000.0, "credits": "140"}
+        assert normalize(scraped) == normalize(stored)
+        assert set(normalize(scraped)) == {"program", "grand_total", "credits"}
+
+    def test_null_boolean_differs_from_false(self):
+        normalize = RecordNormalizer("governance_members", ["name", "is_chairperson"])
+        assert normalize({"name": "A", "is_chairperson": None}) != normalize({"name": "A", "is_chairperson": False})
@@ -0,0 +1,35 @@
+"""Offline tests for the run-phase breakdown in utils/tracing.py.
+
+Run with:  pytest tests/test_tracing.py -v
+"""
+
+from utils.tracing import Span, Tracer
+
+MS = 1_000_000
+
+
+def _tracer(*spans: Span) -> Tracer:
+    tracer = Tracer()
+    tracer.spans = list(spans)
+    return tracer
+
+
+class TestPhaseTotals:
+    def test_sequential_spans_are_exclusive(self):
+        root = Span(1, None, "scraper", 0, 100 * MS)
+        tracer = _tracer(
+            root,
+            Span(2, 1, "parse", 0, 80 * MS),
+            Span(3, 2, "fetch", 10 * MS, 40 * MS),
+            Span(4, 2, "sleep", 40 * MS, 50 * MS),
+        )
+        assert tracer.phase_totals(root) == {"parse": 0.04, "fetch": 0.03, "scraper": 0.02, "sleep": 0.01}
+
+    def test_concurrent_spans_share_wall_clock(self):
+        # Four worker threads fetch in parallel for 40 ms inside a 60 ms parse
+        root = Span(1, None, "scraper", 0, 60 * MS)
+        workers = [Span(3 + i, 2, "fetch", 10 * MS, 50 * MS) for i in range(4)]
+        tracer = _tracer(root, Span(2, 1, "parse", 0, 60 * MS), *workers)
+        totals = tracer.phase_totals(root)
+        assert totals == {"fetch": 0.04, "parse": 0.02}
+        assert sum(totals.values()) == root.seconds
@@ -1,6 +1,7 @@
 from .logger import logger
 from .diff_checker import DiffChecker
+from .normalizer import RecordNormalizer
 from .notifier import Notifier
 from .validators import validate_data
 
-__all__ = ["logger", "DiffChecker", "Notifier", "validate_data"]
+__all__ = ["logger", "DiffChecker", "RecordNormalizer", "Notifier", "validate_data"]
@@ -0,0 +1,173 @@
+"""Versioned, content-addressed archive of scraper snapshots in data/archive/.
+
+Layout:
+    objects/<aa>/<sha256>.json.gz   one gzip-compressed record, stored once
+    runs/<run_id>/<scraper>.json    manifest: metadata + ordered record hashes
+
+Unchanged records across runs resolve to the same object, so each run only
+adds the records that actually changed.
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+
+import orjson
+
+from config.settings import settings
+from utils.logger import logger
+
+
+class SnapshotArchive:
+    """Write, list, load and prune versioned snapshots of scraper output."""
+
+    def __init__(self, root: Path | None = None, run_id: str | None = None):
+        self.root = root or settings.ARCHIVE_DIR
+        self.objects_dir = self.root / "objects"
+        self.runs_dir = self.root / "runs"
+        self.run_id = run_id or datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+    def _object_path(self, digest: str) -> Path:
+        return self.objects_dir / digest[:2] / f"{digest}.json.gz"
+
+    def _put(self, record: dict) -> tuple[str, bool]:
+        """Store one record; return (digest, whether a new object was written)."""
+        blob = orjson.dumps(record, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS, default=str)
+        digest = hashlib.sha256(blob).hexdigest()
+        path = self._object_path(digest)
+        if path.exists():
+            return digest, False
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_bytes(gzip.compress(blob, compresslevel=6))
+        os.replace(tmp, path)
+        return digest, True
+
+    def write(self, name: str, records: list[dict], metadata: dict | None = None) -> Path:
+        """Archive one scraper's records under the current run and return the manifest path."""
+        hashes = []
+        new_objects = 0
+        for record in records:
+            digest, created = self._put(record)
+            hashes.append(digest)
+            new_objects += created
+
+        manifest = {
+            "scraper": name,
+            "run_id": self.run_id,
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "record_count": len(records),
+            "metadata": metadata or {},
+            "records": hashes,
+        }
+        run_dir = self.runs_dir / self.run_id
+        run_dir.mkdir(parents=True, exist_ok=True)
+        path = run_dir / f"{name}.json"
+        path.write_bytes(orjson.dumps(manifest))
+        logger.info(
+            f"[{name}] Archived {len(records)} records to run {self.run_id} "
+            f"({new_objects} new objects)"
+        )
+        return path
+
+    def runs(self) -> list[str]:
+        """Run ids, oldest first."""
+        if not self.runs_dir.exists():
+            return []
+        return sorted(p.name for p in self.runs_dir.iterdir() if p.is_dir())
+
+    def load(self, name: str, run_id: str | None = None) -> list[dict]:
+        """Load a scraper's records from a run (default: the latest run that has it)."""
+        candidates = [run_id] if run_id else reversed(self.runs())
+        for candidate in candidates:
+            path = self.runs_dir / candidate / f"{name}.json"
+            if path.exists():
+                manifest = orjson.loads(path.read_bytes())
+                return [
+                    orjson.loads(gzip.decompress(self._object_path(h).read_bytes()))
+                    for h in manifest["records"]
+                ]
+        return []
+
+    def restore(self, name: str, run_id: str) -> Path:
+        """Roll data/current/<name>.json back to the snapshot from ``run_id``."""
+        records = self.load(name, run_id)
+        if not records:
+            raise FileNotFoundError(f"No archived snapshot of {name} in run {run_id}")
+        settings.ensure_directories()
+        output_path = settings.CURRENT_DATA_DIR / f"{name}.json"
+        output = {
+            "metadata": {
+                "scraper": name,
+                "restored_from_run": run_id,
+                "restored_at": datetime.now(timezone.utc).isoformat(),
+                "record_count": len(records),
+            },
+            "data": records,
+        }
+        with open(output_path, "w", encoding="utf-8") as f:
+            json.dump(output, f, ensure_ascii=False, indent=2)
+        logger.info(f"[{name}] Restored {len(records)} records from run {run_id}")
+        return output_path
+
+    def prune(self, keep_runs: int):
+        """Keep each scraper's newest ``keep_runs`` snapshots; drop the rest and unreferenced objects.
+
+        Retention is counted per scraper, since a run only archives the
+        scrapers that were due: a scraper refreshed monthly keeps its last
+        snapshots however many hourly runs happened since.
+        """
+        by_scraper: dict[str, list[Path]] = {}
+        for run_id in self.runs():
+            for manifest_path in (self.runs_dir / run_id).glob("*.json"):
+                by_scraper.setdefault(manifest_path.stem, []).append(manifest_path)
+
+        expired = 0
+        for manifests in by_scraper.values():
+            for manifest_path in (manifests[:-keep_runs] if keep_runs > 0 else manifests):
+                manifest_path.unlink()
+                expired += 1
+        if not expired:
+            return
+        for run_id in self.runs():
+            run_dir = self.runs_dir / run_id
+            if not any(run_dir.iterdir()):
+                run_dir.rmdir()
+
+        live = set()
+        for run_id in self.runs():
+            for manifest_path in (self.runs_dir / run_id).glob("*.json"):
+                live.update(orjson.loads(manifest_path.read_bytes())["records"])
+
+        removed = 0
+        for path in self.objects_dir.glob("*/*.json.gz"):
+            if path.name.split(".", 1)[0] not in live:
+                path.unlink()
+                removed += 1
+        logger.info(f"Pruned {expired} archived snapshot(s) and {removed} unreferenced object(s)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Inspect or roll back archived scraper snapshots")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("list", help="List archived runs")
+    restore = sub.add_parser("restore", help="Restore data/current/<scraper>.json from a run")
+    restore.add_argument("scraper")
+    restore.add_argument("run_id")
+    prune = sub.add_parser("prune", help="Apply the retention policy (newest --keep snapshots per scraper)")
+    prune.add_argument("--keep", type=int, default=settings.ARCHIVE_RETENTION_RUNS)
+    args = parser.parse_args()
+
+    archive = SnapshotArchive()
+    if args.command == "list":
+        for run_id in archive.runs():
+            scrapers = sorted(p.stem for p in (archive.runs_dir / run_id).glob("*.json"))
+            print(f"{run_id}  {', '.join(scrapers)}")
+    elif args.command == "restore":
+        archive.restore(args.scraper, args.run_id)
+    elif args.command == "prune":
+        archive.prune(args.keep)
@@ -0,0 +1,150 @@
+import base64
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from pathlib import Path
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from config.settings import settings
+from utils.logger import logger
+
+# Describe the stored (decoded) body, not the original transfer
+_DROPPED_HEADERS = {"content-encoding", "transfer-encoding", "content-length", "connection"}
+
+
+def _canonical_url(url: str) -> str:
+    parts = urlsplit(url)
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((parts.scheme, parts.netloc.lower(), parts.path or "/", query, ""))
+
+
+class CassetteAdapter(HTTPAdapter):
+    """requests transport adapter that records to or replays from a cassette directory.
+
+    Each interaction is stored as ``<dir>/<host>/<sha256>.json``, keyed by
+    method, canonical URL (sorted query) and request body. Headers are not
+    part of the key, so rotating User-Agents still match.
+
+    In replay mode no network is touched: responses are served after
+    ``latency`` (+ up to ``jitter``) seconds, and a fraction ``error_rate`` of
+    requests fail with a connection error or a 503. Unrecorded requests raise
+    ConnectionError, the same as an unreachable host.
+    """
+
+    def __init__(self, directory: Path, mode: str, latency: float = 0.0, jitter: float = 0.0,
+                 error_rate: float = 0.0, seed: int | None = None):
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Unknown cassette mode: {mode}")
+        super().__init__()
+        self.directory = directory
+        self.mode = mode
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self._random = random.Random(seed)
+        self._random_lock = threading.Lock()
+
+    def _path(self, request: requests.PreparedRequest) -> Path:
+        body = request.body or b""
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        url = _canonical_url(request.url)
+        digest = hashlib.sha256(f"{request.method} {url}\n".encode("utf-8") + body).hexdigest()
+        return self.directory / (urlsplit(url).hostname or "_") / f"{digest}.json"
+
+    def send(self, request, **kwargs):
+        if self.mode == "record":
+            return self._record(request, **kwargs)
+        return self._replay(request)
+
+    def _record(self, request, **kwargs):
+        response = super().send(request, **kwargs)
+        if response.status_code == 304:
+            # Nothing to replay from: the body lives in whatever cache sent the validators
+            logger.warning(f"Not recording 304 for {request.url}")
+            return response
+        body = response.content
+        entry = {
+            "request": {"method": request.method, "url": request.url},
+            "status": response.status_code,
+            "reason": response.reason,
+            "headers": {k: v for k, v in response.headers.items() if k.lower() not in _DROPPED_HEADERS},
+            "recorded_at": time.time(),
+        }
+        try:
+            entry["body"] = body.decode("utf-8")
+        except UnicodeDecodeError:
+            entry["body_b64"] = base64.b64encode(body).decode("ascii")
+
+        path = self._path(request)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{threading.get_ident()}.tmp")
+        tmp.write_text(json.dumps(entry, ensure_ascii=False, indent=1), encoding="utf-8")
+        os.replace(tmp, path)
+        return response
+
+    def _replay(self, request):
+        with self._random_lock:
+            delay = self.latency + self._random.uniform(0, self.jitter)
+            roll = self._random.random()
+            fail_hard = self._random.random() < 0.5
+        if delay:
+            time.sleep(delay)
+
+        if roll < self.error_rate:
+            if fail_hard:
+                raise requests.ConnectionError(f"Injected connection error for {request.url}", request=request)
+            return self._build_response(request, 503, "Service Unavailable", {}, b"")
+
+        path = self._path(request)
+        if not path.exists():
+            raise requests.ConnectionError(f"No cassette entry for {request.method} {request.url}", request=request)
+
+        entry = json.loads(path.read_text(encoding="utf-8"))
+        if "body_b64" in entry:
+            body = base64.b64decode(entry["body_b64"])
+        else:
+            body = entry.get("body", "").encode("utf-8")
+        return self._build_response(request, entry["status"], entry.get("reason", ""), entry["headers"], body)
+
+    @staticmethod
+    def _build_response(request, status: int, reason: str, headers: dict, body: bytes) -> requests.Response:
+        response = requests.Response()
+        response.status_code = status
+        response.reason = reason
+        response.headers = CaseInsensitiveDict(headers)
+        response.encoding = get_encoding_from_headers(response.headers) or "utf-8"
+        response._content = body
+        response.url = request.url
+        response.request = request
+        return response
+
+
+def mount_cassette(session: requests.Session, mode: str | None = None) -> CassetteAdapter | None:
+    """Mount a CassetteAdapter on ``session`` according to settings.HTTP_MODE.
+
+    Returns the adapter, or None in "live" mode.
+    """
+    mode = mode or settings.HTTP_MODE
+    if mode == "live":
+        return None
+    adapter = CassetteAdapter(
+        settings.HTTP_CASSETTE_DIR,
+        mode,
+        latency=settings.HTTP_REPLAY_LATENCY_MS / 1000,
+        jitter=settings.HTTP_REPLAY_JITTER_MS / 1000,
+        error_rate=settings.HTTP_REPLAY_ERROR_RATE,
+        seed=settings.HTTP_REPLAY_SEED,
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    logger.debug(f"HTTP {mode} mode using cassettes in {settings.HTTP_CASSETTE_DIR}")
+    return adapter
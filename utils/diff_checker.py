@@ -1,13 +1,37 @@
+import hashlib
+import reprlib
+from collections import Counter
+from collections.abc import Callable, Iterable, Mapping, Sequence
 from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+
+import orjson
+
+_HASH_OPTIONS = orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS
+
+# Bounded repr for previews: never materializes the full repr of a large blob
+_preview_repr = reprlib.Repr()
+_preview_repr.maxlevel = 2
+_preview_repr.maxdict = 8
+_preview_repr.maxlist = 5
+_preview_repr.maxstring = 80
+_preview_repr.maxother = 80
 
 
 @dataclass
 class DiffResult:
-    """Result of comparing two datasets."""
+    """Result of comparing two datasets.
+
+    ``added`` and ``removed`` hold references to the original records.
+    ``modified`` holds ``{"key", "changes", "new"}`` entries where ``changes``
+    maps each differing field to an ``(old, new)`` pair. Unchanged records are
+    only counted.
+    """
     added: list = field(default_factory=list)
     modified: list = field(default_factory=list)
     removed: list = field(default_factory=list)
-    unchanged: list = field(default_factory=list)
+    unchanged: int = 0
 
     @property
     def has_changes(self):
@@ -15,7 +39,7 @@ class DiffResult:
 
     @property
     def total_records(self):
-        return len(self.added) + len(self.modified) + len(self.removed) + len(self.unchanged)
+        return len(self.added) + len(self.modified) + len(self.removed) + self.unchanged
 
     @property
     def change_percentage(self):
@@ -27,66 +51,229 @@ class DiffResult:
 
 class DiffChecker:
     @staticmethod
-    def compare(old_data: list, new_data: list, key_field: str) -> DiffResult:
-        """Compare old and new datasets using a key field for matching.
+    def key_fields(key_field: str | Sequence[str]) -> tuple[str, ...]:
+        """Normalize a key spec ("a", "a,b" or ["a", "b"]) to a tuple of field names."""
+        if isinstance(key_field, str):
+            return tuple(f.strip() for f in key_field.split(","))
+        return tuple(key_field)
+
+    @staticmethod
+    def record_key(record: dict, fields: tuple[str, ...]):
+        """Return the record's key (a scalar for one field, a tuple for composites).
+
+        Returns None when any key field is absent from the record.
+        """
+        if len(fields) == 1:
+            return record[fields[0]] if fields[0] in record else None
+        if not all(f in record for f in fields):
+            return None
+        return tuple(record[f] for f in fields)
+
+    @staticmethod
+    def index(records: Iterable[dict], key_field: str | Sequence[str]) -> dict:
+        """Build a key -> record index; the first record wins on duplicate keys."""
+        fields = DiffChecker.key_fields(key_field)
+        result = {}
+        for record in records:
+            key = DiffChecker.record_key(record, fields)
+            if key is not None and key not in result:
+                result[key] = record
+        return result
+
+    @staticmethod
+    def record_hash(record: dict, ignore_fields: frozenset = frozenset()) -> bytes:
+        """Stable 128-bit digest of a record's content, excluding ignored fields."""
+        if ignore_fields:
+            record = {k: v for k, v in record.items() if k not in ignore_fields}
+        payload = orjson.dumps(record, option=_HASH_OPTIONS, default=str)
+        return hashlib.blake2b(payload, digest_size=16).digest()
+
+    @staticmethod
+    def field_changes(old: dict, new: dict, ignore_fields: frozenset = frozenset()) -> dict:
+        """Return {field: (old_value, new_value)} for every field that differs."""
+        changes = {}
+        for name in old.keys() | new.keys():
+            if name in ignore_fields:
+                continue
+            old_value, new_value = old.get(name), new.get(name)
+            if old_value != new_value:
+                changes[name] = (old_value, new_value)
+        return changes
+
+    @staticmethod
+    def compare(old_data: list | Mapping, new_data: list | Mapping,
+                key_field: str | Sequence[str],
+                ignore_fields: Iterable[str] = (),
+                normalize: Callable[[dict], dict] | None = None) -> DiffResult:
+        """Compare old and new datasets using a (possibly composite) key.
 
         Args:
-            old_data: Previous version of records.
-            new_data: Current version of records.
-            key_field: Field name used to uniquely identify records.
+            old_data: Previous version of records, or a prebuilt key -> record index.
+            new_data: Current version of records, or a prebuilt key -> record index.
+            key_field: Field name, comma-separated composite key, or sequence of names.
+            ignore_fields: Fields excluded from the comparison (e.g. DB metadata).
+            normalize: Optional canonicalizer applied to both sides before
+                hashing and field comparison (see utils.normalizer). Records
+                in the result are the originals, not the normalized copies.
 
         Returns:
             DiffResult with categorized changes.
+
+        Only the old side is indexed (key -> digest, record reference); the new
+        side is streamed against it, and field-level changes are computed only
+        for records whose digests differ.
         """
+        fields = DiffChecker.key_fields(key_field)
+        ignore = frozenset(ignore_fields)
+        canon = normalize or (lambda record: record)
         result = DiffResult()
 
-        old_map = {record[key_field]: record for record in old_data if key_field in record}
-        new_map = {record[key_field]: record for record in new_data if key_field in record}
+        old_index = old_data if isinstance(old_data, Mapping) else DiffChecker.index(old_data, fields)
+        old_hashes = {
+            key: (DiffChecker.record_hash(canon(record), ignore), record)
+            for key, record in old_index.items()
+        }
+
+        if isinstance(new_data, Mapping):
+            new_items = new_data.items()
+        else:
+            new_items = ((DiffChecker.record_key(r, fields), r) for r in new_data)
 
-        old_keys = set(old_map.keys())
-        new_keys = set(new_map.keys())
+        seen = set()
+        for key, record in new_items:
+            if key is None or key in seen:
+                continue
+            seen.add(key)
 
-        for key in new_keys - old_keys:
-            result.added.append(new_map[key])
+            entry = old_hashes.pop(key, None)
+            if entry is None:
+                result.added.append(record)
+                continue
 
-        for key in old_keys - new_keys:
-            result.removed.append(old_map[key])
+            old_hash, old_record = entry
+            canonical = canon(record)
+            if old_hash == DiffChecker.record_hash(canonical, ignore):
+                result.unchanged += 1
+                continue
 
-        for key in old_keys & new_keys:
-            if old_map[key] != new_map[key]:
-                result.modified.append({
-                    "key": key,
-                    "old": old_map[key],
-                    "new": new_map[key],
-                })
-            else:
-                result.unchanged.append(old_map[key])
+            result.modified.append({
+                "key": key,
+                "changes": DiffChecker.field_changes(canon(old_record), canonical, ignore),
+                "new": record,
+            })
 
+        result.removed.extend(record for _, record in old_hashes.values())
         return result
 
+    @staticmethod
+    def build_report(diff: DiffResult, name: str = "", max_items: int = 10) -> "DiffReport":
+        """Wrap a DiffResult in a lazily rendered, size-bounded report."""
+        return DiffReport(diff, name=name, max_items=max_items)
+
     @staticmethod
     def generate_report(diff: DiffResult) -> str:
         """Generate a human-readable diff report."""
+        return DiffReport(diff).render()
+
+
+class DiffReport:
+    """Structured view of a DiffResult with per-field summaries and bounded previews.
+
+    Nothing is formatted at construction time; ``render()`` / ``to_dict()``
+    do the work, so the report can be handed to a lazy logger call and only
+    pays for itself when a sink actually emits it.
+    """
+
+    def __init__(self, diff: DiffResult, name: str = "", max_items: int = 10):
+        self.diff = diff
+        self.name = name
+        self.max_items = max_items
+
+    @staticmethod
+    def preview(value) -> str:
+        return _preview_repr.repr(value)
+
+    def field_summary(self) -> dict[str, int]:
+        """Number of modified records in which each field changed, most frequent first."""
+        counts = Counter(name for change in self.diff.modified for name in change["changes"])
+        return dict(counts.most_common())
+
+    def summary_line(self) -> str:
+        diff = self.diff
+        return (
+            f"+{len(diff.added)} ~{len(diff.modified)} -{len(diff.removed)} "
+            f"={diff.unchanged} ({diff.change_percentage:.1f}% changed)"
+        )
+
+    def render(self) -> str:
+        diff = self.diff
         lines = ["=== Data Diff Report ==="]
         lines.append(f"Added:     {len(diff.added)}")
         lines.append(f"Modified:  {len(diff.modified)}")
         lines.append(f"Removed:   {len(diff.removed)}")
-        lines.append(f"Unchanged: {len(diff.unchanged)}")
+        lines.append(f"Unchanged: {diff.unchanged}")
         lines.append(f"Change %:  {diff.change_percentage:.1f}%")
 
         if diff.added:
             lines.append("\n--- Added ---")
-            for record in diff.added[:10]:
-                lines.append(f"  + {record}")
+            for record in diff.added[:self.max_items]:
+                lines.append(f"  + {self.preview(record)}")
 
         if diff.modified:
+            lines.append("\n--- Modified fields ---")
+            for name, count in self.field_summary().items():
+                lines.append(f"  {name}: {count}")
             lines.append("\n--- Modified ---")
-            for change in diff.modified[:10]:
-                lines.append(f"  ~ {change['key']}")
+            for change in diff.modified[:self.max_items]:
+                lines.append(f"  ~ {self.preview(change['key'])}")
+                for name, (old, new) in sorted(change["changes"].items()):
+                    lines.append(f"      {name}: {self.preview(old)} -> {self.preview(new)}")
 
         if diff.removed:
             lines.append("\n--- Removed ---")
-            for record in diff.removed[:10]:
-                lines.append(f"  - {record}")
+            for record in diff.removed[:self.max_items]:
+                lines.append(f"  - {self.preview(record)}")
+
+        hidden = max(0, len(diff.added) - self.max_items) + \
+            max(0, len(diff.modified) - self.max_items) + max(0, len(diff.removed) - self.max_items)
+        if hidden:
+            lines.append(f"\n... {hidden} more change(s) not shown")
 
         return "\n".join(lines)
+
+    __str__ = render
+
+    def to_dict(self) -> dict:
+        diff = self.diff
+        return {
+            "name": self.name,
+            "generated_at": datetime.now(timezone.utc).isoformat(),
+            "counts": {
+                "added": len(diff.added),
+                "modified": len(diff.modified),
+                "removed": len(diff.removed),
+                "unchanged": diff.unchanged,
+                "change_percentage": round(diff.change_percentage, 2),
+            },
+            "fields": self.field_summary(),
+            "added": [self.preview(r) for r in diff.added[:self.max_items]],
+            "modified": [
+                {
+                    "key": self.preview(change["key"]),
+                    "changes": {
+                        name: {"old": self.preview(old), "new": self.preview(new)}
+                        for name, (old, new) in change["changes"].items()
+                    },
+                }
+                for change in diff.modified[:self.max_items]
+            ],
+            "removed": [self.preview(r) for r in diff.removed[:self.max_items]],
+        }
+
+    def write_artifact(self, directory: Path) -> Path:
+        """Write the report as JSON into ``directory`` and return the file path."""
+        directory.mkdir(parents=True, exist_ok=True)
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+        path = directory / f"{self.name or 'diff'}_{stamp}.json"
+        path.write_bytes(orjson.dumps(self.to_dict(), option=orjson.OPT_INDENT_2))
+        return path
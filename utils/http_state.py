@@ -0,0 +1,117 @@
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+
+from config.settings import settings
+from utils.logger import logger
+
+
+class HttpState:
+    """Per-URL validators and last bodies, persisted between runs.
+
+    For every fetched URL it keeps the ETag / Last-Modified the server sent
+    and the sha256 of the body, so the next fetch can be a conditional GET
+    and an unchanged page (304, or 200 with the same hash) is recognised.
+    Bodies are kept under ``bodies/`` so a 304 can still be parsed.
+
+    New responses are staged per owner (the scraper that fetched them) and
+    only become the baseline once ``commit(owner)`` is called, after their
+    data has been synced; ``discard(owner)`` drops them, so the next run
+    compares against the last synced bodies again.
+    """
+
+    def __init__(self, directory: Path):
+        self.directory = directory
+        self.index_path = directory / "index.json"
+        self.bodies_dir = directory / "bodies"
+        self._entries: dict[str, dict] = {}
+        # owner -> url -> (entry, body), waiting for commit() or discard()
+        self._staged: dict[str, dict[str, tuple[dict, str]]] = {}
+        self._dirty = False
+        self._lock = threading.Lock()
+        if self.index_path.exists():
+            try:
+                self._entries = json.loads(self.index_path.read_text(encoding="utf-8"))
+            except (OSError, ValueError) as e:
+                logger.warning(f"Ignoring unreadable HTTP state {self.index_path}: {e}")
+
+    def _body_path(self, url: str) -> Path:
+        return self.bodies_dir / f"{hashlib.sha256(url.encode('utf-8')).hexdigest()}.html"
+
+    def request_headers(self, url: str) -> dict[str, str]:
+        """Conditional headers for ``url``, if its last body is still on disk."""
+        with self._lock:
+            entry = self._entries.get(url)
+        if not entry or not self._body_path(url).exists():
+            return {}
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def cached_body(self, url: str) -> str | None:
+        try:
+            return self._body_path(url).read_text(encoding="utf-8")
+        except OSError:
+            return None
+
+    def update(self, url: str, text: str, etag: str | None, last_modified: str | None,
+               owner: str) -> bool:
+        """Stage a 200 response for ``owner``; return True if the body differs from the last commit."""
+        digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        with self._lock:
+            previous = self._entries.get(url, {}).get("sha256")
+            entry = {"etag": etag, "last_modified": last_modified, "sha256": digest}
+            self._staged.setdefault(owner, {})[url] = (entry, text)
+        return digest != previous or not self._body_path(url).exists()
+
+    def commit(self, owner: str):
+        """Make ``owner``'s staged responses the baseline for the next conditional fetch."""
+        with self._lock:
+            staged = self._staged.pop(owner, {})
+        for url, (entry, text) in staged.items():
+            path = self._body_path(url)
+            if not path.exists() or self._entries.get(url, {}).get("sha256") != entry["sha256"]:
+                self.bodies_dir.mkdir(parents=True, exist_ok=True)
+                path.write_text(text, encoding="utf-8")
+            with self._lock:
+                self._entries[url] = entry
+                self._dirty = True
+
+    def discard(self, owner: str):
+        with self._lock:
+            self._staged.pop(owner, None)
+
+    def save(self):
+        with self._lock:
+            if not self._dirty:
+                return
+            entries = dict(self._entries)
+            self._dirty = False
+        self.directory.mkdir(parents=True, exist_ok=True)
+        tmp = self.index_path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(entries, f, indent=2, sort_keys=True)
+        os.replace(tmp, self.index_path)
+
+
+_state: HttpState | None = None
+_state_lock = threading.Lock()
+
+
+def conditional_requests_enabled() -> bool:
+    """Conditional GETs only go to live servers; cassettes ignore request headers."""
+    return settings.CONDITIONAL_REQUESTS and settings.HTTP_MODE == "live"
+
+
+def get_http_state() -> HttpState:
+    """Process-wide HttpState for settings.HTTP_STATE_DIR."""
+    global _state
+    with _state_lock:
+        if _state is None:
+            _state = HttpState(settings.HTTP_STATE_DIR)
+        return _state
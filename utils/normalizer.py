@@ -0,0 +1,156 @@
+import re
+from collections.abc import Callable, Iterable
+from datetime import datetime, timezone
+from decimal import Decimal, InvalidOperation
+from functools import lru_cache
+
+from config.settings import settings
+
+SCHEMA_PATH = settings.BASE_DIR / "database" / "schema.sql"
+
+_TABLE_RE = re.compile(r"CREATE TABLE IF NOT EXISTS (\w+)\s*\((.*?)\n\);", re.DOTALL)
+_COLUMN_RE = re.compile(r"^\s*(\w+)\s+([A-Za-z]+)")
+_CONSTRAINT_WORDS = {"PRIMARY", "UNIQUE", "CONSTRAINT", "FOREIGN", "CHECK"}
+
+_DATE_FORMATS = [
+    "%Y-%m-%d", "%d %B %Y", "%B %d, %Y", "%d %b %Y", "%b %d, %Y",
+    "%d/%m/%Y", "%d-%m-%Y", "%d.%m.%Y", "%B %d %Y", "%b %d %Y",
+]
+
+
+@lru_cache(maxsize=1)
+def load_column_types(schema_path=SCHEMA_PATH) -> dict[str, dict[str, str]]:
+    """Parse CREATE TABLE statements into {table: {column: BASE_TYPE}}."""
+    text = schema_path.read_text(encoding="utf-8")
+    tables = {}
+    for name, body in _TABLE_RE.findall(text):
+        columns = {}
+        for line in body.splitlines():
+            line = line.split("--", 1)[0]
+            match = _COLUMN_RE.match(line)
+            if not match or match.group(1).upper() in _CONSTRAINT_WORDS:
+                continue
+            columns[match.group(1)] = match.group(2).upper()
+        tables[name] = columns
+    return tables
+
+
+def _text(value):
+    if value is None:
+        return ""
+    if isinstance(value, str):
+        return value.strip()
+    return str(value)
+
+
+def _numeric(value):
+    if value is None or isinstance(value, bool):
+        return value
+    if isinstance(value, (int, float, Decimal)):
+        return Decimal(str(value)).normalize()
+    cleaned = str(value).replace(",", "").strip()
+    if not cleaned:
+        return None
+    try:
+        return Decimal(cleaned).normalize()
+    except InvalidOperation:
+        return cleaned
+
+
+def _boolean(value):
+    # NULL is its own value in a BOOLEAN column, not False
+    if value is None:
+        return None
+    if isinstance(value, str):
+        text = value.strip().lower()
+        return text in ("true", "t", "1", "yes", "y") if text else None
+    return bool(value)
+
+
+def _parse_date(text: str):
+    for fmt in _DATE_FORMATS:
+        try:
+            return datetime.strptime(text, fmt).date()
+        except ValueError:
+            continue
+    return None
+
+
+def _date(value):
+    if value is None:
+        return None
+    text = str(value).strip()
+    if not text:
+        return None
+    # ISO dates and timestamps: keep only the calendar date
+    parsed = _parse_date(text[:10]) or _parse_date(text)
+    return parsed.isoformat() if parsed else text
+
+
+def _timestamp(value):
+    if value is None:
+        return None
+    text = str(value).strip()
+    if not text:
+        return None
+    try:
+        parsed = datetime.fromisoformat(text)
+    except ValueError:
+        date = _parse_date(text)
+        return date.isoformat() if date else text
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc).isoformat()
+
+
+def _json(value):
+    if value in (None, "", [], {}):
+        return None
+    return value
+
+
+def _uuid(value):
+    if not value:
+        return None
+    return str(value).lower()
+
+
+def _generic(value):
+    if isinstance(value, str):
+        value = value.strip()
+    return None if value == "" else value
+
+
+CONVERTERS: dict[str, Callable] = {
+    "TEXT": _text,
+    "NUMERIC": _numeric,
+    "INTEGER": _numeric,
+    "BOOLEAN": _boolean,
+    "DATE": _date,
+    "TIMESTAMPTZ": _timestamp,
+    "JSONB": _json,
+    "JSON": _json,
+    "UUID": _uuid,
+}
+
+
+class RecordNormalizer:
+    """Canonicalize records of one table so DB rows and scraped rows compare equal.
+
+    Each column's converter is chosen from its type in ``database/schema.sql``
+    (e.g. NUMERIC "1,200" and 1200.0 both become Decimal("1.2E+3"), TEXT None
+    becomes "", JSONB {} becomes None). Records are projected onto
+    ``columns``: a partial upsert only writes those, so any other DB column
+    can't be changed by the write and must not count as a difference.
+    """
+
+    def __init__(self, table: str, columns: Iterable[str]):
+        types = load_column_types().get(table, {})
+        self.table = table
+        self._converters = [
+            (column, CONVERTERS.get(types.get(column), _generic))
+            for column in sorted(columns)
+        ]
+
+    def __call__(self, record: dict) -> dict:
+        return {column: convert(record.get(column)) for column, convert in self._converters}
@@ -0,0 +1,183 @@
+import cProfile
+import io
+import json
+import pstats
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+
+# pstats keys are (filename, lineno, funcname); C functions have filename "~"
+_BS4_FILE_MARKERS = ("/bs4/", "/soupsieve/", "\\bs4\\", "\\soupsieve\\")
+_BS4_C_MARKERS = ("lxml.", "html5lib")
+_REGEX_FILE_MARKERS = ("/re/", "\\re\\", "/sre_", "\\sre_")
+_REGEX_C_MARKERS = ("'re.Pattern'", "'re.Match'", "_sre.")
+
+TOP_FUNCTIONS = 25
+TOP_ALLOCATIONS = 15
+
+
+def _is_bs4(key: tuple) -> bool:
+    filename, _, funcname = key
+    if filename == "~":
+        return any(m in funcname for m in _BS4_C_MARKERS)
+    return any(m in filename for m in _BS4_FILE_MARKERS)
+
+
+def _is_regex(key: tuple) -> bool:
+    filename, _, funcname = key
+    if filename == "~":
+        return any(m in funcname for m in _REGEX_C_MARKERS)
+    return any(m in filename for m in _REGEX_FILE_MARKERS)
+
+
+def _label(key: tuple) -> str:
+    filename, lineno, funcname = key
+    if filename == "~":
+        return funcname
+    return f"{funcname} ({Path(filename).name}:{lineno})"
+
+
+def _site(frame: tracemalloc.Frame) -> str:
+    path = Path(frame.filename)
+    return f"{path.parent.name}/{path.name}:{frame.lineno}"
+
+
+@dataclass
+class ScraperProfile:
+    """CPU and allocation profile of one scraper run.
+
+    Function timings use the calling thread's CPU clock, so sleeps, backoff,
+    rate-limit waits and network I/O don't count; they make up the gap
+    between ``wall_seconds`` and ``cpu_seconds``. Worker threads the scraper
+    starts (faculty profile enrichment) are not in the function listing;
+    their CPU time shows up only in ``process_cpu_seconds``.
+    """
+    name: str
+    stats: pstats.Stats | None = None
+    peak_bytes: int = 0
+    allocations: list[dict] = field(default_factory=list)
+    wall_seconds: float = 0.0
+    process_cpu_seconds: float = 0.0
+
+    @property
+    def total_seconds(self) -> float:
+        """CPU seconds spent in the profiled (calling) thread."""
+        return self.stats.total_tt if self.stats else 0.0
+
+    def _exclusive(self, predicate) -> float:
+        # tottime only, so nested calls are never counted twice
+        return sum(row[2] for key, row in self.stats.stats.items() if predicate(key))
+
+    @property
+    def bs4_seconds(self) -> float:
+        """Time spent inside BeautifulSoup, soupsieve and the lxml/html5lib parsers."""
+        return self._exclusive(_is_bs4)
+
+    @property
+    def regex_seconds(self) -> float:
+        """Time spent in the re module and compiled pattern methods."""
+        return self._exclusive(_is_regex)
+
+    def top_functions(self, limit: int = TOP_FUNCTIONS) -> list[dict]:
+        rows = sorted(self.stats.stats.items(), key=lambda kv: -kv[1][2])[:limit]
+        return [
+            {
+                "function": _label(key),
+                "calls": nc,
+                "tottime": round(tt, 4),
+                "cumtime": round(ct, 4),
+            }
+            for key, (_, nc, tt, ct, _) in rows
+        ]
+
+    def summary(self) -> dict:
+        return {
+            "scraper": self.name,
+            "cpu_seconds": round(self.total_seconds, 3),
+            "wall_seconds": round(self.wall_seconds, 3),
+            "process_cpu_seconds": round(self.process_cpu_seconds, 3),
+            "bs4_seconds": round(self.bs4_seconds, 3),
+            "regex_seconds": round(self.regex_seconds, 3),
+            "peak_kib": round(self.peak_bytes / 1024, 1),
+        }
+
+    def render(self) -> str:
+        """Human-readable report: headline numbers, top allocations and pstats listings."""
+        s = self.summary()
+        lines = [
+            f"Profile: {self.name}",
+            f"  CPU (profiled)  {s['cpu_seconds']:.3f}s   scraper thread only",
+            f"  CPU (process)   {s['process_cpu_seconds']:.3f}s   incl. worker threads",
+            f"  wall clock      {s['wall_seconds']:.3f}s   incl. sleeps and network I/O",
+            f"  BeautifulSoup   {s['bs4_seconds']:.3f}s",
+            f"  regex           {s['regex_seconds']:.3f}s",
+            f"  peak allocated  {s['peak_kib']:.1f} KiB",
+            "",
+            "Top allocation sites (still allocated when the scraper finished):",
+        ]
+        lines.extend(f"  {a['size_kib']:>10.1f} KiB  {a['count']:>7d} blocks  {a['site']}" for a in self.allocations)
+
+        out = io.StringIO()
+        stream, self.stats.stream = self.stats.stream, out
+        try:
+            self.stats.sort_stats(pstats.SortKey.TIME).print_stats(TOP_FUNCTIONS)
+            self.stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(TOP_FUNCTIONS)
+        finally:
+            self.stats.stream = stream
+        lines.extend(["", out.getvalue()])
+        return "\n".join(lines)
+
+    def write(self, directory: Path) -> Path:
+        """Write <name>.txt (report), <name>.prof (raw pstats, for snakeviz) and <name>.json."""
+        directory.mkdir(parents=True, exist_ok=True)
+        self.stats.dump_stats(directory / f"{self.name}.prof")
+        (directory / f"{self.name}.json").write_text(
+            json.dumps({**self.summary(), "top_functions": self.top_functions(),
+                        "allocations": self.allocations}, indent=2),
+            encoding="utf-8",
+        )
+        report = directory / f"{self.name}.txt"
+        report.write_text(self.render(), encoding="utf-8")
+        return report
+
+
+@contextmanager
+def profile_scraper(name: str):
+    """Run the body under cProfile and tracemalloc, yielding the profile filled in on exit.
+
+    cProfile measures the calling thread's CPU time (time.thread_time) and
+    sees only that thread; wall and whole-process CPU time are recorded
+    alongside. tracemalloc sees all threads.
+    """
+    profile = ScraperProfile(name)
+    started_tracing = not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    profiler = cProfile.Profile(time.thread_time)
+    wall_start, cpu_start = time.perf_counter(), time.process_time()
+    profiler.enable()
+    try:
+        yield profile
+    finally:
+        profiler.disable()
+        profile.wall_seconds = time.perf_counter() - wall_start
+        profile.process_cpu_seconds = time.process_time() - cpu_start
+        _, profile.peak_bytes = tracemalloc.get_traced_memory()
+        snapshot = tracemalloc.take_snapshot().filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+        ])
+        if started_tracing:
+            tracemalloc.stop()
+        profile.allocations = [
+            {
+                "site": _site(stat.traceback[0]),
+                "size_kib": round(stat.size / 1024, 1),
+                "count": stat.count,
+            }
+            for stat in snapshot.statistics("lineno")[:TOP_ALLOCATIONS]
+        ]
+        profile.stats = pstats.Stats(profiler)
@@ -0,0 +1,32 @@
+import threading
+import time
+from urllib.parse import urlsplit
+
+from config.settings import settings
+
+
+class HostRateLimiter:
+    """Spaces requests to the same host at least ``1 / rate`` seconds apart, across threads.
+
+    ``reserve()`` books the next free slot for the URL's host and returns how
+    long the caller has to wait for it; concurrent callers get successive
+    slots instead of all firing at once.
+    """
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next_slot: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def reserve(self, url: str) -> float:
+        if not self.interval:
+            return 0.0
+        host = urlsplit(url).hostname or ""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.interval
+        return slot - now
+
+
+host_limiter = HostRateLimiter(settings.HOST_RATE_LIMIT)
@@ -0,0 +1,95 @@
+import json
+import os
+from datetime import datetime, timedelta, timezone
+
+from config.settings import settings
+from utils.logger import logger
+
+# Run outcomes that count as "refreshed"; anything else is retried on the next run
+COMPLETED_STATUSES = {"success", "no_data", "skipped_high_change", "not_modified"}
+
+# Run outcomes after which the database holds what was scraped; only these let
+# the next run trust unchanged pages (and finish as "not_modified")
+SYNCED_STATUSES = {"success", "no_data", "not_modified"}
+
+
+class Schedule:
+    """Last completed run per scraper, and which scrapers are due again.
+
+    Last runs come from the scraper_last_runs view when the database is
+    reachable, merged with the local state file (settings.SCHEDULE_STATE)
+    so scrape-only runs are remembered too; the later timestamp wins.
+    ``last_attempts`` holds the time and status of each scraper's latest
+    run, completed or not.
+    """
+
+    def __init__(self, db=None):
+        self.last_runs, self.last_attempts = self._load_local()
+        remote = db.get_last_runs() if db else None
+        if remote is None:
+            logger.info(f"Schedule: using local state ({len(self.last_runs)} scraper(s))")
+        for name, row in (remote or {}).items():
+            when = row["last_run"]
+            if when and (name not in self.last_runs or when > self.last_runs[name]):
+                self.last_runs[name] = when
+            attempt = (row["last_attempt"], row["last_status"])
+            if attempt[0] and (name not in self.last_attempts or attempt[0] > self.last_attempts[name][0]):
+                self.last_attempts[name] = attempt
+
+    @staticmethod
+    def _load_local() -> tuple[dict[str, datetime], dict[str, tuple[datetime, str]]]:
+        path = settings.SCHEDULE_STATE
+        if not path.exists():
+            return {}, {}
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+            last_runs = {name: datetime.fromisoformat(when) for name, when in data.get("last_runs", {}).items()}
+            last_attempts = {
+                name: (datetime.fromisoformat(a["at"]), a["status"])
+                for name, a in data.get("last_attempts", {}).items()
+            }
+            return last_runs, last_attempts
+        except (OSError, ValueError, AttributeError, KeyError, TypeError) as e:
+            logger.warning(f"Ignoring unreadable schedule state {path}: {e}")
+            return {}, {}
+
+    def next_due(self, scraper_cls) -> datetime | None:
+        """When the scraper is next due, or None if it has never completed a run."""
+        last = self.last_runs.get(scraper_cls.name)
+        return last + scraper_cls.refresh_interval if last else None
+
+    def is_due(self, scraper_cls, now: datetime | None = None) -> bool:
+        due = self.next_due(scraper_cls)
+        return due is None or due <= (now or datetime.now(timezone.utc))
+
+    def last_synced(self, name: str) -> bool:
+        """True if the scraper's latest known run left the database in sync with its pages."""
+        attempt = self.last_attempts.get(name)
+        return attempt is not None and attempt[1] in SYNCED_STATUSES
+
+    def record(self, name: str, status: str, when: datetime | None = None):
+        when = when or datetime.now(timezone.utc)
+        self.last_attempts[name] = (when, status)
+        if status in COMPLETED_STATUSES:
+            self.last_runs[name] = when
+
+    def save(self):
+        path = settings.SCHEDULE_STATE
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({
+                "last_runs": {n: w.isoformat() for n, w in sorted(self.last_runs.items())},
+                "last_attempts": {
+                    n: {"at": w.isoformat(), "status": status}
+                    for n, (w, status) in sorted(self.last_attempts.items())
+                },
+            }, f, indent=2)
+        os.replace(tmp, path)
+
+
+def format_interval(interval: timedelta) -> str:
+    hours = interval.total_seconds() / 3600
+    if hours < 24:
+        return f"{hours:g}h"
+    return f"{hours / 24:g}d"
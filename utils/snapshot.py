@@ -0,0 +1,140 @@
+"""Compact binary snapshot format (msgpack + zstd) used alongside JSON files.
+
+File layout: an 8-byte magic header followed by a zstd frame containing one
+msgpack map ``{"schema": {...}, ...}``. Record lists (``{"metadata", "data":
+[dict, ...]}``, the shape BaseScraper.save writes) are stored column-wise:
+the schema lists the columns once and each record becomes a positional row,
+so keys aren't repeated per record. Any other JSON value is stored as-is.
+"""
+
+import argparse
+import json
+import os
+from pathlib import Path
+
+try:
+    import msgpack
+    import zstandard
+except ImportError:  # compact snapshots are optional; JSON always works
+    msgpack = None
+    zstandard = None
+
+from utils.logger import logger
+
+MAGIC = b"EWUSNAP1"
+FORMAT_VERSION = 1
+COMPACT_SUFFIX = ".msgpack.zst"
+
+# Marks a column a record doesn't have (distinct from an explicit None)
+_MISSING_EXT = 1
+
+
+def available() -> bool:
+    return msgpack is not None and zstandard is not None
+
+
+def compact_path(json_path: Path) -> Path:
+    """data/current/faculty.json -> data/current/faculty.msgpack.zst"""
+    return json_path.with_suffix(COMPACT_SUFFIX)
+
+
+def _is_record_payload(payload) -> bool:
+    return (
+        isinstance(payload, dict)
+        and set(payload) <= {"metadata", "data"}
+        and isinstance(payload.get("data"), list)
+        and all(isinstance(r, dict) for r in payload["data"])
+    )
+
+
+def _encode(payload) -> dict:
+    if not _is_record_payload(payload):
+        return {"schema": {"version": FORMAT_VERSION, "kind": "object"}, "value": payload}
+
+    columns: dict[str, None] = {}
+    for record in payload["data"]:
+        columns.update(dict.fromkeys(record))
+    missing = msgpack.ExtType(_MISSING_EXT, b"")
+    sparse = any(len(record) != len(columns) for record in payload["data"])
+    rows = [
+        [record[c] if c in record else missing for c in columns] if sparse
+        else [record[c] for c in columns]
+        for record in payload["data"]
+    ]
+    return {
+        "schema": {
+            "version": FORMAT_VERSION, "kind": "records",
+            "columns": list(columns), "sparse": sparse,
+        },
+        "metadata": payload.get("metadata"),
+        "rows": rows,
+    }
+
+
+def _decode(document: dict):
+    schema = document["schema"]
+    if schema.get("version") != FORMAT_VERSION:
+        raise ValueError(f"Unsupported snapshot version: {schema.get('version')}")
+    if schema["kind"] == "object":
+        return document["value"]
+
+    columns = schema["columns"]
+    if schema.get("sparse"):
+        data = [
+            {c: v for c, v in zip(columns, row) if not isinstance(v, msgpack.ExtType)}
+            for row in document["rows"]
+        ]
+    else:
+        data = [dict(zip(columns, row)) for row in document["rows"]]
+    return {"metadata": document.get("metadata"), "data": data}
+
+
+def write_compact(path: Path, payload, level: int = 10):
+    """Write ``payload`` to ``path`` in the compact format."""
+    if not available():
+        raise RuntimeError("msgpack and zstandard are required for compact snapshots")
+    packed = msgpack.packb(_encode(payload), use_bin_type=True, default=str)
+    compressed = zstandard.ZstdCompressor(level=level).compress(packed)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_bytes(MAGIC + compressed)
+    os.replace(tmp, path)
+
+
+def read_compact(path: Path):
+    """Read a file written by write_compact()."""
+    if not available():
+        raise RuntimeError("msgpack and zstandard are required for compact snapshots")
+    raw = path.read_bytes()
+    if not raw.startswith(MAGIC):
+        raise ValueError(f"{path} is not a compact snapshot")
+    packed = zstandard.ZstdDecompressor().decompress(raw[len(MAGIC):])
+    return _decode(msgpack.unpackb(packed, raw=False, strict_map_key=False))
+
+
+def load_snapshot(json_path: Path):
+    """Load a JSON data file, preferring an up-to-date compact sibling when one exists."""
+    binary = compact_path(json_path)
+    if available() and binary.exists():
+        if not json_path.exists() or binary.stat().st_mtime >= json_path.stat().st_mtime:
+            try:
+                return read_compact(binary)
+            except Exception as e:
+                logger.warning(f"Failed to read {binary}, falling back to JSON: {e}")
+    with open(json_path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Write compact .msgpack.zst siblings for JSON files")
+    parser.add_argument("paths", nargs="+", type=Path, help="JSON files or directories")
+    args = parser.parse_args()
+
+    for target in args.paths:
+        files = sorted(target.rglob("*.json")) if target.is_dir() else [target]
+        for json_file in files:
+            with open(json_file, "r", encoding="utf-8") as f:
+                payload = json.load(f)
+            write_compact(compact_path(json_file), payload)
+            before = json_file.stat().st_size
+            after = compact_path(json_file).stat().st_size
+            logger.info(f"{json_file}: {before:,} -> {after:,} bytes")
@@ -0,0 +1,188 @@
+import contextvars
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+
+_current_tracer: contextvars.ContextVar["Tracer | None"] = contextvars.ContextVar("tracer", default=None)
+_current_span: contextvars.ContextVar["Span | None"] = contextvars.ContextVar("span", default=None)
+
+
+@dataclass
+class Span:
+    """One timed operation. Times are ``time.time_ns()`` wall-clock nanoseconds."""
+    span_id: int
+    parent_id: int | None
+    name: str
+    start_ns: int
+    end_ns: int = 0
+    thread_id: int = 0
+    attrs: dict = field(default_factory=dict)
+
+    @property
+    def seconds(self) -> float:
+        return (self.end_ns - self.start_ns) / 1e9
+
+    def set(self, **attrs):
+        self.attrs.update(attrs)
+
+
+class Tracer:
+    """Collects nested spans for one run and exports them.
+
+    Spans nest through a context variable, so a span opened inside another
+    (in the same thread) becomes its child without passing anything around.
+    """
+
+    def __init__(self):
+        self.trace_id = os.urandom(16).hex()
+        self.spans: list[Span] = []
+        self._lock = threading.Lock()
+        self._next_id = 1
+
+    @contextmanager
+    def span(self, name: str, **attrs):
+        parent = _current_span.get()
+        with self._lock:
+            span_id = self._next_id
+            self._next_id += 1
+        span = Span(span_id, parent.span_id if parent else None, name, time.time_ns(),
+                    thread_id=threading.get_ident(), attrs=attrs)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.attrs.setdefault("error", repr(e))
+            raise
+        finally:
+            _current_span.reset(token)
+            span.end_ns = time.time_ns()
+            with self._lock:
+                self.spans.append(span)
+
+    def _descendants(self, root: Span) -> list[Span]:
+        children = defaultdict(list)
+        for s in self.spans:
+            children[s.parent_id].append(s)
+        result, stack = [], [root]
+        while stack:
+            node = stack.pop()
+            result.append(node)
+            stack.extend(children[node.span_id])
+        return result
+
+    def phase_totals(self, root: Span) -> dict[str, float]:
+        """Wall-clock seconds per span name under ``root``, adding up to root's duration.
+
+        Each instant goes to the innermost spans open at that moment, split
+        evenly between them when several run at once (worker threads), so a
+        span's share excludes its children and concurrent spans are never
+        counted twice. The root's own share is reported under its name too.
+        """
+        events = []
+        for s in self._descendants(root):
+            start, end = max(s.start_ns, root.start_ns), min(s.end_ns, root.end_ns)
+            if end > start:
+                events.append((start, 1, s))
+                events.append((end, -1, s))
+        events.sort(key=lambda e: e[0])
+
+        active: dict[int, Span] = {}
+        open_children = defaultdict(int)
+        totals = defaultdict(float)
+        last = root.start_ns
+        i = 0
+        while i < len(events):
+            now = events[i][0]
+            innermost = [s for s in active.values() if not open_children[s.span_id]]
+            for s in innermost:
+                totals[s.name] += (now - last) / len(innermost)
+            while i < len(events) and events[i][0] == now:
+                _, delta, s = events[i]
+                if delta > 0:
+                    active[s.span_id] = s
+                else:
+                    active.pop(s.span_id, None)
+                if s is not root:
+                    open_children[s.parent_id] += delta
+                i += 1
+            last = now
+        return {name: round(ns / 1e9, 3) for name, ns in sorted(totals.items(), key=lambda kv: -kv[1])}
+
+    def find(self, root: Span, name: str) -> list[Span]:
+        """Spans called ``name`` under ``root``, in start order."""
+        return sorted((s for s in self._descendants(root) if s.name == name), key=lambda s: s.start_ns)
+
+    def export_chrome(self, path: Path) -> Path:
+        """Write a Chrome Trace Event file (chrome://tracing, Perfetto)."""
+        pid = os.getpid()
+        events = [
+            {
+                "name": s.name, "cat": s.name, "ph": "X", "pid": pid, "tid": s.thread_id,
+                "ts": s.start_ns / 1000, "dur": (s.end_ns - s.start_ns) / 1000,
+                "args": s.attrs,
+            }
+            for s in sorted(self.spans, key=lambda s: s.start_ns)
+        ]
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps({"traceEvents": events, "displayTimeUnit": "ms"}, default=str),
+                        encoding="utf-8")
+        return path
+
+    def export_otlp(self, path: Path, service_name: str = "ewu-scraper") -> Path:
+        """Write an OTLP/JSON file (as accepted by the OpenTelemetry collector's file receivers)."""
+        def value(v):
+            if isinstance(v, bool):
+                return {"boolValue": v}
+            if isinstance(v, int):
+                return {"intValue": str(v)}
+            if isinstance(v, float):
+                return {"doubleValue": v}
+            return {"stringValue": str(v)}
+
+        spans = [
+            {
+                "traceId": self.trace_id,
+                "spanId": f"{s.span_id:016x}",
+                **({"parentSpanId": f"{s.parent_id:016x}"} if s.parent_id else {}),
+                "name": s.name,
+                "kind": 1,
+                "startTimeUnixNano": str(s.start_ns),
+                "endTimeUnixNano": str(s.end_ns),
+                "attributes": [{"key": k, "value": value(v)} for k, v in s.attrs.items()],
+                **({"status": {"code": 2, "message": s.attrs["error"]}} if "error" in s.attrs else {}),
+            }
+            for s in self.spans
+        ]
+        document = {"resourceSpans": [{
+            "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": service_name}}]},
+            "scopeSpans": [{"scope": {"name": "utils.tracing"}, "spans": spans}],
+        }]}
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(document), encoding="utf-8")
+        return path
+
+
+@contextmanager
+def use_tracer(tracer: Tracer):
+    """Make ``tracer`` the target of module-level span() calls in this context."""
+    token = _current_tracer.set(tracer)
+    try:
+        yield tracer
+    finally:
+        _current_tracer.reset(token)
+
+
+@contextmanager
+def span(name: str, **attrs):
+    """Open a span on the active tracer, or do nothing when tracing is off."""
+    tracer = _current_tracer.get()
+    if tracer is None:
+        yield Span(0, None, name, 0, attrs=attrs)
+        return
+    with tracer.span(name, **attrs) as s:
+        yield s